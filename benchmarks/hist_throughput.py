@@ -0,0 +1,51 @@
+"""
+Throughput of ppscore.score for growing row counts, exact vs. method="hist"
+
+Run with: python benchmarks/hist_throughput.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+import ppscore.main as pps
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+
+
+def make_dataframe(n_rows: int, random_seed: int = 0) -> pd.DataFrame:
+    rng = np.random.RandomState(random_seed)
+    x = rng.normal(0, 1, n_rows)
+    return pd.DataFrame(
+        {
+            "x": x,
+            "regression": np.sin(2 * x) + rng.normal(0, 0.5, n_rows),
+            "classification": np.where(x + rng.normal(0, 1, n_rows) > 0, "a", "b"),
+        }
+    )
+
+
+def time_score(df: pd.DataFrame, y: str, method: str) -> tuple[float, float]:
+    start = time.perf_counter()
+    result = pps.score(df, "x", y, sample=None, method=method)
+    return time.perf_counter() - start, result["ppscore"]
+
+
+def main() -> None:
+    print(
+        f"{'rows':>10} {'target':>15} {'method':>6} {'seconds':>8} {'rows/s':>11} pps"
+    )
+    for n_rows in ROW_COUNTS:
+        df = make_dataframe(n_rows)
+        for y in ["regression", "classification"]:
+            for method in ["exact", "hist"]:
+                seconds, ppscore = time_score(df, y, method)
+                print(
+                    f"{n_rows:>10} {y:>15} {method:>6} {seconds:>8.3f} "
+                    f"{n_rows / seconds:>11,.0f} {ppscore:.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
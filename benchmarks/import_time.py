@@ -0,0 +1,65 @@
+"""
+Import time of ppscore and of its heavy dependencies, from python -X importtime
+
+Run with: python benchmarks/import_time.py
+The budget of a bare `import ppscore` is enforced by tests/test_import_time.py.
+"""
+
+import subprocess
+import sys
+
+# From importing the package to scoring a first pair
+STATEMENTS = [
+    "import ppscore",
+    "from ppscore import score",
+    "from ppscore.scoring.predictor import PPSCalculator; PPSCalculator()",
+    "import pandas as pd, ppscore; ppscore.score(pd.DataFrame({'x': [1, 2]}), 'x', 'x')",
+]
+
+DEPENDENCIES = ["ppscore", "numpy", "pandas", "pydantic", "sklearn", "scipy"]
+
+N_RUNS = 5
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """
+    The cumulative import time in microseconds of every module that the
+    statement imports. "ppscore" is the total of all top-level ppscore imports.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {"ppscore": 0}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # Top-level imports are indented by a single space
+        if name.startswith(" ppscore"):
+            times["ppscore"] += int(cumulative)
+        elif not name.strip().startswith("ppscore"):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    print(f"{'statement':<80} " + " ".join(f"{name:>9}" for name in DEPENDENCIES))
+    for statement in STATEMENTS:
+        runs = [import_times(statement) for _ in range(N_RUNS)]
+        # The fastest run has the least noise of other processes
+        milliseconds = [
+            min(run.get(name, 0) for run in runs) / 1000 for name in DEPENDENCIES
+        ]
+        print(
+            f"{statement[:80]:<80} "
+            + " ".join(f"{value:>7.1f}ms" for value in milliseconds)
+        )
+
+
+if __name__ == "__main__":
+    main()
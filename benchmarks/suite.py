@@ -0,0 +1,245 @@
+"""
+Wall time, pairs/s and peak RSS of PPSCalculator.score, predictors and matrix on
+synthetic frames of different column kinds, with a row and a column sweep
+
+Run with: python benchmarks/suite.py [--quick] [--output results.json]
+                                     [--baseline benchmarks/baseline.json]
+Every case runs in a fresh process, so that its peak RSS is its own. With a
+baseline, the cases that are more than --tolerance slower or larger than in the
+baseline are reported and the exit code is 1. Baselines are specific to the
+machine they were recorded on; record a new one with
+--output benchmarks/baseline.json.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+KINDS = ["numeric", "categorical_low", "categorical_high", "mixed", "nan_heavy"]
+# The kinds of the columns of mixed frames, in turn
+MIXED_KINDS = ["numeric", "categorical_low", "categorical_high", "nan_heavy"]
+LOW_CARDINALITY = 5
+HIGH_CARDINALITY = 200
+NAN_FRACTION = 0.5
+
+# score sweeps the rows for every kind, predictors the rows of a mixed frame of
+# PREDICTORS_COLUMNS features and matrix the columns of a mixed frame
+ROW_COUNTS = [1_000, 10_000, 100_000]
+COLUMN_COUNTS = [5, 10, 20]
+PREDICTORS_COLUMNS = 10
+MATRIX_ROWS = 2_000
+QUICK_ROW_COUNTS = [1_000]
+QUICK_COLUMN_COUNTS = [5]
+
+# All rows are scored, so that the row sweep is not capped by the default sample
+SCORE_KWARGS: dict[str, Any] = {"sample": None, "random_seed": 0}
+REPEATS = 3
+
+# A case regresses if it is slower or larger than the baseline by this fraction
+TOLERANCE = 0.25
+# and by at least these amounts, because small cases are noisy
+MIN_SECONDS_DIFFERENCE = 0.01
+MIN_RSS_MB_DIFFERENCE = 10.0
+
+
+def make_column(kind: str, latent: np.ndarray, rng: np.random.RandomState):
+    """A column of the given kind that depends on latent with noise"""
+    values = latent + rng.normal(0, 1, len(latent))
+    if kind == "numeric":
+        return values
+    if kind == "nan_heavy":
+        return np.where(rng.uniform(size=len(values)) < NAN_FRACTION, np.nan, values)
+    cardinality = LOW_CARDINALITY if kind == "categorical_low" else HIGH_CARDINALITY
+    # Quantile bins, so that all categories occur
+    edges = np.quantile(values, np.linspace(0, 1, cardinality + 1)[1:-1])
+    return np.char.add("c", np.digitize(values, edges).astype(str))
+
+
+def make_dataframe(
+    kind: str, n_rows: int, n_columns: int, random_seed: int = 0
+) -> pd.DataFrame:
+    """
+    n_columns feature columns x0, x1, ... of the kind, or of the MIXED_KINDS in
+    turn, and a numeric target y. All columns depend on the same latent variable.
+    """
+    rng = np.random.RandomState(random_seed)
+    latent = rng.normal(0, 1, n_rows)
+    columns = {}
+    for i in range(n_columns):
+        column_kind = MIXED_KINDS[i % len(MIXED_KINDS)] if kind == "mixed" else kind
+        columns[f"x{i}"] = make_column(column_kind, latent, rng)
+    columns["y"] = np.sin(2 * latent) + rng.normal(0, 0.5, n_rows)
+    return pd.DataFrame(columns)
+
+
+def benchmark_cases(quick: bool = False) -> list[dict]:
+    """The cases of the suite, each with a unique name"""
+    row_counts = QUICK_ROW_COUNTS if quick else ROW_COUNTS
+    column_counts = QUICK_COLUMN_COUNTS if quick else COLUMN_COUNTS
+    cases = [
+        {"operation": "score", "kind": kind, "n_rows": n_rows, "n_columns": 1}
+        for kind in KINDS
+        for n_rows in row_counts
+    ]
+    cases += [
+        {
+            "operation": "predictors",
+            "kind": "mixed",
+            "n_rows": n_rows,
+            "n_columns": PREDICTORS_COLUMNS,
+        }
+        for n_rows in row_counts
+    ]
+    cases += [
+        {
+            "operation": "matrix",
+            "kind": "mixed",
+            "n_rows": MATRIX_ROWS,
+            "n_columns": n_columns,
+        }
+        for n_columns in column_counts
+    ]
+    for case in cases:
+        case["name"] = (
+            f"{case['operation']}-{case['kind']}-{case['n_rows']}x{case['n_columns']}"
+        )
+    return cases
+
+
+def peak_rss_mb() -> Optional[float]:
+    """The peak resident set size of this process, None where it is unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_case(case: dict, repeats: int = REPEATS) -> dict:
+    """Runs the case repeats times and returns its fastest run"""
+    from ppscore.scoring.predictor import PPSCalculator
+
+    df = make_dataframe(case["kind"], case["n_rows"], case["n_columns"])
+    # High cardinality targets have classes with fewer rows than folds
+    warnings.simplefilter("ignore", UserWarning)
+    seconds = []
+    for _ in range(repeats):
+        # A new calculator, so that no run reuses the work of another
+        calculator = PPSCalculator()
+        start = time.perf_counter()
+        if case["operation"] == "score":
+            calculator.score(df, "x0", "y", **SCORE_KWARGS)
+            n_pairs = 1
+        elif case["operation"] == "predictors":
+            n_pairs = len(calculator.predictors(df, "y", **SCORE_KWARGS))
+        else:
+            n_pairs = len(calculator.matrix(df.drop(columns="y"), **SCORE_KWARGS))
+        seconds.append(time.perf_counter() - start)
+
+    best = min(seconds)
+    return {
+        **case,
+        "pairs": n_pairs,
+        "seconds": best,
+        "pairs_per_second": n_pairs / best,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(case: dict, repeats: int = REPEATS) -> dict:
+    """run_case in a new process, which starts with the RSS of the imports only"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case, case, repeats).result()
+
+
+def environment() -> dict:
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def compare_to_baseline(
+    results: list[dict], baseline: dict, tolerance: float = TOLERANCE
+) -> list[str]:
+    """A message for every result that is slower or larger than its baseline"""
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_results.get(result["name"])
+        if previous is None:
+            continue
+        metrics = [("seconds", MIN_SECONDS_DIFFERENCE, "s")]
+        if result["peak_rss_mb"] is not None and previous["peak_rss_mb"] is not None:
+            metrics.append(("peak_rss_mb", MIN_RSS_MB_DIFFERENCE, "MB"))
+        for metric, min_difference, unit in metrics:
+            value, reference = result[metric], previous[metric]
+            if value > reference * (1 + tolerance) and (
+                value - reference >= min_difference
+            ):
+                regressions.append(
+                    f"{result['name']}: {metric} {value:.3f}{unit} vs. "
+                    f"{reference:.3f}{unit} in the baseline "
+                    f"({value / reference - 1:+.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true", help="only the smallest cases")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare to the results of this file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    print(f"{'case':<36} {'pairs':>6} {'seconds':>8} {'pairs/s':>10} {'peak RSS':>9}")
+    results = []
+    for case in benchmark_cases(args.quick):
+        result = run_isolated(case, args.repeats)
+        results.append(result)
+        rss = result["peak_rss_mb"]
+        print(
+            f"{result['name']:<36} {result['pairs']:>6} {result['seconds']:>8.3f} "
+            f"{result['pairs_per_second']:>10,.1f} "
+            + (f"{rss:>7.0f}MB" if rss is not None else f"{'-':>9}")
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {"environment": environment(), "results": results}, file, indent=2
+            )
+            file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_to_baseline(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regression of {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,20 @@
-from ppscore.main import matrix, predictors, score
+# Same as typing.TYPE_CHECKING, without importing typing
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ppscore.main import matrix, predictors, score
 
 __all__ = ["score", "predictors", "matrix"]
+
+
+def __getattr__(name: str):
+    # pandas, Pydantic and scikit-learn are only imported on first use, so that
+    # importing ppscore stays fast for callers that never score
+    if name in __all__:
+        from ppscore import main
+
+        return getattr(main, name)
+    raise AttributeError(f"module 'ppscore' has no attribute '{name}'")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
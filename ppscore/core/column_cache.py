@@ -0,0 +1,231 @@
+from enum import Enum
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from ppscore.core.data_types import dtype_represents_categories
+from ppscore.core.score_cache import column_digest
+
+# Numeric features of the approximate "hist" method are binned into compact uint8 codes
+MAX_BINS = 256
+
+
+class ColumnKind(str, Enum):
+    CATEGORICAL = "categorical"
+    NUMERIC = "numeric"
+    DATETIME = "datetime"
+    UNSUPPORTED = "unsupported"
+
+
+class ColumnProfile(BaseModel):
+    """
+    Everything the pair scorer needs to know about a single column, computed once:
+    the dtype class, missing values, and the integer codes of the sorted distinct
+    values, from which label encodings and one-hot matrices can be sliced.
+    """
+
+    name: Any
+    kind: ColumnKind
+    null_mask: Any  # np.ndarray[bool]
+    n_missing: int
+    codes: Any  # np.ndarray[int], -1 for missing values
+    n_categories: int
+    values: Any = None  # np.ndarray of the raw values for non-categorical columns
+    # value_counts() of a pandas categorical also lists unobserved categories,
+    # so the category count of such a column is fixed by its dtype
+    fixed_category_count: Optional[int] = None
+    # Mixed types, e.g. strings and numbers, can be counted but not sorted
+    sortable: bool = True
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def count_categories(self, rows: np.ndarray) -> int:
+        """Returns the number of distinct values in the given rows"""
+        if self.fixed_category_count is not None:
+            return self.fixed_category_count
+        counts = np.bincount(self.codes[rows], minlength=self.n_categories)
+        return int(np.count_nonzero(counts))
+
+    def labels(self, rows: np.ndarray) -> np.ndarray:
+        """Returns consecutive labels for the given rows, like a fitted LabelEncoder"""
+        if not self.sortable:
+            # Same error as the sklearn encoders raise for such values
+            raise TypeError(
+                f"The values of column {self.name} cannot be sorted because they "
+                f"have mixed types"
+            )
+        codes = self.codes[rows]
+        present = np.bincount(codes, minlength=self.n_categories) > 0
+        return (np.cumsum(present) - 1)[codes]
+
+    def one_hot(self, rows: np.ndarray):
+        """Returns the sparse one-hot matrix of the given rows, like a OneHotEncoder"""
+        return one_hot_encode(self.labels(rows))
+
+
+def one_hot_encode(labels: np.ndarray):
+    """Returns the sparse one-hot matrix of consecutive integer labels"""
+    from scipy import sparse  # type: ignore
+
+    n_rows = len(labels)
+    n_columns = int(labels.max()) + 1 if n_rows else 0
+    return sparse.csr_matrix(
+        (np.ones(n_rows), labels, np.arange(n_rows + 1)),
+        shape=(n_rows, n_columns),
+    )
+
+
+class FeatureBins(BaseModel):
+    """
+    Quantile bins of a numeric column: the uint8 bin of every row (0 for missing
+    values) and the smallest value that falls into each bin. Columns with at most
+    MAX_BINS distinct values get one bin per value.
+    """
+
+    bins: Any  # np.ndarray[uint8]
+    values: Any  # np.ndarray[float64], increasing
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+def bin_column(profile: ColumnProfile) -> FeatureBins:
+    """Bins the values of a numeric column into at most MAX_BINS quantile bins"""
+    values = profile.values.astype(np.float64)
+    valid_values = values[~profile.null_mask]
+    distinct_values = np.unique(valid_values)
+
+    if len(distinct_values) <= MAX_BINS:
+        bin_values = distinct_values
+        bins = np.searchsorted(distinct_values, values)
+    else:
+        quantiles = np.linspace(0, 1, MAX_BINS + 1)[1:-1]
+        edges = np.unique(np.quantile(valid_values, quantiles))
+        # Bin k holds the values in [edges[k - 1], edges[k])
+        bin_values = np.concatenate([distinct_values[:1], edges])
+        bins = np.searchsorted(edges, values, side="right")
+
+    bins[profile.null_mask] = 0
+    return FeatureBins(bins=bins.astype(np.uint8), values=bin_values)
+
+
+def determine_column_kind(series: pd.Series) -> ColumnKind:
+    """Classifies the column the same way determine_case_and_prepare_df does"""
+    from pandas.api.types import (
+        is_datetime64_any_dtype,
+        is_numeric_dtype,
+        is_timedelta64_dtype,
+    )
+
+    if dtype_represents_categories(series):
+        return ColumnKind.CATEGORICAL
+    if is_numeric_dtype(series):
+        return ColumnKind.NUMERIC
+    if is_datetime64_any_dtype(series) or is_timedelta64_dtype(series):
+        return ColumnKind.DATETIME
+    return ColumnKind.UNSUPPORTED
+
+
+def profile_column(series: pd.Series) -> ColumnProfile:
+    """Computes the ColumnProfile of a single column"""
+    kind = determine_column_kind(series)
+    fixed_category_count = None
+    values = None
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        fixed_category_count = len(series.dtype.categories)
+        # Labels are assigned in value order, like the LabelEncoder does
+        series = series.astype(object)
+    codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=True)
+    sortable = True
+    if uniques.dtype == object:
+        # pandas sorts mixed types that the sklearn encoders reject, so sort like
+        # them to find out whether the values have an order
+        try:
+            np.sort(uniques.to_numpy())
+        except TypeError:
+            sortable = False
+
+    if kind != ColumnKind.CATEGORICAL:
+        if isinstance(series.array, pd.api.extensions.ExtensionArray) and hasattr(
+            series.array, "_mask"
+        ):
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+        elif isinstance(series.dtype, pd.DatetimeTZDtype):
+            # As datetime64 in UTC instead of an object array of Timestamps
+            values = series.dt.tz_convert(None).to_numpy()
+        else:
+            values = series.to_numpy()
+
+    null_mask = series.isna().to_numpy()
+    return ColumnProfile(
+        name=series.name,
+        kind=kind,
+        null_mask=null_mask,
+        n_missing=int(np.count_nonzero(null_mask)),
+        codes=codes,
+        n_categories=len(uniques),
+        values=values,
+        fixed_category_count=fixed_category_count,
+        sortable=sortable,
+    )
+
+
+class ColumnCache:
+    """
+    Lazily computed ColumnProfiles for the columns of a DataFrame, shared by all
+    pairs of a matrix or predictors run so that the per-column work is done once.
+    """
+
+    def __init__(self, df: Any, rows: Optional[np.ndarray] = None):
+        # Any object that returns a pd.Series for df[column] works as source
+        self._df = df
+        # If given, only these row positions of df are profiled, in this order
+        self._rows = rows
+        self._profiles: dict[Any, ColumnProfile] = {}
+        self._bins: dict[Any, Optional[FeatureBins]] = {}
+        self._digests: dict[Any, str] = {}
+        # Baseline scores of targets, keyed by the target and how its rows were sampled
+        self.baselines: dict[tuple, float] = {}
+
+    def profile(self, column: Any) -> ColumnProfile:
+        """
+        Returns the profile of the column. Raises a TypeError if the values of the
+        column are not hashable, e.g. lists.
+        """
+        if column not in self._profiles:
+            series = self._df[column]
+            if self._rows is not None:
+                series = series.take(self._rows)
+            self._profiles[column] = profile_column(series)
+        return self._profiles[column]
+
+    def digest(self, column: Any) -> str:
+        """
+        Returns the column_digest of all rows of the column. Raises a TypeError if
+        the values of the column are not hashable, e.g. lists.
+        """
+        if column not in self._digests:
+            self._digests[column] = column_digest(self._df[column])
+        return self._digests[column]
+
+    def bins(self, column: Any) -> Optional[FeatureBins]:
+        """
+        Returns the FeatureBins of a numeric column or None if the column is not
+        numeric or has infinite values
+        """
+        if column not in self._bins:
+            profile = self.profile(column)
+            feature_bins = None
+            if (
+                profile.kind == ColumnKind.NUMERIC
+                and profile.values.dtype.kind in "biuf"
+            ):
+                feature_bins = bin_column(profile)
+                if not np.isfinite(feature_bins.values).all():
+                    feature_bins = None
+            self._bins[column] = feature_bins
+        return self._bins[column]
@@ -1,9 +1,14 @@
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from ppscore.core.models import TaskType
 
+if TYPE_CHECKING:
+    from ppscore.core.column_cache import ColumnProfile
+    from ppscore.core.sampling import SamplingPlan
+
 
 def dtype_represents_categories(series: pd.Series) -> bool:
     """Determines if the dtype of the series represents categorical values"""
@@ -31,41 +36,135 @@ def determine_case_and_prepare_df(
     df: pd.DataFrame, x: str, y: str, sample: int = 5_000, random_seed: int = 123
 ) -> Tuple[pd.DataFrame, TaskType]:
     """Returns str with the name of the determined case based on the columns x and y"""
-    from pandas.api.types import (
-        is_datetime64_any_dtype,
-        is_numeric_dtype,
-        is_timedelta64_dtype,
-    )
+    from ppscore.core.column_cache import profile_column
 
     if x == y:
         return df, TaskType.PREDICT_ITSELF
 
-    df = df[[x, y]]
-    df = df.dropna()
+    rows, case_type = determine_case_from_profiles(
+        profile_column(df[x]),
+        profile_column(df[y]),
+        sample=sample,
+        random_seed=random_seed,
+    )
+    # A single take of the selected rows instead of dropna and sample copies
+    return df[[x, y]].take(rows), case_type
+
+
+def determine_case_from_profiles(
+    x: "ColumnProfile",
+    y: "ColumnProfile",
+    sample: int = 5_000,
+    random_seed: int = 123,
+    sampling_plan: Optional["SamplingPlan"] = None,
+) -> Tuple[np.ndarray, TaskType]:
+    """
+    Determines the case of the columns x and y from their profiles and returns
+    the positions of the rows that are left after dropping missing values and
+    sampling, in sampling order. With a sampling_plan, the rows are sampled from
+    the permutation that the plan shares across pairs.
+    """
+    from ppscore.core.column_cache import ColumnKind
+
+    if x.name == y.name:
+        return np.arange(len(x.codes)), TaskType.PREDICT_ITSELF
 
-    if len(df) == 0:
-        return df, TaskType.EMPTY_DATAFRAME_AFTER_DROPPING_NA
+    rows = np.flatnonzero(~(x.null_mask | y.null_mask))
 
-    df = maybe_sample(df, sample, random_seed=random_seed)
+    if len(rows) == 0:
+        return rows, TaskType.EMPTY_DATAFRAME_AFTER_DROPPING_NA
 
-    if feature_is_id(df, x):
-        return df, TaskType.FEATURE_IS_ID
+    if sampling_plan is not None:
+        rows = sampling_plan.sample_rows(rows)
+    else:
+        rows = sample_rows(rows, sample, random_seed=random_seed)
 
-    category_count = df[y].value_counts().count()
+    if x.kind == ColumnKind.CATEGORICAL and x.count_categories(rows) == len(rows):
+        return rows, TaskType.FEATURE_IS_ID
+
+    category_count = y.count_categories(rows)
     if category_count == 1:
-        return df, TaskType.TARGET_IS_CONSTANT
-    if dtype_represents_categories(df[y]) and (category_count == len(df[y])):
-        return df, TaskType.TARGET_IS_ID
+        return rows, TaskType.TARGET_IS_CONSTANT
+    if y.kind == ColumnKind.CATEGORICAL and (category_count == len(rows)):
+        return rows, TaskType.TARGET_IS_ID
+
+    if y.kind == ColumnKind.CATEGORICAL:
+        return rows, TaskType.CLASSIFICATION
+    if y.kind == ColumnKind.NUMERIC:
+        return rows, TaskType.REGRESSION
 
-    if dtype_represents_categories(df[y]):
-        return df, TaskType.CLASSIFICATION
-    if is_numeric_dtype(df[y]):
-        return df, TaskType.REGRESSION
+    if y.kind == ColumnKind.DATETIME:
+        return rows, TaskType.TARGET_IS_DATETIME
 
-    if is_datetime64_any_dtype(df[y]) or is_timedelta64_dtype(df[y]):
-        return df, TaskType.TARGET_IS_DATETIME
+    return rows, TaskType.TARGET_DATA_TYPE_NOT_SUPPORTED
 
-    return df, TaskType.TARGET_DATA_TYPE_NOT_SUPPORTED
+
+def determine_case_from_columns(
+    x: "ColumnProfile", y: "ColumnProfile", sample: Optional[int] = 5_000
+) -> Optional[TaskType]:
+    """
+    Returns the case of the columns x and y if the single columns decide it for
+    every set of rows that can be left after dropping missing values and
+    sampling, i.e. the case that determine_case_from_profiles would return, and
+    None if the case depends on the rows that are left
+    """
+    from ppscore.core.column_cache import ColumnKind
+
+    if x.name == y.name:
+        return TaskType.PREDICT_ITSELF
+
+    n_rows = len(x.null_mask)
+    if x.n_missing == n_rows or y.n_missing == n_rows:
+        return TaskType.EMPTY_DATAFRAME_AFTER_DROPPING_NA
+
+    all_rows_are_left = (
+        x.n_missing == 0 and y.n_missing == 0 and not (sample and n_rows > sample)
+    )
+    min_rows_left = n_rows - x.n_missing - y.n_missing
+    if sample:
+        min_rows_left = min(min_rows_left, sample)
+    if min_rows_left < 1:
+        return None
+
+    if x.kind == ColumnKind.CATEGORICAL:
+        # Any subset of distinct values is distinct, but a subset of other values
+        # can be distinct as well
+        if _has_distinct_values(x):
+            return TaskType.FEATURE_IS_ID
+        if not all_rows_are_left:
+            return None
+        if x.fixed_category_count == n_rows:
+            return TaskType.FEATURE_IS_ID
+
+    category_count = (
+        y.fixed_category_count if y.fixed_category_count is not None else y.n_categories
+    )
+    if category_count == 1:
+        return TaskType.TARGET_IS_CONSTANT
+
+    if all_rows_are_left:
+        target_is_distinct = category_count == n_rows
+    elif _has_distinct_values(y) and min_rows_left >= 2:
+        target_is_distinct = True
+    else:
+        # The rows that are left could make the target constant or an ID
+        return None
+
+    if y.kind == ColumnKind.CATEGORICAL and target_is_distinct:
+        return TaskType.TARGET_IS_ID
+    if y.kind in [ColumnKind.CATEGORICAL, ColumnKind.NUMERIC]:
+        return None
+    if y.kind == ColumnKind.DATETIME:
+        return TaskType.TARGET_IS_DATETIME
+    return TaskType.TARGET_DATA_TYPE_NOT_SUPPORTED
+
+
+def _has_distinct_values(column: "ColumnProfile") -> bool:
+    """Whether every non-missing value of the column occurs only once"""
+    return (
+        column.fixed_category_count is None
+        and column.n_categories == len(column.null_mask) - column.n_missing
+    )
 
 
 def maybe_sample(
@@ -77,3 +176,27 @@ def maybe_sample(
     if sample and len(df) > sample:
         df = df.sample(sample, random_state=random_seed, replace=False)
     return df
+
+
+def select_rows(
+    x: pd.Series, y: pd.Series, sample: int, random_seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Returns the positions of the rows without missing values in x and y, maybe
+    sampled. These are the rows that determine_case_from_profiles selects.
+    """
+    rows = np.flatnonzero(~(x.isna().to_numpy() | y.isna().to_numpy()))
+    return sample_rows(rows, sample, random_seed=random_seed)
+
+
+def sample_rows(
+    rows: np.ndarray, sample: int, random_seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Maybe samples the given row positions to have at most `sample` rows.
+    Selects the same rows as maybe_sample on a df with these rows.
+    """
+    if sample and len(rows) > sample:
+        random_state = np.random.RandomState(random_seed)
+        rows = rows[random_state.choice(len(rows), sample, replace=False)]
+    return rows
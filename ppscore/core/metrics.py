@@ -1,6 +1,6 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
-import pandas as pd
+import numpy as np
 
 
 def normalized_mae_score(model_mae: float, naive_mae: float) -> float:
@@ -12,18 +12,28 @@ def normalized_mae_score(model_mae: float, naive_mae: float) -> float:
 
 
 def mae_normalizer(
-    df: pd.DataFrame, y: str, model_score: float, **kwargs
+    target: np.ndarray,
+    model_score: float,
+    baseline_score: Optional[float] = None,
+    **kwargs,
 ) -> Tuple[float, float]:
-    """In case of MAE, calculates the baseline score for y and derives the PPS."""
-    from sklearn.metrics import mean_absolute_error  # type: ignore
-
-    df["naive"] = df[y].median()
-    baseline_score = mean_absolute_error(df[y].to_numpy(), df["naive"].to_numpy())
+    """
+    In case of MAE, calculates the baseline score for the target values and
+    derives the PPS. A baseline score that was already calculated for the same
+    target values can be passed.
+    """
+    if baseline_score is None:
+        baseline_score = mae_baseline_score(target)
 
     ppscore = normalized_mae_score(abs(model_score), baseline_score)
     return ppscore, baseline_score
 
 
+def mae_baseline_score(target: np.ndarray) -> float:
+    """MAE of always predicting the median"""
+    return float(np.mean(np.abs(target - np.median(target))))
+
+
 def normalized_f1_score(model_f1: float, baseline_f1: float) -> float:
     """Normalizes the model F1 score, given the baseline score"""
     if model_f1 < baseline_f1:
@@ -35,21 +45,40 @@ def normalized_f1_score(model_f1: float, baseline_f1: float) -> float:
 
 
 def f1_normalizer(
-    df: pd.DataFrame, y: str, model_score: float, random_seed: int
+    labels: np.ndarray,
+    model_score: float,
+    random_seed: int,
+    baseline_score: Optional[float] = None,
 ) -> Tuple[float, float]:
-    """In case of F1, calculates the baseline score for y and derives the PPS."""
-    from sklearn import preprocessing  # type: ignore
-    from sklearn.metrics import f1_score
-
-    label_encoder = preprocessing.LabelEncoder()
-    df["truth"] = label_encoder.fit_transform(df[y])
-    df["most_common_value"] = df["truth"].value_counts().index[0]
-    random = df["truth"].sample(frac=1, random_state=random_seed)
-
-    baseline_score = max(
-        f1_score(df["truth"], df["most_common_value"], average="weighted"),
-        f1_score(df["truth"], random, average="weighted"),
-    )
+    """
+    In case of F1, calculates the baseline score for the encoded target labels and
+    derives the PPS. A baseline score that was already calculated for the same
+    labels can be passed.
+    """
+    if baseline_score is None:
+        baseline_score = f1_baseline_score(labels, random_seed)
 
     ppscore = normalized_f1_score(model_score, baseline_score)
     return ppscore, baseline_score
+
+
+def f1_baseline_score(labels: np.ndarray, random_seed: int) -> float:
+    """
+    Weighted F1 of the better naive model: always predicting the most common
+    label or predicting the shuffled labels. Both follow from counts: the most
+    common label m only scores on its own rows, 2 n_m / (n + n_m) weighted by
+    n_m / n. Shuffled labels have the same counts as the labels, so the F1 of
+    every label is its share of matching rows and the weighted F1 is the share
+    of rows that keep their label.
+    """
+    n_rows = len(labels)
+    n_most_common = int(np.bincount(labels).max())
+    most_common_score = (
+        n_most_common / n_rows * 2 * n_most_common / (n_rows + n_most_common)
+    )
+
+    # Same order as Series.sample(frac=1, random_state=random_seed)
+    random = labels[np.random.RandomState(random_seed).permutation(n_rows)]
+    random_score = float(np.count_nonzero(labels == random)) / n_rows
+
+    return max(most_common_score, random_score)
@@ -1,9 +1,31 @@
+from typing import (
+    TYPE_CHECKING,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
 import numpy as np
 import pandas as pd
 
-from ppscore.core.data_types import dtype_represents_categories
+from ppscore.core.column_cache import (
+    ColumnKind,
+    ColumnProfile,
+    FeatureBins,
+    one_hot_encode,
+    profile_column,
+)
 from ppscore.core.models import ScoreTask, TaskType
 
+if TYPE_CHECKING:
+    from ppscore.core.sampling import SamplingPlan
+
+# A number of folds or the (train, test) folds themselves
+CrossValidation = Union[int, list]
+
 
 def calculate_model_cv_score(
     df: pd.DataFrame,
@@ -15,43 +37,860 @@ def calculate_model_cv_score(
     **kwargs,
 ) -> float:
     """Calculates the mean model score based on cross-validation"""
-    from sklearn import preprocessing  # type: ignore
-    from sklearn.model_selection import cross_val_score  # type: ignore
+    return calculate_model_cv_score_from_profiles(
+        np.arange(len(df)),
+        target=profile_column(df[target]),
+        feature=profile_column(df[feature]),
+        task=task,
+        cross_validation=cross_validation,
+        random_seed=random_seed,
+        **kwargs,
+    )
+
+
+def calculate_model_cv_score_from_profiles(
+    rows: np.ndarray,
+    target: ColumnProfile,
+    feature: ColumnProfile,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+    random_seed: int,
+    feature_bins: Optional[FeatureBins] = None,
+    sampling_plan: Optional["SamplingPlan"] = None,
+    folds_key: Optional[Hashable] = None,
+    **kwargs,
+) -> float:
+    """
+    Calculates the mean model score based on cross-validation for the given rows
+    of the profiled columns. The rows are shuffled through a single permutation
+    index and the encoded columns are sliced with it, so no frame is copied.
+    If feature_bins are given, the numeric feature is scored on its bins.
+    A sampling_plan provides the permutation and, for a folds_key that
+    identifies the rows and the target, the folds shared with other pairs.
+    """
+    return float(
+        np.mean(
+            list(
+                iter_model_fold_scores_from_profiles(
+                    rows,
+                    target,
+                    feature,
+                    task,
+                    cross_validation,
+                    random_seed,
+                    feature_bins=feature_bins,
+                    sampling_plan=sampling_plan,
+                    folds_key=folds_key,
+                )
+            )
+        )
+    )
 
-    metric = task.metric_key
-    model = task.model
 
-    # Shuffle the rows for better cross-validation
-    df = df.sample(frac=1, random_state=random_seed, replace=False)
+def iter_model_fold_scores_from_profiles(
+    rows: np.ndarray,
+    target: ColumnProfile,
+    feature: ColumnProfile,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+    random_seed: int,
+    feature_bins: Optional[FeatureBins] = None,
+    sampling_plan: Optional["SamplingPlan"] = None,
+    folds_key: Optional[Hashable] = None,
+    sequential: bool = False,
+) -> Iterator[float]:
+    """
+    Yields the model score of every cross-validation fold, see
+    calculate_model_cv_score_from_profiles. If sequential, sklearn models are
+    fitted one fold at a time, so that stopping the iteration skips the fits
+    of the remaining folds.
+    """
+    # Shuffle the rows for better cross-validation (same order as df.sample(frac=1))
+    if sampling_plan is not None:
+        rows = rows[sampling_plan.permutation(len(rows))]
+    else:
+        random_state = np.random.RandomState(random_seed)
+        rows = rows[random_state.permutation(len(rows))]
 
     # Preprocess target
     if task.type == TaskType.CLASSIFICATION:
-        label_encoder = preprocessing.LabelEncoder()
-        df[target] = label_encoder.fit_transform(df[target])
-        target_series = df[target]
+        target_array = target.labels(rows)
     else:
-        target_series = df[target]
+        target_array = target.values[rows]
+
+    if sampling_plan is not None and folds_key is not None:
+        cross_validation = sampling_plan.folds(
+            folds_key, task, target_array, cross_validation
+        )
 
     # Preprocess feature
-    if dtype_represents_categories(df[feature]):
-        one_hot_encoder = preprocessing.OneHotEncoder()
-        array = df[feature].__array__()
-        sparse_matrix = one_hot_encoder.fit_transform(array.reshape(-1, 1))
-        feature_input = sparse_matrix
+    if feature.kind == ColumnKind.CATEGORICAL:
+        yield from iter_categorical_model_fold_scores(
+            feature.labels(rows), target_array, task, cross_validation, sequential
+        )
+    elif feature_bins is not None:
+        yield from iter_binned_model_fold_scores(
+            feature_bins.bins[rows],
+            feature_bins.values,
+            target_array,
+            task,
+            cross_validation,
+            sequential,
+        )
     else:
         # Reshaping needed because there is only 1 feature
-        array = df[feature].values  # type: ignore
-        if not isinstance(array, np.ndarray):  # e.g Int64 IntegerArray
-            array = array.to_numpy()
-        feature_input = array.reshape(-1, 1)
+        feature_input = feature.values[rows].reshape(-1, 1)
+
+        # Cross-validation
+        yield from iter_model_fold_scores(
+            feature_input, target_array, task, cross_validation, sequential
+        )
+
+
+def cross_validate_model(
+    feature_input,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> float:
+    """
+    Returns the mean cross-validation score of the task's model. Uses the
+    closed-form group-by engine when it is equivalent to the model and the
+    native 1-D engine for the 1-D tree models, else sklearn.
+    """
+    return float(
+        np.mean(
+            list(iter_model_fold_scores(feature_input, target, task, cross_validation))
+        )
+    )
+
+
+def iter_model_fold_scores(
+    feature_input,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+    sequential: bool = False,
+) -> Iterator[float]:
+    """
+    Yields the score of every fold of cross_validate_model. If sequential,
+    sklearn models are fitted one fold at a time.
+    """
+    from sklearn.model_selection import cross_val_score  # type: ignore
+
+    from ppscore.core.tree1d import BaseTree1D
+
+    feature = native_engine_feature(feature_input, target, task)
+    if feature is not None and is_default_tree(task.model):
+        yield from iter_groupby_fold_scores(feature, target, task, cross_validation)
+    elif feature is not None and isinstance(task.model, BaseTree1D):
+        yield from iter_tree1d_fold_scores(feature, target, task, cross_validation)
+    elif sequential:
+        from sklearn.base import clone  # type: ignore
+        from sklearn.metrics import get_scorer  # type: ignore
+
+        # Fits the model the way cross_val_score does, one fold per step
+        scorer = get_scorer(task.metric_key)
+        for train, test in cross_validation_folds(task, target, cross_validation):
+            model = clone(task.model).fit(feature_input[train], target[train])
+            yield scorer(model, feature_input[test], target[test])
+    else:
+        yield from cross_val_score(
+            task.model,
+            feature_input,
+            target,
+            cv=cross_validation,
+            scoring=task.metric_key,
+        )
+
+
+def cross_validate_categorical_model(
+    codes: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> float:
+    """
+    Returns the mean cross-validation score of the task's model for a categorical
+    feature given as consecutive integer codes. Uses the per-category engine when
+    it is equivalent to the model, else sklearn on the one-hot encoded codes.
+    """
+    return float(
+        np.mean(
+            list(
+                iter_categorical_model_fold_scores(
+                    codes, target, task, cross_validation
+                )
+            )
+        )
+    )
+
+
+def iter_categorical_model_fold_scores(
+    codes: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+    sequential: bool = False,
+) -> Iterator[float]:
+    """Yields the score of every fold of cross_validate_categorical_model"""
+    if is_default_tree(task.model) and native_engine_supports(target, task):
+        yield from iter_category_fold_scores(codes, target, task, cross_validation)
+    else:
+        yield from iter_model_fold_scores(
+            one_hot_encode(codes), target, task, cross_validation, sequential
+        )
+
+
+def iter_binned_model_fold_scores(
+    bins: np.ndarray,
+    bin_values: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+    sequential: bool = False,
+) -> Iterator[float]:
+    """
+    Yields the cross-validation fold scores of the task's model for a binned
+    numeric feature. Uses the bin aggregate engine when it is equivalent to the
+    model on the binned feature, else the model on the smallest value of each bin.
+    """
+    if is_default_tree(task.model) and native_engine_supports(target, task):
+        yield from iter_hist_fold_scores(
+            bins, bin_values, target, task, cross_validation
+        )
+    else:
+        feature_input = bin_values[bins].reshape(-1, 1)
+        yield from iter_model_fold_scores(
+            feature_input, target, task, cross_validation, sequential
+        )
+
+
+def calculate_sequential_cv_score(
+    fold_scores: Iterable[float], task: ScoreTask, baseline_score: float
+) -> Tuple[float, int]:
+    """
+    Mean of the fold scores that evaluates one fold after the other. After at
+    least two folds, stops when the confidence interval of the mean PPS of the
+    folds lies below 0, so the PPS is 0 anyway, or is at most twice
+    EARLY_STOPPING_TOLERANCE wide. The PPS of a fold is not clipped at 0 here.
+    Only the default metrics stop early. Returns the mean and the number of
+    evaluated folds.
+    """
+    from scipy.stats import t  # type: ignore[import-untyped]
+
+    scores: list[float] = []
+    fold_ppscores = []
+    for score in fold_scores:
+        scores.append(score)
+        fold_ppscore = _unclipped_fold_ppscore(task, score, baseline_score)
+        if fold_ppscore is None:
+            continue
+        fold_ppscores.append(fold_ppscore)
+        n_folds = len(fold_ppscores)
+        if n_folds < 2:
+            continue
+
+        half_width = (
+            t.ppf((1 + EARLY_STOPPING_CONFIDENCE) / 2, n_folds - 1)
+            * np.std(fold_ppscores, ddof=1)
+            / np.sqrt(n_folds)
+        )
+        mean_ppscore = np.mean(fold_ppscores)
+        if mean_ppscore + half_width < 0 or half_width <= EARLY_STOPPING_TOLERANCE:
+            break
+    return float(np.mean(scores)), len(scores)
+
+
+# Sequential cross-validation stops when the PPS is known with this confidence
+EARLY_STOPPING_CONFIDENCE = 0.95
+# up to plus or minus this tolerance, or when it is 0 with this confidence
+EARLY_STOPPING_TOLERANCE = 0.02
+
+
+def _unclipped_fold_ppscore(
+    task: ScoreTask, score: float, baseline_score: float
+) -> Optional[float]:
+    """
+    The PPS of a fold's score in the default metrics, without clipping at 0, or
+    None for other metrics and baselines that leave no room for improvement
+    """
+    if task.metric_key not in NATIVE_ENGINE_METRICS.get(task.type, []):
+        return None
+    if task.type == TaskType.CLASSIFICATION:
+        if baseline_score >= 1:
+            return None
+        return (score - baseline_score) / (1 - baseline_score)
+    if baseline_score <= 0:
+        return None
+    # The score is the negative mae
+    return 1 + score / baseline_score
+
+
+def is_default_tree(model) -> bool:
+    """Returns True if the model is an unconfigured (full-depth) sklearn tree"""
+    from sklearn import tree  # type: ignore
+
+    for tree_class in [tree.DecisionTreeRegressor, tree.DecisionTreeClassifier]:
+        if type(model) is tree_class:
+            if tree_class not in _DEFAULT_TREE_PARAMS:
+                _DEFAULT_TREE_PARAMS[tree_class] = tree_class().get_params()
+            return model.get_params() == _DEFAULT_TREE_PARAMS[tree_class]
+    return False
+
+
+# The parameters of unconfigured sklearn trees, computed once
+_DEFAULT_TREE_PARAMS: dict[type, dict] = {}
+
+
+def native_engine_feature(
+    feature_input, target: np.ndarray, task: ScoreTask
+) -> Optional[np.ndarray]:
+    """
+    Returns the feature as float32 array if the native engines can score the task,
+    i.e. the default metric on a single finite real or boolean feature, else None
+    """
+    if not isinstance(feature_input, np.ndarray) or feature_input.ndim != 2:
+        return None
+    dtype = feature_input.dtype
+    if feature_input.shape[1] != 1 or not (
+        np.issubdtype(dtype, np.integer)
+        or np.issubdtype(dtype, np.floating)
+        or dtype == bool
+    ):
+        return None
+    if not native_engine_supports(target, task):
+        return None
+
+    # sklearn trees work on float32 features and reject non-finite values
+    with np.errstate(over="ignore"):
+        feature = feature_input[:, 0].astype(np.float32)
+    if not np.isfinite(feature).all():
+        return None
+    return feature
+
+
+def native_engine_supports(target: np.ndarray, task: ScoreTask) -> bool:
+    """
+    Returns True if the native engines can compute the task's metric for the
+    target, i.e. the default metric on a finite real (classification: integer)
+    target
+    """
+    if task.metric_key not in NATIVE_ENGINE_METRICS.get(task.type, []):
+        return False
+    if not (
+        np.issubdtype(target.dtype, np.integer)
+        or np.issubdtype(target.dtype, np.floating)
+    ):
+        return False
+    if task.type == TaskType.CLASSIFICATION and not np.issubdtype(
+        target.dtype, np.integer
+    ):
+        return False
+    return bool(np.isfinite(target).all())
+
+
+# The native engines compute the metric themselves, so only these are supported
+NATIVE_ENGINE_METRICS = {
+    TaskType.REGRESSION: ["neg_mean_absolute_error"],
+    TaskType.CLASSIFICATION: ["f1_weighted"],
+}
+
+
+def calculate_groupby_cv_score(
+    feature: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> float:
+    """Mean of iter_groupby_fold_scores"""
+    return float(
+        np.mean(list(iter_groupby_fold_scores(feature, target, task, cross_validation)))
+    )
+
+
+def iter_groupby_fold_scores(
+    feature: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> Iterator[float]:
+    """
+    Closed-form equivalent of cross_val_score for a full-depth decision tree with
+    a single numeric feature. Such a tree keeps splitting until every leaf is pure
+    or holds a single feature value, so it predicts the per-value target mean
+    (regression) or mode (classification) of the training fold, and routes unseen
+    values to the nearest training value through the midpoint thresholds.
+    The folds are the ones that cross_val_score would use.
+    """
+    is_classification = task.type == TaskType.CLASSIFICATION
+    for train, test in cross_validation_folds(task, target, cross_validation):
+        predictions = predict_groupby(
+            feature[train], target[train], feature[test], is_classification
+        )
+        yield fold_score(task, target[test], predictions)
+
+
+def leave_one_out_neighbors(
+    groups: np.ndarray, group_values: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Returns the group whose rows predict every row if the row itself is left
+    out, for groups given as integer codes of the sorted feature values: its own
+    group if that has other rows, else the nearest group by group_values, like
+    the midpoint thresholds of a tree, or -1 for all other rows without
+    group_values
+    """
+    n_groups = int(groups.max()) + 1
+    counts = np.bincount(groups, minlength=n_groups)
+    neighbors = groups.copy()
+    is_alone = counts[groups] == 1
+    present = np.flatnonzero(counts)
+    if not is_alone.any():
+        return neighbors
+    if group_values is None or len(present) == 1:
+        neighbors[is_alone] = -1
+        return neighbors
+
+    alone_groups = groups[is_alone]
+    # The groups are ranks, so the position among the present groups is a count
+    position = (np.cumsum(counts > 0) - 1)[alone_groups]
+    below = present[np.maximum(position - 1, 0)]
+    above = present[np.minimum(position + 1, len(present) - 1)]
+    values = group_values[alone_groups]
+    use_below = (position == len(present) - 1) | (
+        (position > 0) & (values - group_values[below] <= group_values[above] - values)
+    )
+    neighbors[is_alone] = np.where(use_below, below, above)
+    return neighbors
+
+
+def calculate_leave_one_out_regression_score(
+    groups: np.ndarray, target: np.ndarray, neighbors: np.ndarray
+) -> float:
+    """
+    Negative MAE of a full-depth regression tree if every row is predicted by
+    the tree trained on all other rows, i.e. by the target mean of the other
+    rows of the group that leave_one_out_neighbors returned for it. Trained on
+    more rows than in cross-validation, this is a cheap and optimistic estimate
+    of the cross-validated score.
+    """
+    n_groups = int(groups.max()) + 1
+    is_own_group = neighbors == groups
+    has_neighbor = neighbors >= 0
+    neighbor = np.where(has_neighbor, neighbors, 0)
+
+    sums = np.bincount(groups, weights=target, minlength=n_groups)
+    counts = np.bincount(groups, minlength=n_groups)
+    predictions = (sums[neighbor] - is_own_group * target) / np.maximum(
+        counts[neighbor] - is_own_group, 1
+    )
+    predictions[~has_neighbor] = (np.sum(target) - target[~has_neighbor]) / max(
+        len(target) - 1, 1
+    )
+    return -float(np.mean(np.abs(target - predictions)))
+
+
+def calculate_groupby_cv_scores(
+    feature: np.ndarray,
+    targets: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+    order: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    calculate_groupby_cv_score of one feature for several targets, given as the
+    rows of a 2-D array that share their folds, e.g. the regression targets of
+    a KFold. The feature is sorted once (or a given stable argsort of it is used)
+    and every fold takes the order of its training rows from that sort. The group
+    aggregates and fold scores are computed for all targets at once.
+    """
+    if order is None:
+        order = np.argsort(feature, kind="stable")
+    is_classification = task.type == TaskType.CLASSIFICATION
+    folds = cross_validation_folds(task, targets[0], cross_validation)
+
+    scores = np.empty((len(folds), len(targets)))
+    is_train = np.zeros(len(feature), dtype=bool)
+    for fold, (train, test) in enumerate(folds):
+        is_train[:] = False
+        is_train[train] = True
+        # The train rows are increasing, so this is the stable sort of the fold
+        train_order = order[is_train[order]]
+        sorted_feature = feature[train_order]
+        group, starts = _sorted_feature_groups(sorted_feature)
+        test_group = _route_to_groups(sorted_feature, starts, feature[test])
+
+        if is_classification:
+            for index, target in enumerate(targets):
+                modes = _group_modes(group, target[train_order], len(starts))
+                scores[fold, index] = weighted_f1_score(target[test], modes[test_group])
+        else:
+            sorted_targets = targets[:, train_order]
+            sums = np.add.reduceat(sorted_targets, starts, axis=1)
+            means = sums / np.diff(np.append(starts, len(train_order)))
+            errors = np.abs(targets[:, test] - means[:, test_group])
+            scores[fold] = -np.mean(errors, axis=1)
+    return scores.mean(axis=0)
+
+
+def iter_category_fold_scores(
+    codes: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> Iterator[float]:
+    """
+    Closed-form equivalent of cross_val_score for a full-depth decision tree with
+    a one-hot encoded categorical feature. Every split of such a tree separates
+    one category from the rest of its node, so it predicts the per-category target
+    mean (regression) or mode (classification) of the training fold. Categories
+    that are missing from the training fold are routed to the leaf that remains
+    after the tree split off one category after another.
+    The folds are the ones that cross_val_score would use.
+    """
+    is_classification = task.type == TaskType.CLASSIFICATION
+    for train, test in cross_validation_folds(task, target, cross_validation):
+        predictions = predict_category(
+            codes[train], target[train], codes[test], is_classification
+        )
+        yield fold_score(task, target[test], predictions)
+
+
+def calculate_hist_cv_score(
+    bins: np.ndarray,
+    bin_values: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> float:
+    """Mean of iter_hist_fold_scores"""
+    return float(
+        np.mean(
+            list(
+                iter_hist_fold_scores(bins, bin_values, target, task, cross_validation)
+            )
+        )
+    )
+
+
+def iter_hist_fold_scores(
+    bins: np.ndarray,
+    bin_values: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> Iterator[float]:
+    """
+    Cross-validation of a full-depth decision tree on a binned feature that works
+    on per-fold bin aggregates: a training fold's aggregates are the totals minus
+    those of its test fold. The tree predicts the target mean (regression) or mode
+    (classification) per bin and routes bins without training rows to the nearest
+    training bin through the midpoints of the bin values.
+    """
+    n_bins = len(bin_values)
+    folds = cross_validation_folds(task, target, cross_validation)
+    fold_of_row = np.empty(len(target), dtype=np.int64)
+    for fold, (_, test) in enumerate(folds):
+        fold_of_row[test] = fold
+    fold_bins = fold_of_row * n_bins + bins
+
+    if task.type == TaskType.CLASSIFICATION:
+        n_classes = int(target.max()) + 1
+        if len(folds) * n_bins * n_classes > MAX_HIST_AGGREGATES:
+            # Too many classes for dense aggregates, so group the rows instead
+            feature = bin_values[bins].astype(np.float32)
+            yield from iter_groupby_fold_scores(feature, target, task, cross_validation)
+            return
+
+        counts = np.bincount(
+            fold_bins * n_classes + target,
+            minlength=len(folds) * n_bins * n_classes,
+        ).reshape(len(folds), n_bins, n_classes)
+        train_counts = counts.sum(axis=0) - counts
+        for fold in range(len(folds)):
+            has_rows = train_counts[fold].sum(axis=1) > 0
+            modes = np.argmax(train_counts[fold][has_rows], axis=1)
+            bin_prediction = modes[_nearest_bins(bin_values, has_rows)]
+
+            # Confusion counts of the test fold, aggregated per bin
+            test_counts = counts[fold]
+            true_positives = np.bincount(
+                bin_prediction,
+                weights=test_counts[np.arange(n_bins), bin_prediction],
+                minlength=n_classes,
+            )
+            predicted_counts = np.bincount(
+                bin_prediction, weights=test_counts.sum(axis=1), minlength=n_classes
+            )
+            yield weighted_f1_from_counts(
+                true_positives, test_counts.sum(axis=0), predicted_counts
+            )
+        return
+
+    minlength = len(folds) * n_bins
+    bin_counts = np.bincount(fold_bins, minlength=minlength).reshape(len(folds), n_bins)
+    bin_sums = np.bincount(fold_bins, weights=target, minlength=minlength).reshape(
+        len(folds), n_bins
+    )
+    train_counts = bin_counts.sum(axis=0) - bin_counts
+    train_sums = bin_sums.sum(axis=0) - bin_sums
+    for fold, (_, test) in enumerate(folds):
+        has_rows = train_counts[fold] > 0
+        means = train_sums[fold][has_rows] / train_counts[fold][has_rows]
+        bin_prediction = means[_nearest_bins(bin_values, has_rows)]
+        yield fold_score(task, target[test], bin_prediction[bins[test]])
+
+
+# Upper limit of the (fold, bin, class) counts that the hist engine allocates
+MAX_HIST_AGGREGATES = 2**24
+
+
+def _nearest_bins(bin_values: np.ndarray, has_rows: np.ndarray) -> np.ndarray:
+    """
+    Index into the bins with rows for every bin, the way a tree that was fitted on
+    the bin values routes them
+    """
+    values = bin_values[has_rows]
+    thresholds = values[:-1] / 2.0 + values[1:] / 2.0
+    return np.searchsorted(thresholds, bin_values, side="left")
+
+
+def iter_tree1d_fold_scores(
+    feature: np.ndarray,
+    target: np.ndarray,
+    task: ScoreTask,
+    cross_validation: CrossValidation,
+) -> Iterator[float]:
+    """
+    Cross-validation of the 1-D tree models that sorts the feature once and
+    derives the sorted training rows of every fold from that single sort
+    """
+    from sklearn.base import clone  # type: ignore
+
+    order = np.argsort(feature, kind="stable")
+    for train, test in cross_validation_folds(task, target, cross_validation):
+        is_train = np.zeros(len(target), dtype=bool)
+        is_train[train] = True
+        sorted_train = order[is_train[order]]
+
+        model = clone(task.model).fit_sorted(
+            feature[sorted_train], target[sorted_train]
+        )
+        predictions = model.predict(feature[test].reshape(-1, 1))
+        yield fold_score(task, target[test], predictions)
+
+
+def fold_score(task: ScoreTask, y_true: np.ndarray, y_pred: np.ndarray) -> float:
+    """Score of the predictions of one fold in the task's metric"""
+    if task.type == TaskType.CLASSIFICATION:
+        return weighted_f1_score(y_true, y_pred)
+    # sklearn returns the negative mae
+    return -float(np.mean(np.abs(y_true - y_pred)))
+
 
-    # Cross-validation
-    scores = cross_val_score(
-        model,
-        feature_input,
-        target_series.to_numpy(),
-        cv=cross_validation,
-        scoring=metric,
+def cross_validation_folds(task: ScoreTask, target: np.ndarray, cross_validation):
+    """Returns the (train, test) folds that cross_val_score uses for the task"""
+    from sklearn.base import is_classifier  # type: ignore
+    from sklearn.model_selection import check_cv  # type: ignore
+
+    cv = check_cv(cross_validation, target, classifier=is_classifier(task.model))
+    return list(cv.split(np.zeros((len(target), 1)), target))
+
+
+def predict_groupby(
+    train_feature: np.ndarray,
+    train_target: np.ndarray,
+    test_feature: np.ndarray,
+    is_classification: bool,
+) -> np.ndarray:
+    """Predictions of a full-depth tree that was fitted on the training fold"""
+    order = np.argsort(train_feature, kind="stable")
+    sorted_feature = train_feature[order]
+    sorted_target = train_target[order]
+
+    group, starts = _sorted_feature_groups(sorted_feature)
+    n_groups = len(starts)
+
+    if is_classification:
+        group_prediction = _group_modes(group, sorted_target, n_groups)
+    else:
+        sums = np.bincount(group, weights=sorted_target, minlength=n_groups)
+        group_prediction = sums / np.bincount(group, minlength=n_groups)
+
+    return group_prediction[_route_to_groups(sorted_feature, starts, test_feature)]
+
+
+def _sorted_feature_groups(sorted_feature: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Groups of sorted feature values that a tree cannot separate: the group of
+    every value and the position where every group starts
+    """
+    from ppscore.core.tree1d import FEATURE_THRESHOLD
+
+    is_group_start = np.empty(len(sorted_feature), dtype=bool)
+    is_group_start[:1] = True
+    is_group_start[1:] = sorted_feature[1:] > (sorted_feature[:-1] + FEATURE_THRESHOLD)
+    return np.cumsum(is_group_start) - 1, np.flatnonzero(is_group_start)
+
+
+def _route_to_groups(
+    sorted_feature: np.ndarray, starts: np.ndarray, test_feature: np.ndarray
+) -> np.ndarray:
+    """Routes the test values to the groups through the midpoint thresholds"""
+    # Thresholds between the last value of a group and the first of the next one
+    lower = sorted_feature[starts[1:] - 1].astype(np.float64)
+    upper = sorted_feature[starts[1:]].astype(np.float64)
+    thresholds = lower / 2.0 + upper / 2.0
+
+    return np.searchsorted(thresholds, test_feature.astype(np.float64), side="left")
+
+
+def predict_category(
+    train_codes: np.ndarray,
+    train_target: np.ndarray,
+    test_codes: np.ndarray,
+    is_classification: bool,
+) -> np.ndarray:
+    """Predictions of a full-depth tree that was fitted on the one-hot training fold"""
+    n_codes = int(max(train_codes.max(), test_codes.max())) + 1
+    counts = np.bincount(train_codes, minlength=n_codes)
+    if is_classification:
+        category_prediction = _group_modes(train_codes, train_target, n_codes)
+    else:
+        sums = np.bincount(train_codes, weights=train_target, minlength=n_codes)
+        category_prediction = sums / np.maximum(counts, 1)
+
+    is_unseen = counts[test_codes] == 0
+    if is_unseen.any():
+        remainder: float
+        if is_classification:
+            remainder = _remaining_classification_leaf(train_codes, train_target)
+        else:
+            remainder = _remaining_regression_leaf(train_codes, train_target)
+        category_prediction[counts == 0] = remainder
+    return category_prediction[test_codes]
+
+
+def _remaining_regression_leaf(codes: np.ndarray, target: np.ndarray) -> float:
+    """
+    Mean of the leaf that a regression tree on the one-hot categories reaches for
+    rows whose category is 0 in every column, i.e. unseen categories. The tree
+    splits off the category with the best MSE proxy until the rest is pure or a
+    single category; the lowest category wins ties, which sklearn breaks randomly.
+    """
+    from ppscore.core.tree1d import EPSILON
+
+    _, compact = np.unique(codes, return_inverse=True)
+    counts = np.bincount(compact).astype(np.float64)
+    sums = np.bincount(compact, weights=target)
+    squared_sums = np.bincount(compact, weights=target**2)
+
+    n_node = counts.sum()
+    sum_total = sums.sum()
+    squared_sum_total = squared_sums.sum()
+    while True:
+        impurity = squared_sum_total / n_node - (sum_total / n_node) ** 2
+        if len(counts) == 1 or impurity <= EPSILON:
+            return sum_total / n_node
+
+        proxy_improvement = (sum_total - sums) ** 2 / (n_node - counts) + (
+            sums**2 / counts
+        )
+        category = np.argmax(proxy_improvement)
+        n_node -= counts[category]
+        sum_total -= sums[category]
+        squared_sum_total -= squared_sums[category]
+        counts, sums, squared_sums = (
+            np.delete(array, category) for array in [counts, sums, squared_sums]
+        )
+
+
+def _remaining_classification_leaf(codes: np.ndarray, labels: np.ndarray) -> int:
+    """
+    Mode of the leaf that a classification tree on the one-hot categories reaches
+    for unseen categories, see _remaining_regression_leaf, with the Gini proxy
+    """
+    from ppscore.core.tree1d import EPSILON
+
+    _, compact = np.unique(codes, return_inverse=True)
+    n_categories = int(compact.max()) + 1
+    n_classes = int(labels.max()) + 1
+
+    # Sparse (category, class) counts, grouped by category
+    pair_keys, pair_counts = np.unique(
+        compact.astype(np.int64) * n_classes + labels, return_counts=True
+    )
+    pair_categories, pair_classes = np.divmod(pair_keys, n_classes)
+    pair_counts = pair_counts.astype(np.float64)
+    counts = np.bincount(compact, minlength=n_categories).astype(np.float64)
+    squared_counts = np.bincount(
+        pair_categories, weights=pair_counts**2, minlength=n_categories
     )
+    starts = np.searchsorted(pair_categories, np.arange(n_categories + 1))
+
+    class_counts = np.bincount(labels, minlength=n_classes).astype(np.float64)
+    remaining = np.ones(n_categories, dtype=bool)
+    while True:
+        n_node = class_counts.sum()
+        squared_count_total = float(np.sum(class_counts**2))
+        if remaining.sum() == 1 or 1.0 - squared_count_total / n_node**2 <= EPSILON:
+            return int(np.argmax(class_counts))
+
+        # Sums of squared class counts of the node without each category
+        cross = np.bincount(
+            pair_categories,
+            weights=class_counts[pair_classes] * pair_counts,
+            minlength=n_categories,
+        )
+        n_rest = n_node - counts
+        squared_rest = squared_count_total - 2.0 * cross + squared_counts
+
+        # Same expression as sklearn's Gini proxy, the category is the right child
+        with np.errstate(divide="ignore", invalid="ignore"):
+            proxy_improvement = -counts * (
+                1.0 - squared_counts / (counts * counts)
+            ) - n_rest * (1.0 - squared_rest / (n_rest * n_rest))
+        proxy_improvement[~remaining] = -np.inf
 
-    return scores.mean()
+        category = int(np.argmax(proxy_improvement))
+        remaining[category] = False
+        pair_slice = slice(starts[category], starts[category + 1])
+        class_counts[pair_classes[pair_slice]] -= pair_counts[pair_slice]
+
+
+def _group_modes(group: np.ndarray, labels: np.ndarray, n_groups: int) -> np.ndarray:
+    """Most common label per group, the lowest label winning ties"""
+    pair_keys, pair_counts = np.unique(
+        group.astype(np.int64) * (int(labels.max()) + 1) + labels, return_counts=True
+    )
+    pair_groups, pair_labels = np.divmod(pair_keys, int(labels.max()) + 1)
+    order = np.lexsort((pair_labels, -pair_counts, pair_groups))
+    first_of_group = np.ones(len(order), dtype=bool)
+    first_of_group[1:] = pair_groups[order][1:] != pair_groups[order][:-1]
+    modes = np.empty(n_groups, dtype=labels.dtype)
+    modes[pair_groups[order][first_of_group]] = pair_labels[order][first_of_group]
+    return modes
+
+
+def weighted_f1_score(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+    """Same as sklearn's f1_score(average="weighted") for integer labels"""
+    n_labels = int(max(y_true.max(), y_pred.max())) + 1
+    true_positives = np.bincount(y_true[y_true == y_pred], minlength=n_labels)
+    true_counts = np.bincount(y_true, minlength=n_labels)
+    predicted_counts = np.bincount(y_pred, minlength=n_labels)
+    return weighted_f1_from_counts(true_positives, true_counts, predicted_counts)
+
+
+def weighted_f1_from_counts(
+    true_positives: np.ndarray, true_counts: np.ndarray, predicted_counts: np.ndarray
+) -> float:
+    """Weighted F1 score from the per-label confusion counts"""
+    denominator = true_counts + predicted_counts
+    f1 = np.divide(
+        2.0 * true_positives,
+        denominator,
+        out=np.zeros(len(denominator)),
+        where=denominator > 0,
+    )
+    return float(np.sum(f1 * true_counts) / np.sum(true_counts))
@@ -15,6 +15,10 @@ class TaskType(str, Enum):
     TARGET_DATA_TYPE_NOT_SUPPORTED = "target_data_type_not_supported"
     EMPTY_DATAFRAME_AFTER_DROPPING_NA = "empty_dataframe_after_dropping_na"
     UNKNOWN_ERROR = "unknown_error"
+    # Not scored because an upper bound of the PPS is below min_ppscore
+    BELOW_MIN_PPSCORE = "below_min_ppscore"
+    # Not scored because the time budget ran out or the run was cancelled
+    NOT_SCORED = "not_scored"
 
 
 class ScoreTask(BaseModel):
@@ -45,3 +49,34 @@ class PPSResult(BaseModel):
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class AdaptivePPSResult(PPSResult):
+    """PPSResult of adaptive sampling, with the size of the sample that was used"""
+
+    sample_size: int
+    # False if the largest sample was reached before the PPS converged
+    converged: bool
+
+
+class ScoreProgress(BaseModel):
+    """Progress of a run over many pairs, passed to progress callbacks"""
+
+    n_done: int
+    n_total: int
+    elapsed_seconds: float
+    # Estimated from the pairs that needed a model, None before the first one
+    eta_seconds: Optional[float] = None
+
+
+class ScoreCoverage(BaseModel):
+    """How many pairs of a run with a time budget or cancellation were scored"""
+
+    n_pairs: int
+    # Including the pairs whose case their columns decide
+    n_scored: int
+    n_not_scored: int
+    fraction_scored: float
+    elapsed_seconds: float
+    # "time_budget" or "cancelled" if the run stopped early, otherwise None
+    stop_reason: Optional[str] = None
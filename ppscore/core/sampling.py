@@ -0,0 +1,89 @@
+from collections.abc import Hashable
+
+import numpy as np
+
+from ppscore.core.modelling import cross_validation_folds
+from ppscore.core.models import ScoreTask
+
+# Adaptive sampling starts with this many rows and doubles the sample every step
+ADAPTIVE_START_SAMPLE = 500
+ADAPTIVE_GROWTH = 2
+
+
+def adaptive_sample_sizes(n_rows: int) -> list[int]:
+    """
+    The growing sample sizes of adaptive sampling for n_rows rows, ending with
+    n_rows
+    """
+    sizes = []
+    size = ADAPTIVE_START_SAMPLE
+    while size < n_rows:
+        sizes.append(size)
+        size *= ADAPTIVE_GROWTH
+    return sizes + [n_rows]
+
+
+class SamplingPlan:
+    """
+    Sampling decisions that are shared by all pairs of a predictors or matrix
+    run: one permutation of all rows, from which every pair takes its sample by
+    masking it with the rows that have no missing values, the permutations that
+    shuffle the sampled rows for cross-validation and the cross-validation folds
+    of rows that are shared by several pairs.
+
+    Pairs without missing values get the same rows and folds as in a single
+    score call, pairs with missing values get a sample of the same size drawn
+    from the shared permutation.
+    """
+
+    def __init__(self, n_rows: int, sample: int, random_seed: int):
+        self.n_rows = n_rows
+        self.sample = sample
+        self.random_seed = random_seed
+        self._permutations: dict[int, np.ndarray] = {}
+        self._folds: dict[Hashable, list] = {}
+
+    def permutation(self, n_rows: int) -> np.ndarray:
+        """
+        The permutation of n_rows positions for the random seed, i.e. the order
+        of df.sample(frac=1, random_state=random_seed) on n_rows rows
+        """
+        permutation = self._permutations.get(n_rows)
+        if permutation is None:
+            permutation = np.random.RandomState(self.random_seed).permutation(n_rows)
+            # Only the sizes that most pairs share are kept
+            if n_rows in (self.n_rows, self.sample):
+                self._permutations[n_rows] = permutation
+        return permutation
+
+    def sample_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Maybe samples the given row positions to have at most `sample` rows.
+        Selects the same rows as sample_rows if rows are all rows of the frame.
+        """
+        if not self.sample or len(rows) <= self.sample:
+            return rows
+
+        order = self.permutation(self.n_rows)
+        if len(rows) < self.n_rows:
+            is_selected = np.zeros(self.n_rows, dtype=bool)
+            is_selected[rows] = True
+            order = order[is_selected[order]]
+        return order[: self.sample]
+
+    def folds(
+        self,
+        key: Hashable,
+        task: ScoreTask,
+        target: np.ndarray,
+        cross_validation,
+    ) -> list:
+        """
+        The cross-validation folds of the target, computed once per key. The key
+        has to identify the shuffled rows of the target.
+        """
+        folds = self._folds.get(key)
+        if folds is None:
+            folds = cross_validation_folds(task, target, cross_validation)
+            self._folds[key] = folds
+        return folds
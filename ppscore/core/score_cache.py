@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Mapping, Optional
+
+import pandas as pd
+
+from ppscore.core.models import PPSResult, ScoreTask, TaskType
+
+# Part of every key, so that a new way of scoring never reuses old entries
+CACHE_FORMAT_VERSION = 1
+
+# The number of entries is only checked against the bound every so many inserts
+EVICTION_INTERVAL = 100
+
+_RESULT_FIELDS = [
+    "ppscore",
+    "case",
+    "is_valid_score",
+    "metric",
+    "baseline_score",
+    "model_score",
+]
+
+
+def column_digest(series: pd.Series) -> str:
+    """
+    Fast hash of the values and the dtype of a column. Raises a TypeError if the
+    values are not hashable, e.g. lists.
+    """
+    row_hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update(str(series.dtype).encode())
+    return digest.hexdigest()
+
+
+def task_registry_fingerprint(task_registry: Mapping[TaskType, ScoreTask]) -> str:
+    """Hash of the configuration of every task: model, metric and fixed scores"""
+    config = []
+    for case_type, task in sorted(task_registry.items()):
+        model = task.model
+        params = model.get_params() if hasattr(model, "get_params") else None
+        config.append(
+            [
+                case_type.value,
+                type(model).__qualname__,
+                repr(sorted((params or {}).items())),
+                task.metric_key,
+                getattr(task.score_normalizer, "__qualname__", None),
+                task.model_score,
+                task.baseline_score,
+                task.ppscore,
+            ]
+        )
+    return hashlib.blake2b(
+        json.dumps(config, default=repr).encode(), digest_size=16
+    ).hexdigest()
+
+
+def score_cache_key(x_digest: str, y_digest: str, registry: str, **settings) -> str:
+    """Key of the score of the column x predicting y with the given settings"""
+    content = json.dumps(
+        [CACHE_FORMAT_VERSION, x_digest, y_digest, registry, sorted(settings.items())],
+        default=repr,
+    )
+    return hashlib.blake2b(content.encode(), digest_size=20).hexdigest()
+
+
+class ScoreCache:
+    """
+    Persistent cache of scores in a SQLite file, keyed by the content of the two
+    columns and the scoring settings (see score_cache_key). Evicts the least
+    recently used scores beyond max_entries, checked every EVICTION_INTERVAL
+    inserts and on close. Counts the hits and misses of this process and of the
+    worker processes of its parallel runs. Can be shared by several processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        # A forked process inherits the object, but must not use the connection
+        self._connection_pid: Optional[int] = None
+        self._inserts_since_eviction = 0
+
+    def __getstate__(self) -> dict:
+        # Every process opens its own connection
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, "
+                "ppscore REAL, case_type TEXT, is_valid_score INTEGER, metric TEXT, "
+                "baseline_score REAL, model_score REAL, last_used INTEGER)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)"
+            )
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Returns the stored PPSResult fields (without x, y and model) or None"""
+        row = self.connection.execute(
+            "SELECT ppscore, case_type, is_valid_score, metric, baseline_score, "
+            "model_score FROM scores WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self.connection:
+            self.connection.execute(
+                "UPDATE scores SET last_used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+        fields = dict(zip(_RESULT_FIELDS, row))
+        fields["is_valid_score"] = bool(fields["is_valid_score"])
+        return fields
+
+    def put(self, key: str, result: PPSResult) -> None:
+        """Stores the scores of the result"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    result.ppscore,
+                    TaskType(result.case).value,
+                    int(result.is_valid_score),
+                    result.metric,
+                    result.baseline_score,
+                    result.model_score,
+                    time.time_ns(),
+                ),
+            )
+        self._inserts_since_eviction += 1
+        if self._inserts_since_eviction >= EVICTION_INTERVAL:
+            self.evict()
+
+    def evict(self) -> None:
+        """Deletes the least recently used entries beyond max_entries"""
+        self._inserts_since_eviction = 0
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM scores WHERE key IN (SELECT key FROM scores "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self) -> None:
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self.evict()
+            self._connection.close()
+        self._connection = None
@@ -0,0 +1,210 @@
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from ppscore.core.models import PPSResult, ScoreCoverage, ScoreTask, TaskType
+
+# The case of a pair is stored as its position in this list
+CASES = list(TaskType)
+CASE_CODES = {case: code for code, case in enumerate(CASES)}
+
+FIELDS = [
+    "x",
+    "y",
+    "ppscore",
+    "case",
+    "is_valid_score",
+    "metric",
+    "baseline_score",
+    "model_score",
+    "model",
+]
+
+
+class ScoreTable:
+    """
+    The scores of many (x, y) pairs as a struct of arrays instead of one PPSResult
+    per pair: float arrays of the scores, the case as a code of CASES and x and y
+    as positions in the list of columns. The metric and the model are the same
+    for all pairs of a case, so they are kept once per case. PPSResults are only
+    created when single pairs are accessed.
+    """
+
+    def __init__(self, columns: list, x: np.ndarray, y: np.ndarray):
+        self.columns = list(columns)
+        self._column_positions = {column: i for i, column in enumerate(self.columns)}
+        self.x = x
+        self.y = y
+        n_pairs = len(x)
+        self.ppscore = np.zeros(n_pairs)
+        self.baseline_score = np.zeros(n_pairs)
+        self.model_score = np.zeros(n_pairs)
+        self.is_valid_score = np.zeros(n_pairs, dtype=bool)
+        self.case = np.zeros(n_pairs, dtype=np.int8)
+        # The metric name and the model of every case code
+        self.case_details: dict[int, tuple[Optional[str], Any]] = {}
+        # The column_digest of every column and the settings of the scores, which
+        # tell update_matrix which scores are still valid
+        self.column_digests: dict[Any, Optional[str]] = {}
+        self.settings: dict[str, Any] = {}
+        # Set by runs with a time budget or cancellation
+        self.coverage: Optional[ScoreCoverage] = None
+
+    @classmethod
+    def from_pairs(cls, pairs: list) -> "ScoreTable":
+        """An empty table for the given (x, y) pairs"""
+        columns = list(dict.fromkeys(column for pair in pairs for column in pair))
+        positions = {column: i for i, column in enumerate(columns)}
+        x = np.array([positions[x] for x, _ in pairs], dtype=np.int64)
+        y = np.array([positions[y] for _, y in pairs], dtype=np.int64)
+        return cls(columns, x, y)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "ScoreTable":
+        """
+        The table of a DataFrame with one row per pair, like the one of to_frame,
+        including the column digests and settings in its attrs
+        """
+        table = cls.from_pairs(list(zip(frame["x"], frame["y"])))
+        for name in ["ppscore", "baseline_score", "model_score"]:
+            setattr(table, name, frame[name].to_numpy(dtype=float))
+        table.is_valid_score = frame["is_valid_score"].to_numpy(dtype=bool)
+        table.case = np.array(
+            [CASE_CODES[TaskType(case)] for case in frame["case"]], dtype=np.int8
+        )
+        for code, metric, model in zip(table.case, frame["metric"], frame["model"]):
+            table.case_details.setdefault(int(code), (metric, model))
+        table.column_digests = dict(frame.attrs.get("column_digests", {}))
+        table.settings = dict(frame.attrs.get("score_settings", {}))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ppscore)
+
+    def __getitem__(self, position: int) -> PPSResult:
+        case = CASES[self.case[position]]
+        metric, model = self.case_details[self.case[position]]
+        return PPSResult(
+            x=self.columns[self.x[position]],
+            y=self.columns[self.y[position]],
+            ppscore=float(self.ppscore[position]),
+            case=case,
+            is_valid_score=bool(self.is_valid_score[position]),
+            metric=metric,
+            baseline_score=float(self.baseline_score[position]),
+            model_score=float(self.model_score[position]),
+            model=model,
+        )
+
+    def __iter__(self) -> Iterator[PPSResult]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def set_result(self, position: int, result: PPSResult) -> None:
+        """Stores the PPSResult of a pair"""
+        self.x[position] = self._column_positions[result.x]
+        self.y[position] = self._column_positions[result.y]
+        self.case[position] = CASE_CODES[TaskType(result.case)]
+        self.ppscore[position] = result.ppscore
+        self.baseline_score[position] = result.baseline_score
+        self.model_score[position] = result.model_score
+        self.is_valid_score[position] = result.is_valid_score
+        self.case_details.setdefault(self.case[position], (result.metric, result.model))
+
+    def set_task(self, positions: np.ndarray, task: ScoreTask) -> None:
+        """Stores the scores of the pairs at the positions, whose case needs no model"""
+        code = CASE_CODES[task.type]
+        self.case[positions] = code
+        self.ppscore[positions] = task.ppscore
+        self.baseline_score[positions] = task.baseline_score
+        self.model_score[positions] = task.model_score
+        self.is_valid_score[positions] = task.is_valid_score
+        self.case_details.setdefault(code, (task.metric_name, task.model))
+
+    def copy_scores(
+        self, positions: np.ndarray, other: "ScoreTable", other_positions: np.ndarray
+    ) -> None:
+        """Copies the scores of the other table at other_positions to the positions"""
+        for name in [
+            "ppscore",
+            "baseline_score",
+            "model_score",
+            "is_valid_score",
+            "case",
+        ]:
+            getattr(self, name)[positions] = getattr(other, name)[other_positions]
+        for code in np.unique(other.case[other_positions]):
+            self.case_details.setdefault(int(code), other.case_details[code])
+
+    def take(self, positions: np.ndarray) -> "ScoreTable":
+        """Returns a table with the pairs at the given positions"""
+        table = ScoreTable(self.columns, self.x[positions], self.y[positions])
+        for name in [
+            "ppscore",
+            "baseline_score",
+            "model_score",
+            "is_valid_score",
+            "case",
+        ]:
+            setattr(table, name, getattr(self, name)[positions])
+        table.case_details = dict(self.case_details)
+        table.column_digests = dict(self.column_digests)
+        table.settings = dict(self.settings)
+        table.coverage = self.coverage
+        return table
+
+    def sort_by_ppscore(self) -> "ScoreTable":
+        """
+        Returns the table sorted by decreasing ppscore, keeping the order of pairs
+        with the same score
+        """
+        return self.take(np.argsort(-self.ppscore, kind="stable"))
+
+    def to_list(self) -> list[PPSResult]:
+        """Materializes the PPSResult of every pair"""
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns the scores as a DataFrame with one row per pair, the same as a
+        DataFrame of the PPSResult dicts
+        """
+        case_values = np.array([case.value for case in CASES], dtype=object)
+        metrics = np.empty(len(CASES), dtype=object)
+        models = np.empty(len(CASES), dtype=object)
+        for code, (metric, model) in self.case_details.items():
+            metrics[code] = metric
+            models[code] = model
+
+        columns = np.empty(len(self.columns), dtype=object)
+        columns[:] = self.columns
+        data = {
+            "x": columns[self.x].tolist(),
+            "y": columns[self.y].tolist(),
+            "ppscore": self.ppscore,
+            "case": case_values[self.case].tolist(),
+            "is_valid_score": self.is_valid_score,
+            "metric": metrics[self.case].tolist(),
+            "baseline_score": self.baseline_score,
+            "model_score": self.model_score,
+            "model": models[self.case],
+        }
+        frame = pd.DataFrame(data, columns=FIELDS)
+        if self.column_digests:
+            frame.attrs["column_digests"] = dict(self.column_digests)
+            frame.attrs["score_settings"] = dict(self.settings)
+        if self.coverage is not None:
+            frame.attrs["coverage"] = dict(self.coverage)
+        return frame
+
+    def to_square(self, values: str = "ppscore") -> pd.DataFrame:
+        """
+        Returns the values of the pairs as a square DataFrame with the targets y
+        as index and the features x as columns, like pivot(index="y", columns="x").
+        Pairs that were not scored are NaN.
+        """
+        square = np.full((len(self.columns), len(self.columns)), np.nan)
+        square[self.y, self.x] = getattr(self, values)
+        index = pd.Index(self.columns)
+        return pd.DataFrame(square, index=index.rename("y"), columns=index.rename("x"))
@@ -1,11 +1,98 @@
-from sklearn import tree  # type: ignore
+import math
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 from ppscore.core.metrics import f1_normalizer, mae_normalizer
 from ppscore.core.models import ScoreTask, TaskType
+from ppscore.core.validators import validate_model_factory
+
+# Built on first use, because the default models import scikit-learn, and again
+# after every registration
+_default_registry: Optional[Mapping[TaskType, ScoreTask]] = None
+# The registered tasks, which replace the default task of their case
+_registered_tasks: dict[TaskType, ScoreTask] = {}
+# The factories of the registered models, which create fresh models
+_model_factories: dict[TaskType, Callable[[], Any]] = {}
+
+
+def default_task_registry() -> Mapping[TaskType, ScoreTask]:
+    """
+    The read-only registry of the tasks that calculators use by default. It is
+    built once and shared, so its tasks and models must not be changed. Use
+    register_task and register_model to replace tasks, or get_task_registry
+    for a registry that can be changed.
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MappingProxyType(
+            {**_build_task_registry(), **_registered_tasks}
+        )
+    return _default_registry
 
 
 def get_task_registry() -> dict[TaskType, ScoreTask]:
-    """Returns a dictionary with all tasks and their corresponding ScoreTask"""
+    """
+    Returns a dictionary with all tasks and their corresponding ScoreTask. The
+    tasks and their models are copies of the default registry, so they can be
+    changed.
+    """
+    registry = _build_task_registry()
+    for case_type, task in _registered_tasks.items():
+        registry[case_type] = task.model_copy(
+            update={"model": _new_model(case_type, task)}
+        )
+    return registry
+
+
+def register_task(task: ScoreTask) -> None:
+    """
+    Makes the task the default task of its case, for the calculators that are
+    created afterwards
+    """
+    global _default_registry
+    _registered_tasks[task.type] = task
+    _model_factories.pop(task.type, None)
+    _default_registry = None
+
+
+def register_model(task_type: TaskType, model_factory: Callable[[], Any]) -> None:
+    """
+    Scores the regression or classification case with the models of the
+    factory, keeping the metric of the task, e.g.
+    register_model(TaskType.REGRESSION, partial(KNeighborsRegressor, 10)).
+    The factory is called without arguments and has to be picklable, so that
+    it can create the models of other processes.
+    """
+    validate_model_factory(task_type, model_factory)
+    task = default_task_registry()[task_type]
+    register_task(task.model_copy(update={"model": model_factory()}))
+    _model_factories[task_type] = model_factory
+
+
+def reset_task_registry() -> None:
+    """Removes all registered tasks and models"""
+    global _default_registry
+    _registered_tasks.clear()
+    _model_factories.clear()
+    _default_registry = None
+
+
+def _new_model(case_type: TaskType, task: ScoreTask) -> Any:
+    """A new, unfitted model of a registered task"""
+    if case_type in _model_factories:
+        return _model_factories[case_type]()
+    if task.model is None:
+        return None
+    from sklearn.base import clone  # type: ignore
+
+    return clone(task.model)
+
+
+def _build_task_registry() -> dict[TaskType, ScoreTask]:
+    """The default tasks"""
+    from sklearn import tree  # type: ignore
+
     return {
         TaskType.REGRESSION: ScoreTask(
             type=TaskType.REGRESSION,
@@ -76,15 +163,28 @@ def get_task_registry() -> dict[TaskType, ScoreTask]:
     }
 
 
-def get_invalid_task(case_type: TaskType, invalid_score: float) -> ScoreTask:
+def get_invalid_task(
+    case_type: TaskType,
+    invalid_score: float,
+    task_registry: Optional[Mapping[TaskType, ScoreTask]] = None,
+) -> ScoreTask:
     """Get an invalid task for cases where calculation is not possible"""
-    if case_type in get_task_registry().keys():
-        return get_task_registry()[case_type]  # type: ignore
-    elif case_type in [
+    if task_registry is None:
+        task_registry = default_task_registry()
+    if case_type in task_registry.keys():
+        return task_registry[case_type]
+    return _invalid_task(case_type, invalid_score)
+
+
+@lru_cache(maxsize=1024)
+def _invalid_task(case_type: TaskType, invalid_score: float) -> ScoreTask:
+    """The task of a case without a valid score, shared by all pairs of the case"""
+    if case_type in [
         TaskType.TARGET_IS_DATETIME,
         TaskType.TARGET_DATA_TYPE_NOT_SUPPORTED,
         TaskType.EMPTY_DATAFRAME_AFTER_DROPPING_NA,
         TaskType.UNKNOWN_ERROR,
+        TaskType.BELOW_MIN_PPSCORE,
     ]:
         return ScoreTask(
             type=case_type,
@@ -97,4 +197,13 @@ def get_invalid_task(case_type: TaskType, invalid_score: float) -> ScoreTask:
             model=None,
             score_normalizer=None,
         )
+    if case_type == TaskType.NOT_SCORED:
+        # The score is unknown rather than invalid
+        return ScoreTask(
+            type=case_type,
+            is_valid_score=False,
+            model_score=math.nan,
+            baseline_score=math.nan,
+            ppscore=math.nan,
+        )
     raise Exception(f"case_type {case_type} is not supported")
@@ -0,0 +1,129 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+from pydantic import BaseModel
+
+# The stages of scoring a pair whose wall time a Tracer records
+STAGES = (
+    "validation",
+    "cache",
+    "encoding",
+    "case",
+    "cross_validation",
+    "normalizer",
+)
+
+
+class PairTrace(BaseModel):
+    """Instrumentation of one scored pair"""
+
+    x: str
+    y: str
+    case: Optional[str] = None
+    # Wall time per stage, see STAGES
+    stage_seconds: dict[str, float] = {}
+    rows: int = 0
+    # Distinct values of a categorical feature plus classes of the target
+    categories: int = 0
+    # None if the calculator has no score cache or the pair cannot be cached
+    cache_hit: Optional[bool] = None
+    # True if the stage times are an equal share of targets scored in one pass
+    batched: bool = False
+
+
+class RunStats(BaseModel):
+    """Aggregate of the PairTraces of a Tracer"""
+
+    n_pairs: int = 0
+    cases: dict[str, int] = {}
+    stage_seconds: dict[str, float] = {}
+    rows: int = 0
+    categories: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+class Tracer:
+    def __init__(
+        self,
+        callback: Optional[Callable[[PairTrace], None]] = None,
+        keep_traces: bool = True,
+    ):
+        """
+        Collects a PairTrace of every pair that a PPSCalculator scores and their
+        RunStats. If given, callback is called with every PairTrace, e.g. to
+        export it to a metrics system. keep_traces=False only keeps the stats.
+        """
+        self.callback = callback
+        self.keep_traces = keep_traces
+        self.traces: list[PairTrace] = []
+        self.stats = RunStats()
+        # Calculators may record traces from several threads
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, trace: PairTrace, name: str) -> Iterator[None]:
+        """Adds the wall time of the block to the stage of the trace"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            trace.stage_seconds[name] = trace.stage_seconds.get(name, 0.0) + elapsed
+
+    def record(self, trace: PairTrace) -> None:
+        """Adds a finished trace to the stats and passes it to the callback"""
+        with self._lock:
+            self._add(trace)
+        if self.callback is not None:
+            self.callback(trace)
+
+    def _add(self, trace: PairTrace) -> None:
+        stats = self.stats
+        stats.n_pairs += 1
+        if trace.case is not None:
+            stats.cases[trace.case] = stats.cases.get(trace.case, 0) + 1
+        for name, seconds in trace.stage_seconds.items():
+            stats.stage_seconds[name] = stats.stage_seconds.get(name, 0.0) + seconds
+        stats.rows += trace.rows
+        stats.categories += trace.categories
+        if trace.cache_hit is not None:
+            stats.cache_hits += trace.cache_hit
+            stats.cache_misses += not trace.cache_hit
+
+        if self.keep_traces:
+            self.traces.append(trace)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The traces as a table with one row per pair and a column per stage"""
+        return pd.DataFrame(
+            [
+                {
+                    "x": trace.x,
+                    "y": trace.y,
+                    "case": trace.case,
+                    "rows": trace.rows,
+                    "categories": trace.categories,
+                    "cache_hit": trace.cache_hit,
+                    "batched": trace.batched,
+                    **{
+                        f"{name}_seconds": trace.stage_seconds.get(name, 0.0)
+                        for name in STAGES
+                    },
+                }
+                for trace in self.traces
+            ],
+            columns=[
+                "x",
+                "y",
+                "case",
+                "rows",
+                "categories",
+                "cache_hit",
+                "batched",
+                *(f"{name}_seconds" for name in STAGES),
+            ],
+        )
@@ -0,0 +1,199 @@
+from typing import Optional
+
+import numpy as np
+from sklearn.base import (  # type: ignore
+    BaseEstimator,
+    ClassifierMixin,
+    RegressorMixin,
+)
+
+# Same constants as the sklearn tree builder: nodes with an impurity below
+# EPSILON are leaves and adjacent values closer than FEATURE_THRESHOLD
+# (compared in float32) are never split
+EPSILON = np.finfo("double").eps
+FEATURE_THRESHOLD = np.float32(1e-7)
+
+
+def as_sorted_feature(X) -> np.ndarray:
+    """Returns the single feature of X as float32 array, like sklearn trees use it"""
+    array = np.asarray(X)
+    if array.ndim != 2 or array.shape[1] != 1:
+        raise ValueError(
+            f"The 1-D tree models expect exactly 1 feature but X has shape {array.shape}"
+        )
+    return array[:, 0].astype(np.float32)
+
+
+class BaseTree1D(BaseEstimator):
+    """
+    Decision tree for a single numeric feature. Every node of such a tree is a
+    contiguous range of the sorted feature, so the best split of a node can be
+    found for all positions at once with prefix sums over the sorted rows.
+    The feature is sorted once per fit and that sort is reused for every level.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None, min_samples_leaf: int = 1):
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+
+    def fit(self, X, y):
+        feature = as_sorted_feature(X)
+        order = np.argsort(feature, kind="stable")
+        return self.fit_sorted(feature[order], np.asarray(y)[order])
+
+    def fit_sorted(self, sorted_feature: np.ndarray, sorted_target: np.ndarray):
+        """Fits the tree on rows that are already sorted by the float32 feature"""
+        if len(sorted_target) == 0:
+            raise ValueError("The 1-D tree models cannot be fitted on 0 samples")
+        target = self._encode_target(sorted_target)
+        leaves = self._build_leaves(sorted_feature, target)
+
+        ends = np.array([end for _, end in leaves[:-1]], dtype=np.intp)
+        lower = sorted_feature[ends - 1].astype(np.float64)
+        upper = sorted_feature[ends].astype(np.float64)
+        self.thresholds_ = lower / 2.0 + upper / 2.0
+        self.leaf_values_ = np.array(
+            [self._leaf_value(target[start:end]) for start, end in leaves]
+        )
+        self.n_leaves_ = len(leaves)
+        return self
+
+    def _predict_leaf_values(self, X) -> np.ndarray:
+        feature = as_sorted_feature(X).astype(np.float64)
+        return self.leaf_values_[
+            np.searchsorted(self.thresholds_, feature, side="left")
+        ]
+
+    def _build_leaves(
+        self, sorted_feature: np.ndarray, target: np.ndarray
+    ) -> list[tuple[int, int]]:
+        """Returns the (start, end) ranges of the leaves, from left to right"""
+        n_samples = len(target)
+        min_samples_leaf = self.min_samples_leaf
+        max_depth = np.inf if self.max_depth is None else self.max_depth
+
+        can_split = np.zeros(n_samples + 1, dtype=bool)
+        can_split[1:n_samples] = sorted_feature[1:] > (
+            sorted_feature[:-1] + FEATURE_THRESHOLD
+        )
+        split_finder = self._split_finder(target)
+
+        leaves = []
+        nodes = [(0, n_samples, 0)]
+        while nodes:
+            start, end, depth = nodes.pop()
+            position = None
+            if depth < max_depth and end - start >= max(2, 2 * min_samples_leaf):
+                candidates = np.arange(
+                    start + min_samples_leaf, end - min_samples_leaf + 1
+                )
+                candidates = candidates[can_split[candidates]]
+                if len(candidates):
+                    position = split_finder(start, end, candidates)
+            if position is None:
+                leaves.append((start, end))
+            else:
+                nodes.append((position, end, depth + 1))
+                nodes.append((start, position, depth + 1))
+        return leaves
+
+    def _encode_target(self, target: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _split_finder(self, target: np.ndarray):
+        raise NotImplementedError
+
+    def _leaf_value(self, target: np.ndarray):
+        raise NotImplementedError
+
+
+class Tree1DRegressor(RegressorMixin, BaseTree1D):
+    """1-D regression tree with the mean squared error split criterion"""
+
+    def predict(self, X) -> np.ndarray:
+        return self._predict_leaf_values(X)
+
+    def _encode_target(self, target: np.ndarray) -> np.ndarray:
+        return target.astype(np.float64)
+
+    def _split_finder(self, target: np.ndarray):
+        sums = np.concatenate([[0.0], np.cumsum(target)])
+        squared_sums = np.concatenate([[0.0], np.cumsum(target**2)])
+
+        def find_split(start: int, end: int, candidates: np.ndarray) -> Optional[int]:
+            n_node = end - start
+            sum_total = sums[end] - sums[start]
+            impurity = (squared_sums[end] - squared_sums[start]) / n_node - (
+                sum_total / n_node
+            ) ** 2
+            if impurity <= EPSILON:
+                return None
+
+            sum_left = sums[candidates] - sums[start]
+            n_left = candidates - start
+            proxy_improvement = sum_left**2 / n_left + (sum_total - sum_left) ** 2 / (
+                n_node - n_left
+            )
+            return int(candidates[np.argmax(proxy_improvement)])
+
+        return find_split
+
+    def _leaf_value(self, target: np.ndarray) -> float:
+        return float(np.mean(target))
+
+
+class Tree1DClassifier(ClassifierMixin, BaseTree1D):
+    """1-D classification tree with the Gini split criterion"""
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[self._predict_leaf_values(X)]
+
+    def _encode_target(self, target: np.ndarray) -> np.ndarray:
+        self.classes_, encoded = np.unique(target, return_inverse=True)
+        return encoded
+
+    def _split_finder(self, target: np.ndarray):
+        n_classes = len(self.classes_)
+
+        # How many rows of the same class precede each row, overall and in front
+        # of every node start, so that no node has to sort its labels again
+        class_order = np.argsort(target, kind="stable")
+        class_counts = np.bincount(target, minlength=n_classes)
+        ranks = np.empty(len(target), dtype=np.float64)
+        ranks[class_order] = (
+            np.arange(len(target))
+            - (np.cumsum(class_counts) - class_counts)[target[class_order]]
+        )
+        counts_before = {0: np.zeros(n_classes)}
+
+        def find_split(start: int, end: int, candidates: np.ndarray) -> Optional[int]:
+            labels = target[start:end]
+            n_node = end - start
+            counts = np.bincount(labels, minlength=n_classes).astype(np.float64)
+            squared_count_total = float(np.sum(counts**2))
+            if 1.0 - squared_count_total / n_node**2 <= EPSILON:
+                return None
+
+            # Sums of squared class counts left and right of every position
+            node_ranks = ranks[start:end] - counts_before[start][labels]
+            n_left = candidates - start
+            squared_left = np.cumsum(2.0 * node_ranks + 1.0)[n_left - 1]
+            cross = np.cumsum(counts[labels])[n_left - 1]
+            squared_right = squared_count_total - 2.0 * cross + squared_left
+
+            # Same expression as sklearn's Gini proxy, so that ties resolve alike
+            n_right = n_node - n_left
+            proxy_improvement = -n_right * (
+                1.0 - squared_right / (n_right * n_right)
+            ) - n_left * (1.0 - squared_left / (n_left * n_left))
+            position = int(candidates[np.argmax(proxy_improvement)])
+
+            counts_before[position] = counts_before[start] + np.bincount(
+                target[start:position], minlength=n_classes
+            )
+            return position
+
+        return find_split
+
+    def _leaf_value(self, target: np.ndarray) -> int:
+        return int(np.argmax(np.bincount(target)))
@@ -1,5 +1,9 @@
+import pickle
+
 import pandas as pd
 
+from ppscore.core.models import TaskType
+
 
 def validate_dataframe(df) -> None:
     if not isinstance(df, pd.DataFrame):
@@ -19,17 +23,21 @@ def validate_column_in_df(column: str, df: pd.DataFrame) -> None:
 
 
 def validate_unique_column(column: str, df: pd.DataFrame) -> None:
-    if len(df[[column]].columns) >= 2:
+    if df.columns.is_unique:
+        return
+    # Looks the column up in the index instead of copying it with df[[column]]
+    n_columns = len(df.columns.get_indexer_for([column]))
+    if n_columns >= 2:
         raise AssertionError(
-            f"The dataframe has {len(df[[column]].columns)} columns with the same column name {column}\n"
+            f"The dataframe has {n_columns} columns with the same column name {column}\n"
             f"Please adjust the dataframe and make sure that only 1 column has the name {column}"
         )
 
 
 def validate_output_format(output: str) -> None:
-    if output not in ["df", "list"]:
+    if output not in ["df", "list", "table"]:
         raise ValueError(
-            f"""The 'output' argument should be one of ["df", "list"] but you passed: {output}\n"""
+            f"""The 'output' argument should be one of ["df", "list", "table"] but you passed: {output}\n"""
             f"""Please adjust your input to one of the valid values"""
         )
 
@@ -47,3 +55,114 @@ def is_column_in_df(column: str, df: pd.DataFrame) -> bool:
         return column in df.columns
     except Exception:
         return False
+
+
+def validate_n_jobs(n_jobs) -> None:
+    if n_jobs is not None and (
+        isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or n_jobs == 0
+    ):
+        raise ValueError(
+            f"""The 'n_jobs' argument should be None or a non-zero integer but you passed: {n_jobs}\n"""
+            f"""Please use 1 for serial scoring, a positive number of processes or -1 for all CPUs"""
+        )
+
+
+def validate_method(method: str) -> None:
+    if method not in ["exact", "hist"]:
+        raise ValueError(
+            f"""The 'method' argument should be one of ["exact", "hist"] but you passed: {method}\n"""
+            f"""Please adjust your input to one of the valid values"""
+        )
+
+
+def validate_top_k(top_k, halving_factor) -> None:
+    if top_k is not None and (
+        isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1
+    ):
+        raise ValueError(
+            f"""The 'top_k' argument should be None or a positive integer but you passed: {top_k}\n"""
+            f"""Please use None to score all features or the number of best features to return"""
+        )
+    if (
+        isinstance(halving_factor, bool)
+        or not isinstance(halving_factor, (int, float))
+        or halving_factor <= 1
+    ):
+        raise ValueError(
+            f"""The 'halving_factor' argument should be a number greater than 1 but you passed: {halving_factor}\n"""
+            f"""Please use a larger factor to drop more features per round or a smaller one for a higher recall"""
+        )
+
+
+def validate_tolerance(tolerance) -> None:
+    if tolerance is not None and (
+        isinstance(tolerance, bool)
+        or not isinstance(tolerance, (int, float))
+        or tolerance <= 0
+    ):
+        raise ValueError(
+            f"""The 'tolerance' argument should be None or a positive number but you passed: {tolerance}\n"""
+            f"""Please use None to score the full sample or the change of the PPS at which adaptive sampling stops"""
+        )
+
+
+def validate_pairs_tolerance(tolerance) -> None:
+    if tolerance is not None:
+        raise ValueError(
+            f"""The 'tolerance' argument should be None when scoring many pairs but you passed: {tolerance}\n"""
+            f"""Please use score to score single pairs with adaptive sampling"""
+        )
+
+
+def validate_min_ppscore(min_ppscore) -> None:
+    if min_ppscore is not None and (
+        isinstance(min_ppscore, bool)
+        or not isinstance(min_ppscore, (int, float))
+        or not 0 <= min_ppscore <= 1
+    ):
+        raise ValueError(
+            f"""The 'min_ppscore' argument should be None or a number between 0 and 1 but you passed: {min_ppscore}\n"""
+            f"""Please use None to score all pairs or the PPS below which pairs may be skipped"""
+        )
+
+
+def validate_time_budget(time_budget) -> None:
+    if time_budget is not None and (
+        isinstance(time_budget, bool)
+        or not isinstance(time_budget, (int, float))
+        or time_budget <= 0
+    ):
+        raise ValueError(
+            f"""The 'time_budget' argument should be None or a positive number but you passed: {time_budget}\n"""
+            f"""Please use None to score all pairs or the number of seconds after which scoring stops"""
+        )
+
+
+def validate_cancel(cancel) -> None:
+    if cancel is not None and not callable(getattr(cancel, "is_set", None)):
+        raise ValueError(
+            f"""The 'cancel' argument should be None or a threading.Event but you passed: {cancel}\n"""
+            f"""Please pass an Event and set it from another thread to stop scoring"""
+        )
+
+
+def validate_model_factory(task_type, model_factory) -> None:
+    if task_type not in [TaskType.REGRESSION, TaskType.CLASSIFICATION]:
+        raise ValueError(
+            f"""The 'task_type' argument should be TaskType.REGRESSION or TaskType.CLASSIFICATION but you passed: {task_type}\n"""
+            f"""Please use register_task to change the tasks of the other cases"""
+        )
+    if not callable(model_factory) or not _is_picklable(model_factory):
+        raise ValueError(
+            f"""The 'model_factory' argument should be a picklable callable but you passed: {model_factory}\n"""
+            f"""Please use a class or a functools.partial of a module-level function instead of a lambda or a local function"""
+        )
+
+
+def _is_picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        # E.g. lambdas, local functions and objects that hold locks
+        return False
+    return True
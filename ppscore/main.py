@@ -14,6 +14,9 @@ def score(
     random_seed: int = 123,
     invalid_score: int = 0,
     catch_errors: bool = True,
+    method: str = "exact",
+    tolerance: Optional[float] = None,
+    early_stopping: bool = False,
 ):
     """Compatibility function for existing code"""
     if task is not None:
@@ -24,20 +27,30 @@ def score(
 
     calculator = PPSCalculator()
     result = calculator.score(
-        df, x, y, sample, cross_validation, random_seed, invalid_score, catch_errors
+        df,
+        x,
+        y,
+        sample,
+        cross_validation,
+        random_seed,
+        invalid_score,
+        catch_errors,
+        method=method,
+        tolerance=tolerance,
+        early_stopping=early_stopping,
     )
 
     # Convert Pydantic model to dict for backwards compatibility
     return result.dict()
 
 
-def predictors(df, y, output="df", sorted=True, **kwargs):
+def predictors(df, y, output="df", sorted=True, n_jobs=1, **kwargs):
     """Compatibility function for existing code"""
     calculator = PPSCalculator()
-    return calculator.predictors(df, y, output, sorted, **kwargs)
+    return calculator.predictors(df, y, output, sorted, n_jobs=n_jobs, **kwargs)
 
 
-def matrix(df, output="df", sorted=False, **kwargs):
+def matrix(df, output="df", sorted=False, n_jobs=1, **kwargs):
     """Compatibility function for existing code"""
     calculator = PPSCalculator()
-    return calculator.matrix(df, output, sorted, **kwargs)
+    return calculator.matrix(df, output, sorted, n_jobs=n_jobs, **kwargs)
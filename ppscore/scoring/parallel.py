@@ -0,0 +1,207 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, Optional
+
+import pandas as pd
+
+from ppscore.core.column_cache import ColumnCache
+from ppscore.core.models import PPSResult
+from ppscore.core.score_cache import ScoreCache
+from ppscore.core.tracing import PairTrace, Tracer
+from ppscore.scoring.shared_frame import (
+    SharedFrame,
+    SharedFrameDescriptor,
+    SharedFrameView,
+)
+
+# Number of chunks handed to each worker. More than one chunk per worker keeps
+# the pool busy when some pairs are much more expensive than others.
+CHUNKS_PER_WORKER = 4
+# Streaming runs report results more often at the cost of more chunks
+STREAMING_CHUNKS_PER_WORKER = 32
+
+_worker_state: dict[str, Any] = {}
+
+
+def effective_n_jobs(n_jobs: Optional[int]) -> int:
+    """Resolves n_jobs to a number of worker processes (-1 means all CPUs)"""
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(cpu_count + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def chunk_pairs(
+    pairs: list[tuple[str, str]],
+    n_workers: int,
+    chunks_per_worker: int = CHUNKS_PER_WORKER,
+) -> list[list[tuple[str, str]]]:
+    """Splits the pairs into contiguous chunks that keep their original order"""
+    n_chunks = max(min(len(pairs), n_workers * chunks_per_worker), 1)
+    chunk_size = -(-len(pairs) // n_chunks)
+    return [pairs[i : i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+
+def group_targets_by_feature(
+    pairs: list[tuple[str, str]],
+) -> list[tuple[str, list[str]]]:
+    """Groups consecutive pairs with the same feature, keeping their order"""
+    groups: list[tuple[str, list[str]]] = []
+    for x, y in pairs:
+        if groups and groups[-1][0] == x:
+            groups[-1][1].append(y)
+        else:
+            groups.append((x, [y]))
+    return groups
+
+
+def _init_worker(
+    descriptor: SharedFrameDescriptor,
+    task_registry: dict,
+    score_cache: Optional[ScoreCache],
+    score_kwargs: dict,
+    tracing: bool = False,
+    deadline: Optional[float] = None,
+) -> None:
+    from ppscore.scoring.predictor import PPSCalculator
+
+    frame = SharedFrameView(descriptor)
+    _worker_state["frame"] = frame
+    # Every worker keeps its own cache of the columns it has seen
+    _worker_state["column_cache"] = ColumnCache(frame)
+    # Every worker opens its own connection to the score cache. Its hits and
+    # misses of every chunk are sent back to the score cache of the caller, so
+    # it starts to count from zero.
+    if score_cache is not None:
+        score_cache.hits = score_cache.misses = 0
+    # The traces of every chunk are sent back to the tracer of the caller
+    _worker_state["calculator"] = PPSCalculator(
+        task_registry, score_cache, tracer=Tracer() if tracing else None
+    )
+    _worker_state["score_kwargs"] = score_kwargs
+    _worker_state["deadline"] = deadline
+
+
+def _deadline_passed() -> bool:
+    return time.time() >= _worker_state["deadline"]
+
+
+def _score_chunk(
+    pairs: list[tuple[str, str]],
+) -> tuple[list[Optional[PPSResult]], list[PairTrace], tuple[int, int]]:
+    """
+    The results of the pairs, their traces and the hits and misses of the score
+    cache. After the deadline, the pairs that are left are not scored and have
+    None as result.
+    """
+    frame = _worker_state["frame"]
+    calculator = _worker_state["calculator"]
+    column_cache = _worker_state["column_cache"]
+    score_kwargs = _worker_state["score_kwargs"]
+    should_stop = _deadline_passed if _worker_state["deadline"] is not None else None
+
+    results: list[Optional[PPSResult]] = []
+    for x, targets in group_targets_by_feature(pairs):
+        if should_stop is not None and should_stop():
+            results.extend([None] * len(targets))
+            continue
+        # Only the columns of the pairs are materialized in the worker
+        df = frame.frame(list(dict.fromkeys([x, *targets])))
+        results.extend(
+            calculator.score_targets(
+                df,
+                x,
+                targets,
+                column_cache=column_cache,
+                should_stop=should_stop,
+                **score_kwargs,
+            )
+        )
+
+    traces: list[PairTrace] = []
+    if calculator.tracer is not None:
+        traces, calculator.tracer.traces = calculator.tracer.traces, []
+    cache_counts = (0, 0)
+    if calculator.score_cache is not None:
+        score_cache = calculator.score_cache
+        cache_counts = (score_cache.hits, score_cache.misses)
+        score_cache.hits = score_cache.misses = 0
+    return results, traces, cache_counts
+
+
+def score_pairs_in_parallel(
+    df: pd.DataFrame,
+    pairs: list[tuple[str, str]],
+    n_jobs: int,
+    task_registry: Optional[dict] = None,
+    score_cache: Optional[ScoreCache] = None,
+    **kwargs,
+) -> list[Optional[PPSResult]]:
+    """
+    Scores the given (x, y) pairs on a process pool and returns the results in
+    the order of the pairs. The columns are placed in shared memory once and
+    every pair is scored exactly like the serial path, so the results are
+    identical for a fixed random_seed. Only runs with a deadline have None
+    results.
+    """
+    chunk_results = iter_scores_in_parallel(
+        df,
+        pairs,
+        n_jobs,
+        task_registry=task_registry,
+        score_cache=score_cache,
+        **kwargs,
+    )
+    return [result for chunk in chunk_results for result in chunk]
+
+
+def iter_scores_in_parallel(
+    df: pd.DataFrame,
+    pairs: list[tuple[str, str]],
+    n_jobs: int,
+    task_registry: Optional[dict] = None,
+    score_cache: Optional[ScoreCache] = None,
+    chunks_per_worker: int = CHUNKS_PER_WORKER,
+    tracer: Optional[Tracer] = None,
+    deadline: Optional[float] = None,
+    **kwargs,
+) -> Iterator[list[Optional[PPSResult]]]:
+    """
+    Like score_pairs_in_parallel, but yields the results of every chunk of pairs
+    as soon as it and all chunks before it are scored. Closing the generator
+    cancels the chunks that have not started yet. The PairTraces of the workers
+    are recorded by the tracer, if given, and their hits and misses are added to
+    those of the score_cache before the results of their chunk are yielded. After the deadline, a time of time.time(), the workers stop scoring
+    and the pairs that are left have None as result.
+    """
+    n_workers = min(effective_n_jobs(n_jobs), max(len(pairs), 1))
+    chunks = chunk_pairs(pairs, n_workers, chunks_per_worker)
+
+    with (
+        SharedFrame(df) as shared_frame,
+        ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,  # type: ignore[arg-type]
+            initargs=(  # type: ignore
+                shared_frame.descriptor,
+                task_registry,
+                score_cache,
+                kwargs,
+                tracer is not None,
+                deadline,
+            ),
+        ) as executor,
+    ):
+        try:
+            for results, traces, cache_counts in executor.map(_score_chunk, chunks):
+                for trace in traces:
+                    tracer.record(trace)  # type: ignore[union-attr]
+                if score_cache is not None:
+                    score_cache.hits += cache_counts[0]
+                    score_cache.misses += cache_counts[1]
+                yield results
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,21 +1,121 @@
+import math
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+import numpy as np
 import pandas as pd
 
-from ppscore.core.data_types import determine_case_and_prepare_df
-from ppscore.core.modelling import calculate_model_cv_score
-from ppscore.core.models import PPSResult, TaskType
-from ppscore.core.task_registry import get_invalid_task, get_task_registry
+from ppscore.core.column_cache import ColumnCache, ColumnKind
+from ppscore.core.data_types import (
+    determine_case_from_columns,
+    determine_case_from_profiles,
+    sample_rows,
+    select_rows,
+)
+from ppscore.core.modelling import (
+    calculate_groupby_cv_scores,
+    calculate_leave_one_out_regression_score,
+    calculate_model_cv_score_from_profiles,
+    calculate_sequential_cv_score,
+    is_default_tree,
+    iter_model_fold_scores_from_profiles,
+    leave_one_out_neighbors,
+    native_engine_feature,
+    native_engine_supports,
+)
+from ppscore.core.models import (
+    AdaptivePPSResult,
+    PPSResult,
+    ScoreCoverage,
+    ScoreProgress,
+    TaskType,
+)
+from ppscore.core.sampling import SamplingPlan, adaptive_sample_sizes
+from ppscore.core.score_cache import (
+    column_digest,
+    score_cache_key,
+    task_registry_fingerprint,
+)
+from ppscore.core.score_table import CASE_CODES, ScoreTable
+from ppscore.core.task_registry import default_task_registry, get_invalid_task
+from ppscore.core.tracing import PairTrace
 from ppscore.core.validators import (
+    validate_cancel,
     validate_column_in_df,
     validate_dataframe,
+    validate_method,
+    validate_min_ppscore,
+    validate_n_jobs,
     validate_output_format,
+    validate_pairs_tolerance,
     validate_sorted_param,
+    validate_time_budget,
+    validate_tolerance,
+    validate_top_k,
     validate_unique_column,
 )
+from ppscore.scoring.parallel import (
+    CHUNKS_PER_WORKER,
+    STREAMING_CHUNKS_PER_WORKER,
+    effective_n_jobs,
+    group_targets_by_feature,
+    iter_scores_in_parallel,
+)
+
+# The keyword arguments that the scores of a matrix depend on, with their defaults
+MATRIX_SETTINGS = {
+    "sample": 5_000,
+    "cross_validation": 4,
+    "random_seed": 123,
+    "invalid_score": 0,
+    "catch_errors": True,
+    "method": "exact",
+    "min_ppscore": None,
+    "early_stopping": False,
+}
+
+# min_ppscore only skips regression pairs whose leave-one-out PPS is lower by
+# this margin, because the cross-validated PPS can be slightly higher, and only
+# pairs with enough rows for the leave-one-out PPS to be reliable
+SCREENING_MARGIN = 0.05
+MIN_SCREENING_ROWS = 100
+
+# The errors of profiling columns whose values cannot be encoded, e.g. unhashable
+# values, which score reports as errors of their pairs
+PROFILE_ERRORS = (TypeError, ValueError)
+
+# Successive halving of predictors never scores fewer rows than this
+MIN_RACING_SAMPLE = 250
+# and keeps at least this many times top_k features per round
+MIN_SURVIVORS_PER_TOP_K = 2
+
+# The calculator and PairTrace of the pair that is being scored in the current
+# thread, so that a calculator with a tracer can score pairs in several threads
+_current_trace: ContextVar[tuple] = ContextVar("current_trace", default=(None, None))
 
 
 class PPSCalculator:
-    def __init__(self):
-        self.task_registry = get_task_registry()
+    def __init__(self, task_registry=None, score_cache=None, tracer=None):
+        """
+        The task registry decides the model and metric of every case, e.g. a
+        registry with Tree1DRegressor(max_depth=4) as regression model limits
+        the depth of the trees. Defaults to the shared default_task_registry(),
+        with the tasks and models of register_task and register_model.
+
+        With a ScoreCache, the scores of pairs whose columns and settings were
+        scored before are read from the cache instead of being calculated.
+
+        With a Tracer, the wall time of every stage of scoring a pair, the rows
+        and categories it used and whether it was found in the score cache are
+        recorded in a PairTrace of the pair.
+        """
+        self.task_registry = (
+            task_registry if task_registry is not None else default_task_registry()
+        )
+        self.score_cache = score_cache
+        self.tracer = tracer
+        self._registry_fingerprint = None
 
     def score(
         self,
@@ -27,72 +127,575 @@ class PPSCalculator:
         random_seed=123,
         invalid_score=0,
         catch_errors=True,
+        method="exact",
+        column_cache=None,
+        sampling_plan=None,
+        tolerance=None,
+        early_stopping=False,
     ):
         """
         Calculate the Predictive Power Score (PPS) for "x predicts y"
+
+        method="hist" scores numeric features on at most 256 quantile bins, which
+        is much faster for large samples but only approximates the exact PPS.
+        A ColumnCache of df can be passed to reuse the per-column preprocessing
+        across several calls on the same df. The pair itself is scored on NumPy
+        arrays sliced from the column profiles, without copying the frame.
+        A SamplingPlan for the same sample and random_seed shares the row
+        permutation and the cross-validation folds with other calls.
+
+        With a tolerance, the pair is scored on growing nested samples of its
+        rows, up to sample rows, until the PPS converges (see
+        _score_adaptively). The AdaptivePPSResult has the size of the sample
+        that was used. Adaptive results are not cached.
+
+        With early_stopping, the folds of the cross-validation are evaluated one
+        after the other and the rest are skipped once the PPS is known to be 0
+        or known precisely enough (see calculate_sequential_cv_score). Then the
+        model score is the mean of the evaluated folds. Adaptive sampling
+        ignores early_stopping, because it stops on the spread of the folds.
         """
-        validate_dataframe(df)
-        validate_column_in_df(x, df)
-        validate_unique_column(x, df)
-        validate_column_in_df(y, df)
-        validate_unique_column(y, df)
+        trace = self._start_trace(x, y)
+        with self._stage("validation"):
+            validate_dataframe(df)
+            validate_column_in_df(x, df)
+            validate_unique_column(x, df)
+            validate_column_in_df(y, df)
+            validate_unique_column(y, df)
+            validate_method(method)
+            validate_tolerance(tolerance)
 
         if random_seed is None:
             from random import random
 
             random_seed = int(random() * 1000)
 
+        if tolerance is not None:
+            # The nested samples are not broken down into stages
+            with self._stage("cross_validation"):
+                result = self._score_adaptively(
+                    df,
+                    x,
+                    y,
+                    tolerance,
+                    sample=sample,
+                    cross_validation=cross_validation,
+                    random_seed=random_seed,
+                    invalid_score=invalid_score,
+                    catch_errors=catch_errors,
+                    method=method,
+                    column_cache=column_cache,
+                )
+            if trace is not None:
+                trace.rows = result.sample_size
+            return self._finish_trace(result)
+
+        with self._stage("cache"):
+            cache_key = self._score_cache_key(
+                df,
+                x,
+                y,
+                column_cache,
+                sample=sample,
+                cross_validation=cross_validation,
+                random_seed=random_seed,
+                invalid_score=invalid_score,
+                method=method,
+                sampling_plan=sampling_plan,
+                early_stopping=early_stopping,
+            )
+            if cache_key is not None:
+                result = self._cached_result(x, y, cache_key, invalid_score)
+        if cache_key is not None:
+            if trace is not None:
+                trace.cache_hit = result is not None
+            if result is not None:
+                return self._finish_trace(result)
+
+        result = self._score_validated_pair(
+            df,
+            x,
+            y,
+            sample=sample,
+            cross_validation=cross_validation,
+            random_seed=random_seed,
+            invalid_score=invalid_score,
+            catch_errors=catch_errors,
+            method=method,
+            column_cache=column_cache,
+            sampling_plan=sampling_plan,
+            early_stopping=early_stopping,
+        )
+        self._store_in_cache(cache_key, result)
+        return self._finish_trace(result)
+
+    @property
+    def _trace(self):
+        """The PairTrace of the pair that is being scored if there is a tracer"""
+        owner, trace = _current_trace.get()
+        return trace if owner is self else None
+
+    @_trace.setter
+    def _trace(self, trace):
+        _current_trace.set((self, trace) if trace is not None else (None, None))
+
+    def _start_trace(self, x, y):
+        """Makes a new PairTrace the current one if the calculator has a tracer"""
+        if self.tracer is None:
+            return None
+        self._trace = PairTrace(x=str(x), y=str(y))
+        return self._trace
+
+    def _finish_trace(self, result, trace=None):
+        """Records the current or the given trace with the case of the result"""
+        if trace is None:
+            trace, self._trace = self._trace, None
+        if trace is not None:
+            trace.case = TaskType(result.case).value
+            self.tracer.record(trace)
+        return result
+
+    def _stage(self, name):
+        """Times a stage of the current pair if there is a trace"""
+        if self._trace is None:
+            return nullcontext()
+        return self.tracer.stage(self._trace, name)
+
+    def _trace_counts(self, trace, x_profile, y_profile, rows, case_type):
+        """Sets the rows and the encoded categories of the pair on the trace"""
+        trace.rows = len(rows)
+        trace.categories = 0
+        if x_profile.kind == ColumnKind.CATEGORICAL:
+            trace.categories += x_profile.count_categories(rows)
+        if case_type == TaskType.CLASSIFICATION:
+            trace.categories += y_profile.count_categories(rows)
+
+    def _score_validated_pair(
+        self,
+        df,
+        x,
+        y,
+        sample=5_000,
+        cross_validation=4,
+        random_seed=123,
+        invalid_score=0,
+        catch_errors=True,
+        method="exact",
+        column_cache=None,
+        sampling_plan=None,
+        early_stopping=False,
+    ):
+        """Calculates the PPSResult of x and y, which are validated columns of df"""
+        if column_cache is None:
+            column_cache = self._pair_column_cache(
+                df, x, y, sample, random_seed, method
+            )
+
         try:
             return self._calculate_score(
-                df, x, y, sample, cross_validation, random_seed, invalid_score
+                x,
+                y,
+                sample,
+                cross_validation,
+                random_seed,
+                invalid_score,
+                method,
+                column_cache,
+                sampling_plan,
+                early_stopping,
+            )
+        except Exception:
+            if catch_errors:
+                return self._result_of_case(x, y, TaskType.UNKNOWN_ERROR, invalid_score)
+            else:
+                raise
+
+    def _pair_column_cache(self, df, x, y, sample, random_seed, method):
+        """A ColumnCache of df that profiles the rows that score x and y needs"""
+        if method == "exact" and x != y:
+            # Only the sampled rows of x and y are profiled
+            rows = select_rows(df[x], df[y], sample, random_seed=random_seed)
+            return ColumnCache(df, rows=rows)
+        # The bins of the hist method are computed on all rows
+        return ColumnCache(df)
+
+    def _score_adaptively(
+        self,
+        df,
+        x,
+        y,
+        tolerance,
+        sample=5_000,
+        cross_validation=4,
+        random_seed=123,
+        invalid_score=0,
+        catch_errors=True,
+        method="exact",
+        column_cache=None,
+    ):
+        """
+        Scores x and y on nested samples of the rows of the pair, which grow from
+        ADAPTIVE_START_SAMPLE rows to the sample of score. Stops when the PPS
+        changed by at most tolerance since the previous sample and the standard
+        error of the PPS of the folds is at most tolerance. The last sample gives
+        the same PPS as score without a tolerance.
+        """
+        if column_cache is None:
+            column_cache = self._pair_column_cache(
+                df, x, y, sample, random_seed, method
+            )
+
+        try:
+            return self._calculate_adaptive_score(
+                x,
+                y,
+                tolerance,
+                sample,
+                cross_validation,
+                random_seed,
+                invalid_score,
+                method,
+                column_cache,
             )
-        except Exception as exception:
+        except Exception:
             if catch_errors:
-                case_type = TaskType.UNKNOWN_ERROR
-                task = get_invalid_task(case_type, invalid_score)
-                return PPSResult(
-                    x=x,
-                    y=y,
-                    ppscore=task.ppscore,
-                    case=case_type,
-                    is_valid_score=task.is_valid_score,
-                    metric=task.metric_name,
-                    baseline_score=task.baseline_score,
-                    model_score=task.model_score,
-                    model=task.model,
+                result = self._result_of_case(
+                    x, y, TaskType.UNKNOWN_ERROR, invalid_score
+                )
+                return AdaptivePPSResult(**dict(result), sample_size=0, converged=False)
+            else:
+                raise
+
+    def _calculate_adaptive_score(
+        self,
+        x,
+        y,
+        tolerance,
+        sample,
+        cross_validation,
+        random_seed,
+        invalid_score,
+        method,
+        column_cache,
+    ):
+        if x == y:
+            case_type = TaskType.PREDICT_ITSELF
+        else:
+            x_profile = column_cache.profile(x)
+            y_profile = column_cache.profile(y)
+            # The case is decided on the full sample, the smaller samples only
+            # estimate the model score
+            rows, case_type = determine_case_from_profiles(
+                x_profile, y_profile, sample=sample, random_seed=random_seed
+            )
+
+        task = get_invalid_task(case_type, invalid_score, self.task_registry)
+
+        if case_type not in [TaskType.CLASSIFICATION, TaskType.REGRESSION]:
+            result = self._result_of_case(x, y, case_type, invalid_score, task)
+            # No rows are needed
+            return AdaptivePPSResult(**dict(result), sample_size=0, converged=True)
+
+        previous_ppscore = None
+        sample_sizes = adaptive_sample_sizes(len(rows))
+        for sample_size in sample_sizes:
+            is_last_sample = sample_size == sample_sizes[-1]
+            # Samples of the same rows with the same seed are nested
+            sample_rows_of_pair = sample_rows(rows, sample_size, random_seed)
+            baseline_key = self._baseline_key(
+                x_profile, y_profile, case_type, (sample, sample_size), random_seed
+            )
+            try:
+                fold_scores = list(
+                    iter_model_fold_scores_from_profiles(
+                        sample_rows_of_pair,
+                        target=y_profile,
+                        feature=x_profile,
+                        task=task,
+                        cross_validation=cross_validation,
+                        random_seed=random_seed,
+                        feature_bins=column_cache.bins(x) if method == "hist" else None,
+                    )
+                )
+                result = self._result_of_model_score(
+                    x,
+                    y_profile,
+                    sample_rows_of_pair,
+                    case_type,
+                    task,
+                    float(np.mean(fold_scores)),
+                    random_seed,
+                    baseline_key,
+                    column_cache,
+                )
+            except Exception:
+                # A sample that is too small to be scored, e.g. with a constant
+                # target, is grown. Errors of the last sample are errors of score.
+                if is_last_sample:
+                    raise
+                continue
+
+            fold_ppscores = [
+                task.score_normalizer(
+                    None,
+                    fold_score,
+                    random_seed=random_seed,
+                    baseline_score=result.baseline_score,
+                )[0]
+                for fold_score in fold_scores
+            ]
+            standard_error = np.std(fold_ppscores, ddof=1) / math.sqrt(
+                len(fold_ppscores)
+            )
+            converged = (
+                previous_ppscore is not None
+                and abs(result.ppscore - previous_ppscore) <= tolerance
+                and standard_error <= tolerance
+            )
+            if converged or is_last_sample:
+                return AdaptivePPSResult(
+                    **dict(result), sample_size=sample_size, converged=converged
                 )
+            previous_ppscore = result.ppscore
+
+    def _score_cache_key(
+        self,
+        df,
+        x,
+        y,
+        column_cache,
+        sample=5_000,
+        cross_validation=4,
+        random_seed=123,
+        invalid_score=0,
+        method="exact",
+        sampling_plan=None,
+        early_stopping=False,
+        **_,
+    ):
+        """
+        The key of the pair in the score cache or None if there is no cache or
+        the pair cannot be cached, e.g. because its values are not hashable
+        """
+        if self.score_cache is None or x == y:
+            return None
+        # Explicit folds are not part of the key
+        if isinstance(cross_validation, bool) or not isinstance(cross_validation, int):
+            return None
+        try:
+            if column_cache is not None:
+                digests = column_cache.digest(x), column_cache.digest(y)
             else:
-                raise exception
+                digests = column_digest(df[x]), column_digest(df[y])
+        except TypeError:
+            return None
+
+        if self._registry_fingerprint is None:
+            self._registry_fingerprint = task_registry_fingerprint(self.task_registry)
+        return score_cache_key(
+            *digests,
+            self._registry_fingerprint,
+            sample=sample,
+            cross_validation=cross_validation,
+            random_seed=random_seed,
+            invalid_score=invalid_score,
+            method=method,
+            # A shared plan samples pairs with missing values differently
+            shared_sampling=sampling_plan is not None,
+            early_stopping=early_stopping,
+        )
+
+    def _cached_result(self, x, y, cache_key, invalid_score):
+        """The PPSResult of the pair from the score cache or None"""
+        fields = self.score_cache.get(cache_key)
+        if fields is None:
+            return None
+        case_type = TaskType(fields.pop("case"))
+        task = get_invalid_task(case_type, invalid_score, self.task_registry)
+        return PPSResult(x=x, y=y, case=case_type, model=task.model, **fields)
+
+    def _store_in_cache(self, cache_key, result):
+        """Stores the result in the score cache, unless it is an error"""
+        if cache_key is not None and result.case != TaskType.UNKNOWN_ERROR:
+            with self._stage("cache"):
+                self.score_cache.put(cache_key, result)
+
+    def _result_of_case(self, x, y, case_type, invalid_score, task=None):
+        """The PPSResult of a case that needs no model"""
+        if task is None:
+            task = get_invalid_task(case_type, invalid_score, self.task_registry)
+        return PPSResult(
+            x=x,
+            y=y,
+            ppscore=task.ppscore,
+            case=case_type,
+            is_valid_score=task.is_valid_score,
+            metric=task.metric_name,
+            baseline_score=task.baseline_score,
+            model_score=task.model_score,
+            model=task.model,
+        )
 
     def _calculate_score(
-        self, df, x, y, sample, cross_validation, random_seed, invalid_score
+        self,
+        x,
+        y,
+        sample,
+        cross_validation,
+        random_seed,
+        invalid_score,
+        method,
+        column_cache,
+        sampling_plan=None,
+        early_stopping=False,
     ):
-        df, case_type = determine_case_and_prepare_df(
-            df, x, y, sample=sample, random_seed=random_seed
+        if x == y:
+            # Needs no values, so that even unhashable columns predict themselves
+            rows, case_type = None, TaskType.PREDICT_ITSELF
+        else:
+            with self._stage("encoding"):
+                x_profile = column_cache.profile(x)
+                y_profile = column_cache.profile(y)
+            with self._stage("case"):
+                rows, case_type = determine_case_from_profiles(
+                    x_profile,
+                    y_profile,
+                    sample=sample,
+                    random_seed=random_seed,
+                    sampling_plan=sampling_plan,
+                )
+
+        task = get_invalid_task(case_type, invalid_score, self.task_registry)
+
+        if case_type not in [TaskType.CLASSIFICATION, TaskType.REGRESSION]:
+            return self._result_of_case(x, y, case_type, invalid_score, task)
+        if self._trace is not None:
+            self._trace_counts(self._trace, x_profile, y_profile, rows, case_type)
+
+        baseline_key = self._baseline_key(
+            x_profile, y_profile, case_type, sample, random_seed
+        )
+        cv_kwargs = {
+            "cross_validation": cross_validation,
+            "random_seed": random_seed,
+            "feature_bins": column_cache.bins(x) if method == "hist" else None,
+            "sampling_plan": sampling_plan,
+            "folds_key": (
+                None if baseline_key is None else (baseline_key, cross_validation)
+            ),
+        }
+        if early_stopping:
+            model_score = self._sequential_model_score(
+                rows,
+                x_profile,
+                y_profile,
+                case_type,
+                task,
+                baseline_key,
+                column_cache,
+                **cv_kwargs,
+            )
+        else:
+            with self._stage("cross_validation"):
+                model_score = calculate_model_cv_score_from_profiles(
+                    rows, target=y_profile, feature=x_profile, task=task, **cv_kwargs
+                )
+        return self._result_of_model_score(
+            x,
+            y_profile,
+            rows,
+            case_type,
+            task,
+            model_score,
+            random_seed,
+            baseline_key,
+            column_cache,
         )
 
-        task = get_invalid_task(case_type, invalid_score)
+    def _sequential_model_score(
+        self,
+        rows,
+        x_profile,
+        y_profile,
+        case_type,
+        task,
+        baseline_key,
+        column_cache,
+        random_seed=123,
+        **cv_kwargs,
+    ):
+        """
+        The model score of sequential cross-validation, which needs the baseline
+        score of the target before the first fold
+        """
+        baseline_score = column_cache.baselines.get(baseline_key)
+        if baseline_score is None:
+            with self._stage("normalizer"):
+                _, baseline_score = task.score_normalizer(
+                    self._target_of_rows(y_profile, rows, case_type),
+                    0.0,
+                    random_seed=random_seed,
+                )
+            if baseline_key is not None:
+                column_cache.baselines[baseline_key] = baseline_score
 
-        if case_type in [TaskType.CLASSIFICATION, TaskType.REGRESSION]:
-            model_score = calculate_model_cv_score(
-                df,
-                target=y,
-                feature=x,
+        with self._stage("cross_validation"):
+            fold_scores = iter_model_fold_scores_from_profiles(
+                rows,
+                target=y_profile,
+                feature=x_profile,
                 task=task,
-                cross_validation=cross_validation,
                 random_seed=random_seed,
+                sequential=True,
+                **cv_kwargs,
+            )
+            model_score, _ = calculate_sequential_cv_score(
+                fold_scores, task, baseline_score
             )
+        return model_score
+
+    def _target_of_rows(self, y_profile, rows, case_type):
+        """The target values of the rows, as labels for classification"""
+        if case_type == TaskType.CLASSIFICATION:
+            return y_profile.labels(rows)
+        return y_profile.values[rows]
+
+    def _baseline_key(self, x_profile, y_profile, case_type, sample, random_seed):
+        """
+        The key of the baseline of y, if the feature has no missing values in the
+        rows of the target. Then the sampled rows and thus the baseline and the
+        folds are the same for every feature.
+        """
+        if x_profile.null_mask[~y_profile.null_mask].any():
+            return None
+        return (y_profile.name, case_type, sample, random_seed)
+
+    def _result_of_model_score(
+        self,
+        x,
+        y_profile,
+        rows,
+        case_type,
+        task,
+        model_score,
+        random_seed,
+        baseline_key,
+        column_cache,
+    ):
+        """Normalizes the model score of a pair against the baseline of its target"""
+        with self._stage("normalizer"):
             ppscore, baseline_score = task.score_normalizer(
-                df, y, model_score, random_seed=random_seed
+                self._target_of_rows(y_profile, rows, case_type),
+                model_score,
+                random_seed=random_seed,
+                baseline_score=column_cache.baselines.get(baseline_key),
             )
-        else:
-            model_score = task.model_score
-            baseline_score = task.baseline_score
-            ppscore = task.ppscore
+        if baseline_key is not None:
+            column_cache.baselines[baseline_key] = baseline_score
 
         return PPSResult(
             x=x,
-            y=y,
+            y=y_profile.name,
             ppscore=ppscore,
             case=case_type,
             is_valid_score=task.is_valid_score,
@@ -102,8 +705,310 @@ class PPSCalculator:
             model=task.model,
         )
 
+    def score_targets(
+        self, df, x, targets, column_cache=None, should_stop=None, **kwargs
+    ):
+        """
+        Calculate the PPS of x for every target in targets. The targets that
+        leave the same rows as x and whose task model the group-by engine can
+        replace are scored in one pass, sharing the sort of x and, for
+        regression, the folds and aggregations. All other targets, and all
+        targets of early_stopping, are scored by score.
+
+        If should_stop is given, it is called before the pass and before every
+        single target, and the targets that are left once it returns True are
+        not scored and have None as result.
+        """
+        # Adaptive sampling stops per pair and is not cached
+        validate_pairs_tolerance(kwargs.pop("tolerance", None))
+        if column_cache is None:
+            column_cache = ColumnCache(df)
+        if kwargs.get("random_seed", 123) is None:
+            from random import random
+
+            # One seed for all targets
+            kwargs["random_seed"] = int(random() * 1000)
+
+        results = {}
+        # The keys of the targets that were looked up in the score cache
+        cache_keys = {}
+        # The PairTraces of the targets that are not scored by score
+        traces = {} if self.tracer is not None else None
+        if self.score_cache is not None and self._columns_are_valid(df, [x]):
+            validate_method(kwargs.get("method", "exact"))
+            for y in dict.fromkeys(targets):
+                if not self._columns_are_valid(df, [y]):
+                    continue
+                trace = self._start_trace(x, y)
+                with self._stage("cache"):
+                    cache_key = self._score_cache_key(df, x, y, column_cache, **kwargs)
+                    if cache_key is not None:
+                        result = self._cached_result(
+                            x, y, cache_key, kwargs.get("invalid_score", 0)
+                        )
+                self._trace = None
+                if cache_key is None:
+                    continue
+                cache_keys[y] = cache_key
+                if trace is not None:
+                    trace.cache_hit = result is not None
+                    traces[y] = trace
+                if result is not None:
+                    results[y] = self._finish_trace(result, trace)
+
+        pending_targets = [y for y in targets if y not in results]
+        if should_stop is not None and should_stop():
+            return [results.get(y) for y in targets]
+        # Invalid columns, e.g. duplicate names, are left to score, which
+        # raises their errors
+        batch_targets = []
+        if self._columns_are_valid(df, [x]):
+            batch_targets = [
+                y for y in pending_targets if self._columns_are_valid(df, [y])
+            ]
+        if (
+            len(batch_targets) > 1
+            and kwargs.get("method", "exact") == "exact"
+            # The pass scores all folds of every target
+            and not kwargs.get("early_stopping", False)
+        ):
+            # The shared stages of the pass are timed on one trace
+            batch_trace = self._start_trace(x, "")
+            try:
+                batched = self._score_targets_in_one_pass(
+                    x, batch_targets, column_cache, traces=traces, **kwargs
+                )
+            except ValueError:
+                # E.g. classes with fewer rows than folds, score reports the
+                # errors of single pairs
+                batched = {}
+            self._trace = None
+            for y, result in batched.items():
+                trace = traces[y] if traces is not None else None
+                self._trace = trace
+                self._store_in_cache(cache_keys.get(y), result)
+                if trace is not None:
+                    trace.batched = True
+                    for name, seconds in batch_trace.stage_seconds.items():
+                        trace.stage_seconds[name] = trace.stage_seconds.get(
+                            name, 0.0
+                        ) + seconds / len(batched)
+                self._finish_trace(result)
+            results.update(batched)
+
+        for y in pending_targets:
+            if y in results:
+                continue
+            if should_stop is not None and should_stop():
+                break
+            if y in cache_keys:
+                # Scored without a second lookup in the cache
+                self._trace = traces[y] if traces is not None else None
+                results[y] = self._score_validated_pair(
+                    df, x, y, column_cache=column_cache, **kwargs
+                )
+                self._store_in_cache(cache_keys[y], results[y])
+                self._finish_trace(results[y])
+            else:
+                results[y] = self.score(df, x, y, column_cache=column_cache, **kwargs)
+        return [results.get(y) for y in targets]
+
+    def _columns_are_valid(self, df, columns):
+        """Whether score accepts the columns of df, which raises the errors"""
+        try:
+            validate_dataframe(df)
+            for column in columns:
+                validate_column_in_df(column, df)
+                validate_unique_column(column, df)
+        except (TypeError, ValueError, AssertionError):
+            return False
+        return True
+
+    def _score_targets_in_one_pass(
+        self,
+        x,
+        targets,
+        column_cache,
+        sample=5_000,
+        cross_validation=4,
+        random_seed=123,
+        invalid_score=0,
+        catch_errors=True,
+        method="exact",
+        sampling_plan=None,
+        # score_targets scores the targets of early_stopping one by one
+        early_stopping=False,
+        traces=None,
+    ):
+        """
+        Scores the targets that share the rows of x with the group-by engine. If
+        traces is given, it receives a PairTrace of every scored target with its
+        rows and categories, or the existing trace of the target is updated.
+        """
+        try:
+            with self._stage("encoding"):
+                x_profile = column_cache.profile(x)
+        except PROFILE_ERRORS:
+            # score reports the error of every pair of x
+            return {}
+        if x_profile.kind != ColumnKind.NUMERIC or not isinstance(
+            cross_validation, int
+        ):
+            return {}
+
+        rows = None
+        candidates = {TaskType.REGRESSION: [], TaskType.CLASSIFICATION: []}
+        for y in dict.fromkeys(targets):
+            if y == x:
+                continue
+            try:
+                with self._stage("encoding"):
+                    y_profile = column_cache.profile(y)
+            except PROFILE_ERRORS:
+                continue
+            # Only targets without missing values in the rows of x leave its rows
+            if y_profile.null_mask[~x_profile.null_mask].any():
+                continue
+            with self._stage("case"):
+                rows, case_type = determine_case_from_profiles(
+                    x_profile,
+                    y_profile,
+                    sample=sample,
+                    random_seed=random_seed,
+                    sampling_plan=sampling_plan,
+                )
+            if case_type in candidates:
+                candidates[case_type].append(y_profile)
+
+        if sum(len(profiles) for profiles in candidates.values()) < 2:
+            return {}
+
+        # Same shuffle as calculate_model_cv_score_from_profiles
+        if sampling_plan is not None:
+            shuffled_rows = rows[sampling_plan.permutation(len(rows))]
+        else:
+            random_state = np.random.RandomState(random_seed)
+            shuffled_rows = rows[random_state.permutation(len(rows))]
+        feature_input = x_profile.values[shuffled_rows].reshape(-1, 1)
+
+        results = {}
+        for case_type, profiles in candidates.items():
+            task = get_invalid_task(case_type, invalid_score, self.task_registry)
+            if not profiles or not is_default_tree(task.model):
+                continue
+
+            targets_input = {}
+            with self._stage("encoding"):
+                for y_profile in profiles:
+                    try:
+                        target = (
+                            y_profile.labels(shuffled_rows)
+                            if case_type == TaskType.CLASSIFICATION
+                            else y_profile.values[shuffled_rows]
+                        )
+                    except TypeError:
+                        continue
+                    if native_engine_supports(target, task):
+                        targets_input[y_profile.name] = (y_profile, target)
+            if not targets_input:
+                continue
+
+            feature = native_engine_feature(
+                feature_input, next(iter(targets_input.values()))[1], task
+            )
+            if feature is None:
+                continue
+
+            with self._stage("cross_validation"):
+                model_scores = self._groupby_model_scores(
+                    feature,
+                    targets_input,
+                    x_profile,
+                    case_type,
+                    task,
+                    sample,
+                    cross_validation,
+                    random_seed,
+                    sampling_plan,
+                )
+
+            for (y_profile, _), model_score in zip(
+                targets_input.values(), model_scores
+            ):
+                if traces is not None:
+                    trace = traces.setdefault(
+                        y_profile.name, PairTrace(x=str(x), y=str(y_profile.name))
+                    )
+                    self._trace_counts(trace, x_profile, y_profile, rows, case_type)
+                results[y_profile.name] = self._result_of_model_score(
+                    x,
+                    y_profile,
+                    rows,
+                    case_type,
+                    task,
+                    model_score,
+                    random_seed,
+                    self._baseline_key(
+                        x_profile, y_profile, case_type, sample, random_seed
+                    ),
+                    column_cache,
+                )
+        return results
+
+    def _groupby_model_scores(
+        self,
+        feature,
+        targets_input,
+        x_profile,
+        case_type,
+        task,
+        sample,
+        cross_validation,
+        random_seed,
+        sampling_plan,
+    ):
+        """The model scores of the targets of _score_targets_in_one_pass"""
+        if case_type == TaskType.REGRESSION:
+            return calculate_groupby_cv_scores(
+                feature,
+                np.vstack([target for _, target in targets_input.values()]),
+                task,
+                cross_validation,
+            )
+
+        # The stratified folds differ by target, the sort of x does not
+        order = np.argsort(feature, kind="stable")
+        model_scores = []
+        for y_profile, target in targets_input.values():
+            baseline_key = self._baseline_key(
+                x_profile, y_profile, case_type, sample, random_seed
+            )
+            folds = cross_validation
+            if sampling_plan is not None and baseline_key is not None:
+                folds = sampling_plan.folds(
+                    (baseline_key, cross_validation),
+                    task,
+                    target,
+                    cross_validation,
+                )
+            model_scores.append(
+                calculate_groupby_cv_scores(
+                    feature, target[np.newaxis], task, folds, order=order
+                )[0]
+            )
+        return model_scores
+
     def format_results(self, scores, output, sorted_result):
-        """Format list of score dicts"""
+        """Format a ScoreTable or a list of PPSResults"""
+        if isinstance(scores, ScoreTable):
+            if sorted_result:
+                scores = scores.sort_by_ppscore()
+            if output == "df":
+                return scores.to_frame()
+            if output == "list":
+                return scores.to_list()
+            return scores
+
         if sorted_result:
             scores.sort(key=lambda item: item.ppscore, reverse=True)
 
@@ -114,28 +1019,706 @@ class PPSCalculator:
 
         return scores
 
-    def predictors(self, df, y, output="df", sorted=True, **kwargs):
+    def score_pairs(
+        self,
+        df,
+        pairs,
+        n_jobs=1,
+        column_cache=None,
+        time_budget=None,
+        cancel=None,
+        **kwargs,
+    ):
+        """
+        Calculate the PPS for every (x, y) pair, optionally on a process pool.
+        All pairs share one SamplingPlan, so the rows are shuffled once per call.
+        The columns are validated and profiled once, and the pairs whose case
+        follows from the single columns, e.g. the diagonal of the matrix and
+        constant targets, are resolved without scoring them.
+        A ColumnCache of df can be passed to reuse the profiles of its columns
+        across calls. Returns a ScoreTable with the scores in the order of the
+        pairs.
+
+        With a time_budget in seconds or a threading.Event as cancel, the pairs
+        are scored cheapest first (see _cheapest_first) until the budget runs
+        out or the event is set, e.g. from another thread. The pairs that are
+        left get the case NOT_SCORED and NaN scores, and the table gets a
+        ScoreCoverage. Running pairs are finished, so a run can overrun its
+        budget by the time of the pairs of one feature.
+        """
+        validate_time_budget(time_budget)
+        validate_cancel(cancel)
+        start = time.perf_counter()
+        deadline = None if time_budget is None else time.time() + time_budget
+        table = self._score_pairs_until(
+            df, pairs, n_jobs, column_cache, deadline, cancel, kwargs
+        )
+        if table.coverage is not None:
+            table.coverage = self._coverage(
+                len(pairs), table.coverage.n_not_scored, start, cancel
+            )
+        return table
+
+    def _score_pairs_until(
+        self, df, pairs, n_jobs, column_cache, deadline, cancel, kwargs
+    ):
+        """
+        score_pairs with a deadline, a time of time.time(), instead of a time
+        budget, so that several calls can share one budget. The deadline may
+        have passed already, then only the pairs that the columns decide are
+        scored.
+        """
+        start = time.perf_counter()
+        column_cache, cases = self._prepare_pairs(df, pairs, kwargs, column_cache)
+        positions_by_case = {}
+        for position, case in enumerate(cases):
+            positions_by_case.setdefault(case, []).append(position)
+        pending_positions = positions_by_case.pop(None, [])
+
+        should_stop = None
+        if deadline is not None or cancel is not None:
+            pending_positions = self._cheapest_first(
+                pairs, pending_positions, column_cache
+            )
+
+            def should_stop():
+                return (cancel is not None and cancel.is_set()) or (
+                    deadline is not None and time.time() >= deadline
+                )
+
+        pending_scores = self._iter_pending_scores(
+            df,
+            [pairs[position] for position in pending_positions],
+            n_jobs,
+            column_cache,
+            kwargs,
+            should_stop=should_stop,
+            deadline=deadline,
+        )
+
+        table = ScoreTable.from_pairs(pairs)
+        not_scored = []
+        try:
+            scores = list(pending_scores)
+        finally:
+            pending_scores.close()
+        for i, position in enumerate(pending_positions):
+            score = scores[i] if i < len(scores) else None
+            if score is None:
+                not_scored.append(position)
+            else:
+                table.set_result(position, score)
+        if not_scored:
+            positions_by_case[TaskType.NOT_SCORED] = not_scored
+        invalid_score = kwargs.get("invalid_score", 0)
+        for case, positions in positions_by_case.items():
+            task = get_invalid_task(case, invalid_score, self.task_registry)
+            table.set_task(np.array(positions), task)
+
+        if should_stop is not None:
+            table.coverage = self._coverage(len(pairs), len(not_scored), start, cancel)
+        return table
+
+    def _coverage(self, n_pairs, n_not_scored, start, cancel):
+        """The ScoreCoverage of a run that started at start, a perf_counter time"""
+        stop_reason = None
+        if n_not_scored:
+            cancelled = cancel is not None and cancel.is_set()
+            stop_reason = "cancelled" if cancelled else "time_budget"
+        return ScoreCoverage(
+            n_pairs=n_pairs,
+            n_scored=n_pairs - n_not_scored,
+            n_not_scored=n_not_scored,
+            fraction_scored=(1 - n_not_scored / n_pairs) if n_pairs else 1.0,
+            elapsed_seconds=time.perf_counter() - start,
+            stop_reason=stop_reason,
+        )
+
+    def _cheapest_first(self, pairs, positions, column_cache):
+        """
+        Orders the positions of the pairs by the expected cost of their feature,
+        keeping the pairs of a feature together so that they are still scored in
+        one pass: numeric features first, then the others by their number of
+        categories, which the models encode as one column each
+        """
+
+        def feature_cost(position):
+            try:
+                profile = column_cache.profile(pairs[position][0])
+            except PROFILE_ERRORS:
+                # score reports the error of the pair
+                return 0
+            if profile.kind == ColumnKind.NUMERIC:
+                return 0
+            return 1 + profile.n_categories
+
+        # sorted is stable, so the pairs of a feature keep their order
+        return sorted(positions, key=feature_cost)
+
+    def iter_pairs(self, df, pairs, n_jobs=1, progress=None, **kwargs):
+        """
+        Like score_pairs, but yields the PPSResult of every pair, in the order of
+        the pairs, as soon as it is calculated. If given, progress is called with
+        a ScoreProgress after every pair.
+        """
+        column_cache, cases = self._prepare_pairs(df, pairs, kwargs)
+        pending_pairs = [pair for pair, case in zip(pairs, cases) if case is None]
+        pending_scores = self._iter_pending_scores(
+            df, pending_pairs, n_jobs, column_cache, kwargs, streaming=True
+        )
+
+        invalid_score = kwargs.get("invalid_score", 0)
+        n_scored = 0
+        start = time.perf_counter()
+        try:
+            for n_done, ((x, y), case) in enumerate(zip(pairs, cases), start=1):
+                if case is None:
+                    result = next(pending_scores)
+                    n_scored += 1
+                else:
+                    result = self._result_of_case(x, y, case, invalid_score)
+
+                if progress is not None:
+                    elapsed = time.perf_counter() - start
+                    progress(
+                        ScoreProgress(
+                            n_done=n_done,
+                            n_total=len(pairs),
+                            elapsed_seconds=elapsed,
+                            eta_seconds=(
+                                elapsed / n_scored * (len(pending_pairs) - n_scored)
+                                if n_scored
+                                else None
+                            ),
+                        )
+                    )
+                yield result
+        finally:
+            # Stops the process pool if the caller stops early
+            pending_scores.close()
+
+    def _prepare_pairs(self, df, pairs, kwargs, column_cache=None):
+        """
+        Resolves the random seed of the run, adds the SamplingPlan to the score
+        kwargs and returns the ColumnCache and the case of every pair that its
+        columns decide
+        """
+        validate_pairs_tolerance(kwargs.pop("tolerance", None))
+        sample = kwargs.get("sample", 5_000)
+        random_seed = kwargs.get("random_seed", 123)
+        min_ppscore = kwargs.pop("min_ppscore", None)
+        validate_min_ppscore(min_ppscore)
+        if random_seed is None:
+            from random import random
+
+            # One seed for all pairs of the call
+            random_seed = kwargs["random_seed"] = int(random() * 1000)
+        kwargs["sampling_plan"] = SamplingPlan(len(df), sample, random_seed)
+
+        if column_cache is None:
+            column_cache = ColumnCache(df)
+        # Duplicated column names are reported by the validation of score
+        if not df.columns.is_unique:
+            return column_cache, [None] * len(pairs)
+
+        start = time.perf_counter()
+        cases = self._determine_cases_from_columns(
+            df, pairs, column_cache, sample, kwargs.get("method", "exact")
+        )
+        # The bound of the PPS cannot be negative
+        if min_ppscore is not None and min_ppscore - SCREENING_MARGIN > 0:
+            cases = self._screen_pairs(pairs, cases, column_cache, min_ppscore, kwargs)
+        if self.tracer is not None:
+            self._trace_decided_pairs(pairs, cases, time.perf_counter() - start)
+        return column_cache, cases
+
+    def _trace_decided_pairs(self, pairs, cases, seconds):
+        """
+        Records a trace of every pair whose case its columns decided, with an
+        equal share of the seconds that deciding the cases of all pairs took
+        """
+        decided = [(pair, case) for pair, case in zip(pairs, cases) if case is not None]
+        for (x, y), case in decided:
+            trace = PairTrace(
+                x=str(x),
+                y=str(y),
+                case=TaskType(case).value,
+                stage_seconds={"case": seconds / len(decided)},
+                batched=True,
+            )
+            self.tracer.record(trace)
+
+    def _screen_pairs(self, pairs, cases, column_cache, min_ppscore, kwargs):
+        """
+        Marks the regression pairs that need scoring as BELOW_MIN_PPSCORE if the
+        PPS of their leave-one-out score is below min_ppscore - SCREENING_MARGIN.
+        Only pairs of the default regression tree with at least
+        MIN_SCREENING_ROWS rows are screened.
+        """
+        sampling_plan = kwargs["sampling_plan"]
+        sample, random_seed = sampling_plan.sample, sampling_plan.random_seed
+        task = get_invalid_task(
+            TaskType.REGRESSION, kwargs.get("invalid_score", 0), self.task_registry
+        )
+        if not is_default_tree(task.model):
+            return cases
+
+        screened_cases = list(cases)
+        neighbors_key = None
+        for position, ((x, y), case) in enumerate(zip(pairs, cases)):
+            if case is not None:
+                continue
+            try:
+                x_profile = column_cache.profile(x)
+                y_profile = column_cache.profile(y)
+                rows, case_type = determine_case_from_profiles(
+                    x_profile,
+                    y_profile,
+                    sample=sample,
+                    random_seed=random_seed,
+                    sampling_plan=sampling_plan,
+                )
+            except PROFILE_ERRORS:
+                # score reports the errors of single pairs
+                continue
+            if case_type != TaskType.REGRESSION or len(rows) < MIN_SCREENING_ROWS:
+                continue
+            target = y_profile.values[rows]
+            if not native_engine_supports(target, task):
+                continue
+
+            if neighbors_key != (x, rows.tobytes()):
+                # Most targets of a feature leave the same rows
+                neighbors_key = (x, rows.tobytes())
+                groups = x_profile.codes[rows]
+                group_values = None
+                if x_profile.kind == ColumnKind.NUMERIC:
+                    group_values = np.zeros(x_profile.n_categories)
+                    group_values[groups] = x_profile.values[rows]
+                neighbors = leave_one_out_neighbors(groups, group_values)
+            model_score = calculate_leave_one_out_regression_score(
+                groups, target, neighbors
+            )
+            # The same baseline as the score of the pair, so it can be reused
+            baseline_key = self._baseline_key(
+                x_profile, y_profile, case_type, sample, random_seed
+            )
+            ppscore_bound, baseline_score = task.score_normalizer(
+                target,
+                model_score,
+                baseline_score=column_cache.baselines.get(baseline_key),
+            )
+            if baseline_key is not None:
+                column_cache.baselines[baseline_key] = baseline_score
+            if ppscore_bound < min_ppscore - SCREENING_MARGIN:
+                screened_cases[position] = TaskType.BELOW_MIN_PPSCORE
+        return screened_cases
+
+    def _iter_pending_scores(
+        self,
+        df,
+        pairs,
+        n_jobs,
+        column_cache,
+        kwargs,
+        streaming=False,
+        should_stop=None,
+        deadline=None,
+    ):
+        """
+        Yields the PPSResults of the pairs that need scoring, in their order.
+        Once should_stop returns True, it yields None for the pairs that are not
+        scored or stops early. Worker processes only see the deadline, a time of
+        time.time(), and the rest of the chunks are cancelled.
+        """
+        if effective_n_jobs(n_jobs) == 1 or len(pairs) < 2 or not df.columns.is_unique:
+            for x, targets in group_targets_by_feature(pairs):
+                if should_stop is not None and should_stop():
+                    return
+                yield from self.score_targets(
+                    df,
+                    x,
+                    targets,
+                    column_cache=column_cache,
+                    should_stop=should_stop,
+                    **kwargs,
+                )
+            return
+
+        chunk_results = iter_scores_in_parallel(
+            df,
+            pairs,
+            n_jobs,
+            # Every worker unpickles its own copy of the tasks and their models
+            task_registry=dict(self.task_registry),
+            score_cache=self.score_cache,
+            tracer=self.tracer,
+            deadline=deadline,
+            # Smaller chunks report results more often and stop sooner
+            chunks_per_worker=(
+                STREAMING_CHUNKS_PER_WORKER
+                if streaming or should_stop is not None
+                else CHUNKS_PER_WORKER
+            ),
+            **kwargs,
+        )
+        try:
+            for chunk in chunk_results:
+                yield from chunk
+                if should_stop is not None and should_stop():
+                    return
+        finally:
+            chunk_results.close()
+
+    def _determine_cases_from_columns(self, df, pairs, column_cache, sample, method):
+        """
+        Validates the columns of the pairs once and returns the case of every
+        pair that its columns decide, or None for the pairs that need scoring
+        """
+        validate_method(method)
+        profiles = {}
+        for column in {column for pair in pairs for column in pair}:
+            validate_column_in_df(column, df)
+            try:
+                profiles[column] = column_cache.profile(column)
+            except PROFILE_ERRORS:
+                # Such columns are left to score, which reports their errors
+                profiles[column] = None
+
+        cases = []
+        for x, y in pairs:
+            if x == y:
+                cases.append(TaskType.PREDICT_ITSELF)
+            elif profiles[x] is None or profiles[y] is None:
+                cases.append(None)
+            else:
+                cases.append(
+                    determine_case_from_columns(profiles[x], profiles[y], sample)
+                )
+        return cases
+
+    def predictors(
+        self,
+        df,
+        y,
+        output="df",
+        sorted=True,
+        n_jobs=1,
+        top_k=None,
+        halving_factor=3,
+        **kwargs,
+    ):
         """
         Calculate PPS of all features against a target column
+
+        With top_k, only the top_k best features are returned. They are found by
+        successive halving: all features are scored on a small sample of rows,
+        the best 1 / halving_factor of them (at least 2 * top_k) are scored again
+        on a sample that is halving_factor times larger and so on, until the
+        survivors are scored with the full sample. A smaller halving_factor drops
+        fewer features per round, which costs more time but is less likely to
+        drop one of the top_k features on a small sample.
+
+        A time_budget is shared by all rounds. Features that a round could not
+        score are never dropped, and the features that the last round could not
+        score are returned as NOT_SCORED in addition to the top_k features.
         """
         validate_dataframe(df)
         validate_column_in_df(y, df)
         validate_unique_column(y, df)
         validate_output_format(output)
         validate_sorted_param(sorted)
+        validate_n_jobs(n_jobs)
+        validate_pairs_tolerance(kwargs.get("tolerance"))
+        validate_top_k(top_k, halving_factor)
 
-        scores = [self.score(df, column, y, **kwargs) for column in df if column != y]
+        pairs = [(column, y) for column in df if column != y]
+        if top_k is None:
+            scores = self.score_pairs(df, pairs, n_jobs=n_jobs, **kwargs)
+        else:
+            if kwargs.get("random_seed", 123) is None:
+                from random import random
+
+                # One seed for all rounds
+                kwargs["random_seed"] = int(random() * 1000)
+            time_budget = kwargs.pop("time_budget", None)
+            cancel = kwargs.pop("cancel", None)
+            validate_time_budget(time_budget)
+            validate_cancel(cancel)
+            start = time.perf_counter()
+            deadline = None if time_budget is None else time.time() + time_budget
+            n_features = len(pairs)
+
+            # The columns are profiled once for all rounds
+            column_cache = ColumnCache(df)
+            pairs = self._race_pairs(
+                df,
+                pairs,
+                top_k,
+                halving_factor,
+                n_jobs,
+                column_cache,
+                deadline,
+                cancel,
+                kwargs,
+            )
+            scores = self._score_pairs_until(
+                df, pairs, n_jobs, column_cache, deadline, cancel, kwargs
+            )
+            # The best top_k pairs and the unscored ones, in the order of the features
+            best, not_scored = self._best_positions(scores, top_k)
+            scores = scores.take(np.sort(np.concatenate([best, not_scored])))
+            if scores.coverage is not None:
+                # The features that lost a round were scored
+                scores.coverage = self._coverage(
+                    n_features, len(not_scored), start, cancel
+                )
 
         return self.format_results(scores=scores, output=output, sorted_result=sorted)
 
-    def matrix(self, df, output="df", sorted=False, **kwargs):
+    def _race_pairs(
+        self,
+        df,
+        pairs,
+        top_k,
+        halving_factor,
+        n_jobs,
+        column_cache,
+        deadline,
+        cancel,
+        kwargs,
+    ):
+        """
+        Successive halving: returns the pairs that survive rounds of scoring on
+        samples that grow by halving_factor up to the full sample, keeping the
+        best 1 / halving_factor of the pairs per round, but at least
+        MIN_SURVIVORS_PER_TOP_K * top_k. The pairs that a round does not score
+        before the deadline or the cancellation survive, and the racing stops.
+        """
+        sample = kwargs.get("sample", 5_000)
+        full_sample = min(sample, len(df)) if sample else len(df)
+
+        budgets = []
+        budget = full_sample / halving_factor
+        while budget >= MIN_RACING_SAMPLE:
+            budgets.append(int(budget))
+            budget /= halving_factor
+
+        for budget in reversed(budgets):
+            n_survivors = max(
+                math.ceil(len(pairs) / halving_factor), MIN_SURVIVORS_PER_TOP_K * top_k
+            )
+            if len(pairs) <= n_survivors:
+                break
+            scores = self._score_pairs_until(
+                df,
+                pairs,
+                n_jobs,
+                column_cache,
+                deadline,
+                cancel,
+                {**kwargs, "sample": budget},
+            )
+            best, not_scored = self._best_positions(scores, n_survivors)
+            survivors = np.sort(np.concatenate([best, not_scored]))
+            pairs = [pairs[position] for position in survivors]
+            if len(not_scored):
+                break
+        return pairs
+
+    def _best_positions(self, scores, n_best):
+        """
+        The positions of the n_best scored pairs of the ScoreTable and of the
+        pairs that were not scored, which cannot be ranked
+        """
+        is_scored = scores.case != CASE_CODES[TaskType.NOT_SCORED]
+        scored = np.flatnonzero(is_scored)
+        best = scored[np.argsort(-scores.ppscore[scored], kind="stable")[:n_best]]
+        return best, np.flatnonzero(~is_scored)
+
+    def matrix(self, df, output="df", sorted=False, n_jobs=1, **kwargs):
         """
         Calculate the PPS matrix for all columns in the dataframe
+
+        time_budget (seconds) and cancel (a threading.Event) return a partial
+        matrix of the same shape, see score_pairs. Its ScoreCoverage is in the
+        attrs of a DataFrame result and the coverage of a ScoreTable.
         """
         validate_dataframe(df)
         validate_output_format(output)
         validate_sorted_param(sorted)
+        validate_n_jobs(n_jobs)
+        validate_pairs_tolerance(kwargs.get("tolerance"))
+
+        if kwargs.get("random_seed", 123) is None:
+            from random import random
 
-        scores = [self.score(df, x, y, **kwargs) for x in df for y in df]
+            # Recorded in the settings of the matrix
+            kwargs["random_seed"] = int(random() * 1000)
+
+        columns = list(df.columns)
+        pairs = [(x, y) for x in columns for y in columns]
+        scores = self.score_pairs(df, pairs, n_jobs=n_jobs, **kwargs)
+        scores.column_digests = self._column_digests(df, kwargs)
+        scores.settings = self._matrix_settings(kwargs)
+
+        return self.format_results(scores=scores, output=output, sorted_result=sorted)
+
+    def update_matrix(self, prev, df, output="df", sorted=False, n_jobs=1, **kwargs):
+        """
+        Calculate the PPS matrix of df, reusing the scores of a previous matrix
+        result (a DataFrame or a ScoreTable) for the pairs whose columns did not
+        change. Only the rows and columns of the matrix that touch new or
+        modified columns are scored, the pairs of dropped columns are left out.
+        The settings of the previous matrix, e.g. sample and random_seed, are
+        used unless they are passed again.
+        """
+        validate_dataframe(df)
+        validate_output_format(output)
+        validate_sorted_param(sorted)
+        validate_n_jobs(n_jobs)
+        validate_pairs_tolerance(kwargs.get("tolerance"))
+        validate_time_budget(kwargs.get("time_budget"))
+        validate_cancel(kwargs.get("cancel"))
+        previous = self._previous_matrix(prev)
+        start = time.perf_counter()
+
+        kwargs = {
+            **{
+                name: value
+                for name, value in previous.settings.items()
+                if name in MATRIX_SETTINGS
+            },
+            **kwargs,
+        }
+        if kwargs.get("random_seed", 123) is None:
+            from random import random
+
+            kwargs["random_seed"] = int(random() * 1000)
+        column_digests = self._column_digests(df, kwargs)
+        settings = self._matrix_settings(kwargs)
+
+        unchanged_columns = set()
+        if settings == previous.settings:
+            unchanged_columns = {
+                column
+                for column, digest in column_digests.items()
+                if digest is not None and previous.column_digests.get(column) == digest
+            }
+        previous_positions = {
+            (previous.columns[x], previous.columns[y]): position
+            for position, (x, y) in enumerate(zip(previous.x, previous.y))
+            # Errors might not happen again and unscored pairs are scored now
+            if previous.case[position]
+            not in (CASE_CODES[TaskType.UNKNOWN_ERROR], CASE_CODES[TaskType.NOT_SCORED])
+        }
+
+        columns = list(df.columns)
+        pairs = [(x, y) for x in columns for y in columns]
+        reused_positions, previous_reused_positions, pending_positions = [], [], []
+        for position, (x, y) in enumerate(pairs):
+            if (
+                x in unchanged_columns
+                and y in unchanged_columns
+                and (x, y) in previous_positions
+            ):
+                reused_positions.append(position)
+                previous_reused_positions.append(previous_positions[(x, y)])
+            else:
+                pending_positions.append(position)
+
+        scores = ScoreTable.from_pairs(pairs)
+        scores.copy_scores(
+            np.array(reused_positions, dtype=np.int64),
+            previous,
+            np.array(previous_reused_positions, dtype=np.int64),
+        )
+        if pending_positions:
+            pending_scores = self.score_pairs(
+                df,
+                [pairs[position] for position in pending_positions],
+                n_jobs=n_jobs,
+                **kwargs,
+            )
+            scores.copy_scores(
+                np.array(pending_positions),
+                pending_scores,
+                np.arange(len(pending_positions)),
+            )
+        cancel = kwargs.get("cancel")
+        if kwargs.get("time_budget") is not None or cancel is not None:
+            # Reused pairs count as scored
+            n_not_scored = int(np.sum(scores.case == CASE_CODES[TaskType.NOT_SCORED]))
+            scores.coverage = self._coverage(len(pairs), n_not_scored, start, cancel)
+        scores.column_digests = column_digests
+        scores.settings = settings
 
         return self.format_results(scores=scores, output=output, sorted_result=sorted)
+
+    def _previous_matrix(self, prev):
+        """The ScoreTable of a previous matrix result with its column digests"""
+        if isinstance(prev, pd.DataFrame):
+            prev = ScoreTable.from_frame(prev)
+        if not isinstance(prev, ScoreTable) or not prev.column_digests:
+            raise ValueError(
+                f"The 'prev' argument should be the DataFrame or ScoreTable that matrix "
+                f"returned but you passed a {type(prev)} without column digests\n"
+                f"Please pass a result of matrix with output 'df' or 'table'"
+            )
+        return prev
+
+    def _column_digests(self, df, kwargs):
+        """
+        The column_digest of every column of df, None for columns that cannot be
+        hashed. Empty if the scores cannot be reused, e.g. for explicit folds.
+        """
+        cross_validation = kwargs.get("cross_validation", 4)
+        if not df.columns.is_unique or not isinstance(cross_validation, int):
+            return {}
+
+        column_digests = {}
+        for column in df.columns:
+            try:
+                column_digests[column] = column_digest(df[column])
+            except TypeError:
+                column_digests[column] = None
+        return column_digests
+
+    def _matrix_settings(self, kwargs):
+        """The settings that the scores of a matrix depend on"""
+        if self._registry_fingerprint is None:
+            self._registry_fingerprint = task_registry_fingerprint(self.task_registry)
+        settings = {
+            name: kwargs.get(name, value) for name, value in MATRIX_SETTINGS.items()
+        }
+        settings["task_registry"] = self._registry_fingerprint
+        return settings
+
+    def iter_predictors(self, df, y, n_jobs=1, progress=None, **kwargs):
+        """
+        Like predictors, but returns a generator that yields the PPSResult of every
+        feature as soon as it is calculated, unsorted. If given, progress is called
+        with a ScoreProgress after every feature.
+        """
+        validate_dataframe(df)
+        validate_column_in_df(y, df)
+        validate_unique_column(y, df)
+        validate_n_jobs(n_jobs)
+        validate_pairs_tolerance(kwargs.get("tolerance"))
+
+        pairs = [(column, y) for column in df if column != y]
+        return self.iter_pairs(df, pairs, n_jobs=n_jobs, progress=progress, **kwargs)
+
+    def iter_matrix(self, df, n_jobs=1, progress=None, **kwargs):
+        """
+        Like matrix, but returns a generator that yields the PPSResult of every
+        pair as soon as it is calculated. If given, progress is called with a
+        ScoreProgress after every pair.
+        """
+        validate_dataframe(df)
+        validate_n_jobs(n_jobs)
+        validate_pairs_tolerance(kwargs.get("tolerance"))
+
+        columns = list(df.columns)
+        pairs = [(x, y) for x in columns for y in columns]
+        return self.iter_pairs(df, pairs, n_jobs=n_jobs, progress=progress, **kwargs)
@@ -0,0 +1,182 @@
+import sys
+from multiprocessing import shared_memory
+from typing import Any, Optional, Self
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# Offsets of the buffers inside the shared block are aligned for vectorized reads
+BUFFER_ALIGNMENT = 64
+
+
+class SharedBuffer(BaseModel):
+    offset: int
+    dtype: str
+    length: int
+
+
+class SharedColumn(BaseModel):
+    """Describes how a column is laid out in shared memory and how to rebuild it"""
+
+    name: Any
+    layout: str  # "numpy", "masked", "categorical" or "codes"
+    dtype: Any
+    values: SharedBuffer
+    mask: Optional[SharedBuffer] = None
+    categories: Any = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class SharedFrameDescriptor(BaseModel):
+    """Picklable handle that lets a worker process attach to a SharedFrame"""
+
+    shm_name: str
+    columns: list[SharedColumn]
+
+
+def encode_column(series: pd.Series) -> tuple[str, dict[str, np.ndarray], Any]:
+    """
+    Splits a column into plain NumPy buffers that can live in shared memory.
+    Object, string and other non-NumPy columns become integer codes plus a
+    category table, so that only the (small) table needs to be pickled.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return "numpy", {"values": series.to_numpy()}, None
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "categorical", {"values": series.cat.codes.to_numpy()}, None
+    if isinstance(series.array, pd.api.extensions.ExtensionArray) and hasattr(
+        series.array, "_mask"
+    ):
+        # pandas masked arrays (Int64, Float64, boolean) are data + NA mask
+        array = series.array
+        return "masked", {"values": array._data, "mask": array._mask}, None
+
+    try:
+        codes, categories = pd.factorize(series, sort=False, use_na_sentinel=True)
+    except TypeError:
+        # Unhashable values, e.g. lists, cannot be factorized, so every row is
+        # its own category
+        return "codes", {"values": np.arange(len(series))}, series.array
+    return "codes", {"values": codes}, categories.array
+
+
+def decode_column(column: SharedColumn, buffers: dict[str, np.ndarray]) -> pd.Series:
+    """Rebuilds a column from its shared buffers without copying numeric data"""
+    values = buffers["values"]
+    if column.layout == "numpy":
+        array = values
+    elif column.layout == "categorical":
+        array = pd.Categorical.from_codes(values, dtype=column.dtype)
+    elif column.layout == "masked":
+        array = column.dtype.construct_array_type()(values, buffers["mask"])
+    else:
+        array = pd.api.extensions.take(column.categories, values, allow_fill=True)
+    # Without the dtype, pandas may infer another one, e.g. str for object columns
+    # of strings, which changes the digests of the columns in the workers
+    return pd.Series(array, name=column.name, dtype=column.dtype, copy=False)
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        # Only the owner should unlink the block when it is done with it
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrame:
+    """
+    Copies the columns of a DataFrame into a single shared-memory block once,
+    so that worker processes can read them without the frame being pickled.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        encoded = [(column, *encode_column(df[column])) for column in df.columns]
+
+        size = 0
+        for _, _, buffers, _ in encoded:
+            for array in buffers.values():
+                size = _align(size) + array.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        columns = []
+        offset = 0
+        for name, layout, buffers, categories in encoded:
+            shared_buffers = {}
+            for key, array in buffers.items():
+                offset = _align(offset)
+                target = np.ndarray(
+                    array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset
+                )
+                target[:] = array
+                shared_buffers[key] = SharedBuffer(
+                    offset=offset, dtype=array.dtype.str, length=len(array)
+                )
+                offset += array.nbytes
+            columns.append(
+                SharedColumn(
+                    name=name,
+                    layout=layout,
+                    dtype=df[name].dtype,
+                    categories=categories,
+                    **shared_buffers,
+                )
+            )
+
+        self.descriptor = SharedFrameDescriptor(
+            shm_name=self._shm.name, columns=columns
+        )
+
+    def close(self) -> None:
+        """Releases the shared-memory block"""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedFrameView:
+    """Read-only, zero-copy view on a SharedFrame from inside a worker process"""
+
+    def __init__(self, descriptor: SharedFrameDescriptor):
+        self._shm = _attach_shared_memory(descriptor.shm_name)
+        self._columns = {column.name: column for column in descriptor.columns}
+
+    def _buffer(self, buffer: SharedBuffer) -> np.ndarray:
+        array = np.ndarray(
+            (buffer.length,),
+            dtype=np.dtype(buffer.dtype),
+            buffer=self._shm.buf,
+            offset=buffer.offset,
+        )
+        array.flags.writeable = False
+        return array
+
+    def column(self, name: Any) -> pd.Series:
+        """Returns the column with the given name"""
+        column = self._columns[name]
+        buffers = {"values": self._buffer(column.values)}
+        if column.mask is not None:
+            buffers["mask"] = self._buffer(column.mask)
+        return decode_column(column, buffers)
+
+    def __getitem__(self, name: Any) -> pd.Series:
+        return self.column(name)
+
+    def frame(self, columns: list) -> pd.DataFrame:
+        """Returns a DataFrame that only contains the given columns"""
+        return pd.DataFrame({name: self.column(name) for name in columns}, copy=False)
+
+    def close(self) -> None:
+        self._shm.close()
+
+
+def _align(offset: int) -> int:
+    return -(-offset // BUFFER_ALIGNMENT) * BUFFER_ALIGNMENT
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn import preprocessing
+
+from ppscore.core.column_cache import (
+    MAX_BINS,
+    ColumnCache,
+    ColumnKind,
+    bin_column,
+    profile_column,
+)
+
+
+@pytest.fixture
+def mixed_dataframe():
+    return pd.DataFrame(
+        {
+            "numeric": [1.5, np.nan, 3.0, 1.5, 0.5],
+            "object": ["b", "a", None, "c", "a"],
+            "category": pd.Categorical(
+                ["x", "y", "x", "y", "x"], categories=["y", "x", "z"]
+            ),
+            "datetime": pd.date_range("2023-01-01", periods=5),
+            "mixed": ["a", 1, "b", 2, "c"],
+        }
+    )
+
+
+def test_profile_column_kinds(mixed_dataframe):
+    assert profile_column(mixed_dataframe["numeric"]).kind == ColumnKind.NUMERIC
+    assert profile_column(mixed_dataframe["object"]).kind == ColumnKind.CATEGORICAL
+    assert profile_column(mixed_dataframe["category"]).kind == ColumnKind.CATEGORICAL
+    assert profile_column(mixed_dataframe["datetime"]).kind == ColumnKind.DATETIME
+
+
+def test_profile_column_codes_and_missing_values(mixed_dataframe):
+    profile = profile_column(mixed_dataframe["numeric"])
+
+    assert list(profile.codes) == [1, -1, 2, 1, 0]
+    assert list(profile.null_mask) == [False, True, False, False, False]
+    assert profile.n_categories == 3
+    assert profile.values[2] == 3.0
+
+
+def test_profile_column_values_of_tz_aware_datetimes():
+    series = pd.Series(pd.date_range("2020", periods=3, tz="Europe/Berlin"))
+
+    profile = profile_column(series)
+
+    assert profile.kind == ColumnKind.DATETIME
+    assert profile.values.dtype.kind == "M"
+    np.testing.assert_array_equal(profile.values, series.dt.tz_convert(None).to_numpy())
+
+
+def test_labels_match_label_encoder(mixed_dataframe):
+    profile = profile_column(mixed_dataframe["object"])
+    rows = np.array([0, 3, 4])
+
+    expected = preprocessing.LabelEncoder().fit_transform(
+        mixed_dataframe["object"].iloc[rows]
+    )
+    np.testing.assert_array_equal(profile.labels(rows), expected)
+
+
+def test_one_hot_matches_one_hot_encoder(mixed_dataframe):
+    profile = profile_column(mixed_dataframe["category"])
+    rows = np.array([4, 0, 2])
+
+    expected = preprocessing.OneHotEncoder().fit_transform(
+        mixed_dataframe["category"].iloc[rows].__array__().reshape(-1, 1)
+    )
+    np.testing.assert_array_equal(profile.one_hot(rows).toarray(), expected.toarray())
+
+
+def test_count_categories(mixed_dataframe):
+    object_profile = profile_column(mixed_dataframe["object"])
+    category_profile = profile_column(mixed_dataframe["category"])
+
+    assert object_profile.count_categories(np.array([1, 4])) == 1
+    # Like value_counts(), unobserved categories of a categorical are counted
+    assert category_profile.count_categories(np.array([0, 2])) == 3
+
+
+def test_column_cache_profiles_each_column_once(mixed_dataframe):
+    cache = ColumnCache(mixed_dataframe)
+
+    assert cache.profile("numeric") is cache.profile("numeric")
+
+
+def test_mixed_types_can_be_counted_but_not_encoded(mixed_dataframe):
+    profile = profile_column(mixed_dataframe["mixed"])
+
+    assert profile.count_categories(np.arange(5)) == 5
+    with pytest.raises(TypeError):
+        profile.labels(np.arange(5))
+
+
+def test_bin_column_keeps_few_distinct_values_apart():
+    profile = profile_column(pd.Series([3.0, np.nan, 1.0, 3.0, 2.0]))
+
+    feature_bins = bin_column(profile)
+
+    np.testing.assert_array_equal(feature_bins.values, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(feature_bins.bins, [2, 0, 0, 2, 1])
+
+
+def test_bin_column_quantile_bins():
+    values = np.random.RandomState(0).exponential(1, 10_000)
+    profile = profile_column(pd.Series(values))
+
+    feature_bins = bin_column(profile)
+
+    assert feature_bins.bins.dtype == np.uint8
+    assert len(feature_bins.values) <= MAX_BINS
+    # Every value falls into the bin of the largest bin value below it
+    bin_values = feature_bins.values[feature_bins.bins]
+    assert (bin_values <= values).all()
+    next_values = np.append(feature_bins.values, np.inf)[
+        feature_bins.bins.astype(int) + 1
+    ]
+    assert (values < next_values).all()
+    # Quantile bins hold similar numbers of rows
+    counts = np.bincount(feature_bins.bins)
+    assert counts.max() < 2 * counts.mean()
+
+
+def test_column_cache_bins_only_finite_numeric_columns(mixed_dataframe):
+    df = mixed_dataframe.assign(infinite=[1.0, np.inf, 2.0, 3.0, 4.0])
+    column_cache = ColumnCache(df)
+
+    assert column_cache.bins("numeric") is column_cache.bins("numeric")
+    assert column_cache.bins("object") is None
+    assert column_cache.bins("datetime") is None
+    assert column_cache.bins("infinite") is None
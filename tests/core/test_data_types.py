@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
-
-from ppscore.core.data_types import determine_case_and_prepare_df
+import pytest
+
+from ppscore.core.column_cache import profile_column
+from ppscore.core.data_types import (
+    determine_case_and_prepare_df,
+    determine_case_from_columns,
+    determine_case_from_profiles,
+    maybe_sample,
+    sample_rows,
+)
 from ppscore.core.models import TaskType
 
 
@@ -55,3 +64,65 @@ def test_determine_case_and_prepare_df_target_is_datetime():
     )
     result_df, task_type = determine_case_and_prepare_df(df, "x", "y")
     assert task_type == TaskType.TARGET_IS_DATETIME
+
+
+def test_determine_case_from_profiles_matches_dataframe_version():
+    df = pd.DataFrame(
+        {
+            "numeric": [1.0, 2.0, None, 4.0, 5.0],
+            "id": ["id1", "id2", "id3", "id4", "id5"],
+            "constant": [7, 7, 7, 7, None],
+            "label": ["a", "b", "a", None, "b"],
+            "datetime": pd.date_range("2023-01-01", periods=5),
+        }
+    )
+    profiles = {column: profile_column(df[column]) for column in df}
+
+    for x in df:
+        for y in df:
+            _, expected = determine_case_and_prepare_df(df, x, y)
+            _, task_type = determine_case_from_profiles(profiles[x], profiles[y])
+            assert task_type == expected, (x, y)
+
+
+def test_sample_rows_selects_the_same_rows_as_maybe_sample():
+    df = pd.DataFrame({"x": np.arange(100)})
+
+    expected = maybe_sample(df, 10, random_seed=5)["x"].to_numpy()
+
+    np.testing.assert_array_equal(sample_rows(np.arange(100), 10, 5), expected)
+
+
+@pytest.mark.parametrize(
+    "x, y, sample, expected",
+    [
+        ([1, 2, None], [1, 2, None], 5_000, TaskType.PREDICT_ITSELF),
+        (
+            [1, 2, 3],
+            [None, None, None],
+            5_000,
+            TaskType.EMPTY_DATAFRAME_AFTER_DROPPING_NA,
+        ),
+        (["a", "b", None], [1, 2, 3], 5_000, TaskType.FEATURE_IS_ID),
+        ([1, 2, None], [5, 5, None], 1, TaskType.TARGET_IS_CONSTANT),
+        ([1, 2, 3, None], ["a", "b", None, "c"], 5_000, TaskType.TARGET_IS_ID),
+        ([1, 2, 3], ["a", "b", "a"], 5_000, None),
+        # After dropping the missing values, x is an ID and y constant
+        (["a", "b", "a", "c"], [1, 1, None, 2], 5_000, None),
+        # The target could be left with a single row, i.e. constant
+        ([None, 2, 3], ["a", "b", None], 5_000, None),
+        # A sample of 2 rows of y can be an ID
+        ([1, 2, 3, 4], ["a", "b", "a", "b"], 2, None),
+    ],
+)
+def test_determine_case_from_columns(x, y, sample, expected):
+    df = pd.DataFrame({"x": x, "y": y})
+    x_profile, y_profile = profile_column(df["x"]), profile_column(df["y"])
+    if expected == TaskType.PREDICT_ITSELF:
+        y_profile = x_profile
+
+    case = determine_case_from_columns(x_profile, y_profile, sample)
+
+    assert case == expected
+    if case is not None:
+        assert case == determine_case_from_profiles(x_profile, y_profile, sample)[1]
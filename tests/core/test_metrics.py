@@ -1,36 +1,38 @@
-import pandas as pd
+import numpy as np
+import pytest
+from sklearn.metrics import f1_score, mean_absolute_error
 
-from ppscore.core.metrics import f1_normalizer
+from ppscore.core.metrics import f1_baseline_score, f1_normalizer, mae_normalizer
 
 
 def test_f1_normalizer_most_common_value_baseline():
-    df = pd.DataFrame({"y": ["cat1", "cat1", "cat2", "cat1", "cat2"]})
+    labels = np.array([0, 0, 1, 0, 1])  # cat1, cat1, cat2, cat1, cat2
     model_score = 0.8
     random_seed = 42
 
-    ppscore, baseline_score = f1_normalizer(df, "y", model_score, random_seed)
+    ppscore, baseline_score = f1_normalizer(labels, model_score, random_seed)
 
     assert 0 <= ppscore <= 1, "PPS should be normalized between 0 and 1"
     assert baseline_score > 0, "Baseline F1 score should be greater than 0"
 
 
 def test_f1_normalizer_random_baseline():
-    df = pd.DataFrame({"y": ["cat1", "cat2", "cat3", "cat4", "cat5"]})
+    labels = np.array([0, 1, 2, 3, 4])  # cat1 to cat5
     model_score = 0.5
     random_seed = 42
 
-    ppscore, baseline_score = f1_normalizer(df, "y", model_score, random_seed)
+    ppscore, baseline_score = f1_normalizer(labels, model_score, random_seed)
 
     assert 0 <= ppscore <= 1, "PPS should be normalized between 0 and 1"
     assert baseline_score > 0, "Baseline F1 score should be greater than 0"
 
 
 def test_f1_normalizer_single_unique_value():
-    df = pd.DataFrame({"y": ["cat1", "cat1", "cat1", "cat1"]})
+    labels = np.array([0, 0, 0, 0])  # cat1 only
     model_score = 0.5
     random_seed = 42
 
-    ppscore, baseline_score = f1_normalizer(df, "y", model_score, random_seed)
+    ppscore, baseline_score = f1_normalizer(labels, model_score, random_seed)
 
     assert (
         ppscore == 0
@@ -38,3 +40,40 @@ def test_f1_normalizer_single_unique_value():
     assert (
         baseline_score == 1
     ), "Baseline F1 score should be 1 when all values are the same"
+
+
+def test_mae_normalizer_median_baseline():
+    target = np.array([1.0, 4.0, 2.0, 8.0])
+
+    ppscore, baseline_score = mae_normalizer(target, -1.0)
+
+    assert baseline_score == pytest.approx(
+        mean_absolute_error(target, np.full(4, np.median(target)))
+    )
+    assert ppscore == pytest.approx(1 - 1.0 / baseline_score)
+
+
+@pytest.mark.parametrize("n_labels", [2, 5, 40])
+def test_f1_baseline_score_matches_sklearn(n_labels):
+    rng = np.random.RandomState(n_labels)
+    labels = np.minimum(rng.geometric(0.3, 500) - 1, n_labels - 1)
+    most_common = np.full_like(labels, np.bincount(labels).argmax())
+    random = labels[np.random.RandomState(7).permutation(len(labels))]
+
+    expected = max(
+        f1_score(labels, most_common, average="weighted"),
+        f1_score(labels, random, average="weighted"),
+    )
+
+    assert f1_baseline_score(labels, random_seed=7) == pytest.approx(expected)
+
+
+def test_normalizers_reuse_a_given_baseline_score():
+    labels = np.array([0, 1, 0, 1])
+
+    assert f1_normalizer(
+        labels, 0.75, random_seed=1, baseline_score=0.5
+    ) == pytest.approx((0.5, 0.5))
+    assert mae_normalizer(
+        np.array([1.0, 2.0]), -1.0, baseline_score=4.0
+    ) == pytest.approx((0.75, 4.0))
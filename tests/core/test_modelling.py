@@ -1,9 +1,31 @@
 import numpy as np
 import pandas as pd
 import pytest
+from sklearn import tree
+from sklearn.metrics import f1_score
+from sklearn.model_selection import cross_val_score
 
-from ppscore.core.modelling import calculate_model_cv_score
+from ppscore.core.column_cache import ColumnCache, one_hot_encode
+from ppscore.core.modelling import (
+    calculate_groupby_cv_score,
+    calculate_groupby_cv_scores,
+    calculate_hist_cv_score,
+    calculate_leave_one_out_regression_score,
+    calculate_model_cv_score,
+    calculate_sequential_cv_score,
+    cross_validate_categorical_model,
+    cross_validate_model,
+    is_default_tree,
+    iter_model_fold_scores,
+    leave_one_out_neighbors,
+    native_engine_feature,
+    native_engine_supports,
+    predict_category,
+    weighted_f1_score,
+)
 from ppscore.core.models import ScoreTask, TaskType
+from ppscore.core.task_registry import get_task_registry
+from ppscore.core.tree1d import Tree1DClassifier, Tree1DRegressor
 
 
 @pytest.fixture
@@ -108,3 +130,284 @@ def test_calculate_model_cv_score_invalid_feature(mock_task_classification):
             cross_validation=3,
             random_seed=42,
         )
+
+
+@pytest.mark.parametrize("task_type", [TaskType.REGRESSION, TaskType.CLASSIFICATION])
+def test_cross_validate_model_groupby_engine_matches_sklearn(task_type):
+    rng = np.random.RandomState(0)
+    # Repeated values, values that only occur in some folds and near-ties
+    feature = np.concatenate(
+        [rng.randint(0, 40, 300), rng.normal(0, 20, 100), [1e-8, 2e-8, 3e-8]]
+    ).reshape(-1, 1)
+    if task_type == TaskType.REGRESSION:
+        target = np.sin(feature[:, 0] / 5) + rng.normal(0, 0.3, len(feature))
+    else:
+        target = rng.randint(0, 3, len(feature))
+    task = get_task_registry()[task_type]
+
+    expected = cross_val_score(
+        task.model, feature, target, cv=4, scoring=task.metric_key
+    ).mean()
+
+    assert cross_validate_model(feature, target, task, 4) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("task_type", [TaskType.REGRESSION, TaskType.CLASSIFICATION])
+def test_cross_validate_model_tree1d_engine_matches_sklearn(task_type):
+    rng = np.random.RandomState(3)
+    feature = rng.normal(0, 1, 500).reshape(-1, 1)
+    task = get_task_registry()[task_type]
+    if task_type == TaskType.REGRESSION:
+        target = feature[:, 0] ** 2 + rng.normal(0, 0.5, len(feature))
+        sklearn_model = tree.DecisionTreeRegressor(max_depth=3, min_samples_leaf=5)
+        task.model = Tree1DRegressor(max_depth=3, min_samples_leaf=5)
+    else:
+        target = (feature[:, 0] + rng.normal(0, 0.5, len(feature)) > 0).astype(int)
+        sklearn_model = tree.DecisionTreeClassifier(max_depth=3, min_samples_leaf=5)
+        task.model = Tree1DClassifier(max_depth=3, min_samples_leaf=5)
+
+    expected = cross_val_score(
+        sklearn_model, feature, target, cv=4, scoring=task.metric_key
+    ).mean()
+
+    assert cross_validate_model(feature, target, task, 4) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("task_type", [TaskType.REGRESSION, TaskType.CLASSIFICATION])
+def test_cross_validate_categorical_model_matches_sklearn(task_type):
+    rng = np.random.RandomState(0)
+    codes = rng.randint(0, 30, 2000)
+    if task_type == TaskType.REGRESSION:
+        target = codes % 7 + rng.normal(0, 1, len(codes))
+    else:
+        target = (codes % 5 + rng.randint(0, 2, len(codes))) % 4
+    task = get_task_registry()[task_type]
+
+    expected = cross_val_score(
+        task.model, one_hot_encode(codes), target, cv=4, scoring=task.metric_key
+    ).mean()
+
+    assert cross_validate_categorical_model(codes, target, task, 4) == pytest.approx(
+        expected
+    )
+
+
+@pytest.mark.parametrize("is_classification", [False, True])
+def test_predict_category_routes_unseen_categories_like_the_tree(is_classification):
+    # Category 0 is split off first, which leaves the pure categories 1 and 2
+    train_codes = np.array([0, 0, 0, 0, 1, 1, 2, 2, 2])
+    train_target = np.array([0, 1, 0, 1, 2, 2, 2, 2, 2])
+    test_codes = np.array([0, 1, 2, 3])
+    model = (
+        tree.DecisionTreeClassifier()
+        if is_classification
+        else (tree.DecisionTreeRegressor())
+    )
+    one_hot = one_hot_encode(np.concatenate([train_codes, test_codes]))
+
+    expected = model.fit(one_hot[:9], train_target).predict(one_hot[9:])
+    predictions = predict_category(
+        train_codes, train_target, test_codes, is_classification
+    )
+
+    np.testing.assert_allclose(predictions, expected)
+
+
+def test_calculate_model_cv_score_scores_categories_without_sklearn(mocker):
+    mock_cross_val_score = mocker.patch("sklearn.model_selection.cross_val_score")
+    df = pd.DataFrame(
+        {"feature": list("ABCD") * 25, "target": [1.0, 2.0, 3.0, 4.0] * 25}
+    )
+    task = get_task_registry()[TaskType.REGRESSION]
+
+    result = calculate_model_cv_score(
+        df,
+        target="target",
+        feature="feature",
+        task=task,
+        cross_validation=4,
+        random_seed=42,
+    )
+
+    assert result == pytest.approx(0.0)
+    mock_cross_val_score.assert_not_called()
+
+
+@pytest.mark.parametrize("task_type", [TaskType.REGRESSION, TaskType.CLASSIFICATION])
+def test_calculate_hist_cv_score_matches_sklearn_on_the_bins(task_type):
+    rng = np.random.RandomState(0)
+    # Few rows per bin, so that some bins have no rows in some training folds
+    feature = rng.normal(0, 1, 600)
+    if task_type == TaskType.REGRESSION:
+        target = np.sin(feature) + rng.normal(0, 0.5, len(feature))
+    else:
+        target = rng.randint(0, 3, len(feature))
+    feature_bins = ColumnCache(pd.DataFrame({"x": feature})).bins("x")
+    task = get_task_registry()[task_type]
+
+    expected = cross_val_score(
+        task.model,
+        feature_bins.values[feature_bins.bins].reshape(-1, 1),
+        target,
+        cv=4,
+        scoring=task.metric_key,
+    ).mean()
+    result = calculate_hist_cv_score(
+        feature_bins.bins, feature_bins.values, target, task, 4
+    )
+
+    assert result == pytest.approx(expected)
+
+
+def test_cross_validate_model_uses_sklearn_for_custom_models(
+    mocker, mock_task_regression
+):
+    mock_cross_val_score = mocker.patch("sklearn.model_selection.cross_val_score")
+    mock_cross_val_score.return_value = np.array([-1.0, -3.0])
+    mock_task_regression.model = tree.DecisionTreeRegressor(max_depth=3)
+
+    result = cross_validate_model(
+        np.arange(10.0).reshape(-1, 1), np.arange(10.0), mock_task_regression, 2
+    )
+
+    assert result == pytest.approx(-2.0)
+    mock_cross_val_score.assert_called_once()
+
+
+def test_iter_model_fold_scores_fits_sklearn_models_fold_by_fold():
+    rng = np.random.RandomState(0)
+    feature = rng.normal(0, 1, (200, 1))
+    target = feature[:, 0] ** 2 + rng.normal(0, 0.1, 200)
+    task = get_task_registry()[TaskType.REGRESSION].model_copy(
+        update={"model": tree.DecisionTreeRegressor(max_depth=3)}
+    )
+
+    fold_scores = list(
+        iter_model_fold_scores(feature, target, task, 4, sequential=True)
+    )
+
+    expected = cross_val_score(
+        task.model, feature, target, cv=4, scoring=task.metric_key
+    )
+    np.testing.assert_allclose(fold_scores, expected)
+
+
+@pytest.mark.parametrize(
+    "fold_scores, expected",
+    [
+        # Clearly worse than the baseline, so the PPS is 0
+        ([-2.0, -2.1, -1.9, -2.0], (-2.05, 2)),
+        # Clearly converged
+        ([-0.5, -0.5, -0.4, -0.6], (-0.5, 2)),
+        ([-0.3, -0.7, -0.4, -0.6], (-0.5, 4)),
+    ],
+)
+def test_calculate_sequential_cv_score_stops_early(fold_scores, expected):
+    task = get_task_registry()[TaskType.REGRESSION]
+
+    model_score, n_folds = calculate_sequential_cv_score(
+        iter(fold_scores), task, baseline_score=1.0
+    )
+
+    assert (model_score, n_folds) == (pytest.approx(expected[0]), expected[1])
+
+
+def test_is_default_tree():
+    assert is_default_tree(tree.DecisionTreeRegressor())
+    assert is_default_tree(tree.DecisionTreeClassifier())
+    assert not is_default_tree(tree.DecisionTreeClassifier(max_depth=2))
+    assert not is_default_tree("mock_model")
+
+
+def test_native_engine_feature_of_finite_real_features():
+    regression = get_task_registry()[TaskType.REGRESSION]
+    target = np.array([1.0, 2.0])
+
+    feature = native_engine_feature(np.array([[1], [2]]), target, regression)
+    assert feature.dtype == np.float32
+    assert (
+        native_engine_feature(np.array([[True], [False]]), target, regression)
+        is not None
+    )
+    assert (
+        native_engine_feature(np.array([[1.0], [np.nan]]), target, regression) is None
+    )
+    assert native_engine_feature(np.array([[1 + 1j], [2j]]), target, regression) is None
+    assert native_engine_feature(np.array([["a"], ["b"]]), target, regression) is None
+
+
+def test_native_engine_supports_finite_real_targets():
+    registry = get_task_registry()
+    regression = registry[TaskType.REGRESSION]
+    classification = registry[TaskType.CLASSIFICATION]
+
+    assert native_engine_supports(np.array([1.0, 2.5]), regression)
+    assert native_engine_supports(np.array([0, 1]), classification)
+    assert not native_engine_supports(np.array([0.0, 1.0]), classification)
+    assert not native_engine_supports(np.array([1.0, np.inf]), regression)
+    assert not native_engine_supports(np.array([1 + 1j, 2 + 0j]), regression)
+    assert not native_engine_supports(np.array(["a", "b"]), regression)
+
+
+def test_weighted_f1_score_matches_sklearn():
+    rng = np.random.RandomState(1)
+    y_true = rng.randint(0, 5, 200)
+    y_pred = np.where(rng.rand(200) < 0.6, y_true, rng.randint(0, 6, 200))
+
+    assert weighted_f1_score(y_true, y_pred) == pytest.approx(
+        f1_score(y_true, y_pred, average="weighted")
+    )
+
+
+@pytest.mark.parametrize("task_type", [TaskType.REGRESSION, TaskType.CLASSIFICATION])
+def test_groupby_cv_scores_of_several_targets_match_single_targets(task_type):
+    rng = np.random.RandomState(0)
+    feature = np.round(rng.normal(0, 1, 300), 1).astype(np.float32)
+    if task_type == TaskType.CLASSIFICATION:
+        targets = (feature > 0) + rng.randint(0, 2, (3, 300))
+    else:
+        targets = feature * rng.rand(3, 1) + rng.normal(0, 1, (3, 300))
+    task = get_task_registry()[task_type]
+
+    # Stratified folds depend on the target, so classification targets go one by one
+    batches = (
+        targets[:, np.newaxis] if task_type == TaskType.CLASSIFICATION else [targets]
+    )
+    scores = np.concatenate(
+        [calculate_groupby_cv_scores(feature, batch, task, 4) for batch in batches]
+    )
+
+    assert scores == pytest.approx(
+        [calculate_groupby_cv_score(feature, target, task, 4) for target in targets]
+    )
+
+
+def test_leave_one_out_neighbors_route_single_rows_like_a_tree():
+    values = np.array([0.0, 1.0, 2.0, 4.0, 8.0])
+    groups = np.array([0, 0, 1, 2, 3, 4, 4])
+
+    # 1 is as close to 0 as to 2 and goes below, 4 is closer to 2 than to 8
+    np.testing.assert_array_equal(
+        leave_one_out_neighbors(groups, values), [0, 0, 0, 1, 2, 4, 4]
+    )
+    np.testing.assert_array_equal(
+        leave_one_out_neighbors(groups), [0, 0, -1, -1, -1, 4, 4]
+    )
+
+
+def test_leave_one_out_regression_score_matches_trees_trained_on_other_rows():
+    rng = np.random.RandomState(0)
+    feature = rng.randint(0, 40, 60).astype(float)
+    target = feature + rng.normal(0, 5, 60)
+    distinct_values, groups = np.unique(feature, return_inverse=True)
+
+    predictions = [
+        tree.DecisionTreeRegressor()
+        .fit(np.delete(feature, row)[:, np.newaxis], np.delete(target, row))
+        .predict([[feature[row]]])[0]
+        for row in range(60)
+    ]
+
+    assert calculate_leave_one_out_regression_score(
+        groups, target, leave_one_out_neighbors(groups, distinct_values)
+    ) == pytest.approx(-np.mean(np.abs(target - predictions)))
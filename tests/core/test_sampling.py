@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ppscore.core import sampling
+from ppscore.core.data_types import sample_rows
+from ppscore.core.models import TaskType
+from ppscore.core.sampling import SamplingPlan, adaptive_sample_sizes
+from ppscore.core.task_registry import get_task_registry
+
+
+def test_adaptive_sample_sizes_grow_to_all_rows():
+    assert adaptive_sample_sizes(300) == [300]
+    assert adaptive_sample_sizes(500) == [500]
+    assert adaptive_sample_sizes(3_000) == [500, 1_000, 2_000, 3_000]
+
+
+def test_sample_rows_of_all_rows_match_sample_rows():
+    plan = SamplingPlan(1_000, 100, random_seed=7)
+    rows = np.arange(1_000)
+
+    np.testing.assert_array_equal(
+        plan.sample_rows(rows), sample_rows(rows, 100, random_seed=7)
+    )
+
+
+@pytest.mark.parametrize("sample", [None, 500])
+def test_sample_rows_keeps_rows_up_to_the_sample_size(sample):
+    plan = SamplingPlan(1_000, sample, random_seed=7)
+    rows = np.arange(0, 1_000, 3)
+
+    np.testing.assert_array_equal(plan.sample_rows(rows), rows)
+
+
+def test_sample_rows_masks_the_shared_permutation():
+    plan = SamplingPlan(1_000, 100, random_seed=7)
+    rows = np.arange(0, 1_000, 2)
+
+    sampled = plan.sample_rows(rows)
+
+    assert len(sampled) == 100
+    assert np.isin(sampled, rows).all()
+    # The sample keeps the order of the valid rows in the shared permutation
+    permutation = plan.permutation(1_000)
+    np.testing.assert_array_equal(sampled, permutation[permutation % 2 == 0][:100])
+
+
+def test_folds_are_calculated_once_per_key(mocker):
+    plan = SamplingPlan(100, 50, random_seed=7)
+    task = get_task_registry()[TaskType.REGRESSION]
+    target = np.arange(50, dtype=float)
+    cross_validation_folds = mocker.spy(sampling, "cross_validation_folds")
+
+    folds = plan.folds("y", task, target, 4)
+
+    assert plan.folds("y", task, target, 4) is folds
+    assert cross_validation_folds.call_count == 1
+    assert len(folds) == 4
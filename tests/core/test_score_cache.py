@@ -0,0 +1,86 @@
+import pandas as pd
+
+from ppscore.core.models import PPSResult, TaskType
+from ppscore.core.score_cache import (
+    ScoreCache,
+    column_digest,
+    score_cache_key,
+    task_registry_fingerprint,
+)
+from ppscore.core.task_registry import get_task_registry
+from ppscore.core.tree1d import Tree1DRegressor
+
+
+def make_result(ppscore):
+    return PPSResult(
+        x="x",
+        y="y",
+        ppscore=ppscore,
+        case=TaskType.REGRESSION,
+        is_valid_score=True,
+        metric="mean absolute error",
+        baseline_score=2.0,
+        model_score=1.0,
+        model=None,
+    )
+
+
+def test_column_digest_depends_on_values_and_dtype():
+    series = pd.Series([1, 2, 3])
+
+    assert column_digest(series) == column_digest(pd.Series([1, 2, 3], name="other"))
+    assert column_digest(series) != column_digest(pd.Series([1, 2, 4]))
+    assert column_digest(series) != column_digest(series.astype(float))
+
+
+def test_task_registry_fingerprint_depends_on_model_params():
+    registry = get_task_registry()
+    deeper = get_task_registry()
+    deeper[TaskType.REGRESSION] = deeper[TaskType.REGRESSION].model_copy(
+        update={"model": Tree1DRegressor(max_depth=4)}
+    )
+
+    assert task_registry_fingerprint(registry) == task_registry_fingerprint(
+        get_task_registry()
+    )
+    assert task_registry_fingerprint(registry) != task_registry_fingerprint(deeper)
+
+
+def test_score_cache_roundtrip_counts_hits_and_misses(tmp_path):
+    cache = ScoreCache(tmp_path / "scores.sqlite")
+    key = score_cache_key("a", "b", "registry", sample=100)
+
+    assert cache.get(key) is None
+    cache.put(key, make_result(0.5))
+
+    assert cache.get(key) == {
+        "ppscore": 0.5,
+        "case": TaskType.REGRESSION.value,
+        "is_valid_score": True,
+        "metric": "mean absolute error",
+        "baseline_score": 2.0,
+        "model_score": 1.0,
+    }
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+    # The scores persist across connections
+    assert len(ScoreCache(tmp_path / "scores.sqlite")) == 1
+
+
+def test_score_cache_evicts_the_least_recently_used_scores(tmp_path):
+    cache = ScoreCache(tmp_path / "scores.sqlite", max_entries=2)
+    keys = [score_cache_key(str(i), "y", "registry") for i in range(3)]
+    cache.put(keys[0], make_result(0.0))
+    cache.put(keys[1], make_result(0.1))
+    cache.get(keys[0])
+    cache.put(keys[2], make_result(0.2))
+
+    cache.evict()
+
+    assert len(cache) == 2
+    assert cache.get(keys[1]) is None
+    assert [cache.get(key)["ppscore"] for key in [keys[0], keys[2]]] == [
+        0.0,
+        0.2,
+    ]
+    assert cache.hits == 3
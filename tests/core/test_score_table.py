@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from ppscore.core.models import PPSResult, TaskType
+from ppscore.core.score_table import ScoreTable
+from ppscore.core.task_registry import get_task_registry
+
+MODEL = get_task_registry()[TaskType.REGRESSION].model
+
+
+def _results():
+    return [
+        PPSResult(
+            x=x,
+            y=y,
+            ppscore=ppscore,
+            case=TaskType.REGRESSION,
+            is_valid_score=True,
+            metric="mean absolute error",
+            baseline_score=2.0,
+            model_score=2.0 * (1 - ppscore),
+            model=MODEL,
+        )
+        for x, y, ppscore in [("a", "b", 0.2), ("b", "a", 0.5), ("c", "a", 0.2)]
+    ]
+
+
+def _table():
+    results = _results()
+    pairs = [(result.x, result.y) for result in results] + [("a", "a")]
+    table = ScoreTable.from_pairs(pairs)
+    for position, result in enumerate(results):
+        table.set_result(position, result)
+    table.set_task(np.array([3]), get_task_registry()[TaskType.PREDICT_ITSELF])
+    return table
+
+
+def test_score_table_to_frame_matches_the_results():
+    expected = _results() + [
+        PPSResult(
+            x="a",
+            y="a",
+            ppscore=1,
+            case=TaskType.PREDICT_ITSELF,
+            is_valid_score=True,
+            baseline_score=0,
+            model_score=1,
+        )
+    ]
+
+    # dict() copies the models
+    pd.testing.assert_frame_equal(
+        _table().to_frame().drop(columns="model"),
+        pd.DataFrame([result.dict(exclude={"model"}) for result in expected]),
+    )
+    assert _table().to_list() == expected
+
+
+def test_score_table_creates_results_on_access():
+    table = _table()
+
+    assert len(table) == 4
+    assert table[1].x == "b" and table[1].ppscore == 0.5
+    assert [result.y for result in table] == ["b", "a", "a", "a"]
+
+
+def test_score_table_sort_by_ppscore_keeps_order_of_ties():
+    table = _table().sort_by_ppscore()
+
+    assert [(result.x, result.y) for result in table] == [
+        ("a", "a"),
+        ("b", "a"),
+        ("a", "b"),
+        ("c", "a"),
+    ]
+
+
+def test_score_table_to_square():
+    square = _table().to_square()
+
+    expected = (
+        _table()
+        .to_frame()
+        .pivot(index="y", columns="x", values="ppscore")
+        .reindex(index=["a", "b", "c"], columns=["a", "b", "c"])
+    )
+    pd.testing.assert_frame_equal(square, expected, check_names=False)
+    assert square.index.name == "y" and square.columns.name == "x"
+
+
+def test_score_table_from_frame_roundtrips_to_frame():
+    table = _table()
+    table.column_digests = {"a": "1", "b": "2", "c": "3"}
+    table.settings = {"sample": 100}
+
+    frame = table.to_frame()
+    restored = ScoreTable.from_frame(frame)
+
+    pd.testing.assert_frame_equal(restored.to_frame(), frame)
+    assert restored.column_digests == table.column_digests
+    assert restored.settings == table.settings
+
+
+def test_score_table_copy_scores():
+    table = ScoreTable.from_pairs([("c", "a"), ("a", "a")])
+
+    table.copy_scores(np.array([1, 0]), _table(), np.array([3, 2]))
+
+    assert [(result.x, result.y, result.ppscore) for result in table] == [
+        ("c", "a", 0.2),
+        ("a", "a", 1.0),
+    ]
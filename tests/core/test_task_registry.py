@@ -1,7 +1,27 @@
+import pickle
+from functools import partial
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from ppscore.core.models import ScoreTask, TaskType
-from ppscore.core.task_registry import get_invalid_task, get_task_registry
+from ppscore.core.task_registry import (
+    default_task_registry,
+    get_invalid_task,
+    get_task_registry,
+    register_model,
+    register_task,
+    reset_task_registry,
+)
+from ppscore.core.tree1d import Tree1DRegressor
+from ppscore.scoring.predictor import PPSCalculator
+
+
+@pytest.fixture
+def restore_task_registry():
+    yield
+    reset_task_registry()
 
 
 def test_get_task_registry_keys():
@@ -94,3 +114,63 @@ def test_get_invalid_task_unsupported_case_type():
         get_invalid_task(unsupported_case_type, invalid_score)
 
     assert str(excinfo.value) == f"case_type {unsupported_case_type} is not supported"
+
+
+def test_default_task_registry_is_shared_and_read_only():
+    registry = default_task_registry()
+
+    assert default_task_registry() is registry
+    with pytest.raises(TypeError):
+        registry[TaskType.REGRESSION] = registry[TaskType.CLASSIFICATION]  # type: ignore
+    # Copies of the tasks with their own models
+    copy = get_task_registry()
+    assert copy[TaskType.REGRESSION] is not registry[TaskType.REGRESSION]
+    assert copy[TaskType.REGRESSION].model is not registry[TaskType.REGRESSION].model
+
+
+def test_get_invalid_task_is_shared_by_all_pairs():
+    task = get_invalid_task(TaskType.UNKNOWN_ERROR, 0)
+
+    assert get_invalid_task(TaskType.UNKNOWN_ERROR, 0) is task
+    assert get_invalid_task(TaskType.UNKNOWN_ERROR, -1) is not task
+
+
+def test_register_model_changes_the_default_model(restore_task_registry):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.uniform(-2, 2, 300)})
+    df["y"] = df["x"] ** 2 + rng.normal(0, 0.1, 300)
+    task_registry = get_task_registry()
+    task_registry[TaskType.REGRESSION].model = Tree1DRegressor(max_depth=1)
+    expected = PPSCalculator(task_registry).score(df, "x", "y")
+
+    register_model(TaskType.REGRESSION, partial(Tree1DRegressor, max_depth=1))
+    result = PPSCalculator().score(df, "x", "y")
+
+    assert result.ppscore == expected.ppscore
+    assert isinstance(result.model, Tree1DRegressor)
+    assert result.metric == "mean absolute error"
+    # Every copy of the registry gets a new model of the factory
+    first, second = get_task_registry(), get_task_registry()
+    assert first[TaskType.REGRESSION].model is not second[TaskType.REGRESSION].model
+    pickle.dumps(first)
+
+    reset_task_registry()
+    assert default_task_registry()[TaskType.REGRESSION].model.max_depth is None
+
+
+def test_register_model_needs_a_picklable_factory(restore_task_registry):
+    with pytest.raises(ValueError, match="should be a picklable callable"):
+        register_model(TaskType.REGRESSION, lambda: Tree1DRegressor(max_depth=1))
+    with pytest.raises(ValueError, match="should be TaskType.REGRESSION"):
+        register_model(TaskType.TARGET_IS_ID, Tree1DRegressor)
+
+
+def test_register_task_replaces_the_task_of_its_case(restore_task_registry):
+    task = default_task_registry()[TaskType.TARGET_IS_ID].model_copy(
+        update={"ppscore": 0.5}
+    )
+
+    register_task(task)
+
+    assert default_task_registry()[TaskType.TARGET_IS_ID].ppscore == 0.5
+    assert get_task_registry()[TaskType.TARGET_IS_ID].ppscore == 0.5
@@ -0,0 +1,55 @@
+from ppscore.core.tracing import STAGES, PairTrace, Tracer
+
+
+def test_tracer_aggregates_the_traces_and_calls_the_callback():
+    received = []
+    tracer = Tracer(callback=received.append)
+    first = PairTrace(x="a", y="b", case="regression", rows=100, cache_hit=False)
+    with tracer.stage(first, "cross_validation"):
+        pass
+    with tracer.stage(first, "cross_validation"):
+        pass
+    second = PairTrace(
+        x="c", y="b", case="classification", rows=50, categories=3, cache_hit=True
+    )
+
+    tracer.record(first)
+    tracer.record(second)
+
+    assert received == [first, second]
+    assert list(first.stage_seconds) == ["cross_validation"]
+    stats = tracer.stats
+    assert stats.n_pairs == 2
+    assert stats.cases == {"regression": 1, "classification": 1}
+    assert stats.stage_seconds == first.stage_seconds
+    assert (stats.rows, stats.categories) == (150, 3)
+    assert (stats.cache_hits, stats.cache_misses) == (1, 1)
+
+
+def test_tracer_side_table_has_a_column_per_stage():
+    tracer = Tracer()
+    tracer.record(PairTrace(x="a", y="b", stage_seconds={"case": 0.5}))
+
+    table = tracer.to_frame()
+
+    assert list(table.columns[:7]) == [
+        "x",
+        "y",
+        "case",
+        "rows",
+        "categories",
+        "cache_hit",
+        "batched",
+    ]
+    assert [f"{name}_seconds" for name in STAGES] == list(table.columns[7:])
+    assert table.loc[0, "case_seconds"] == 0.5
+    assert table.loc[0, "validation_seconds"] == 0.0
+    assert Tracer().to_frame().empty
+
+
+def test_tracer_without_traces_keeps_the_stats():
+    tracer = Tracer(keep_traces=False)
+    tracer.record(PairTrace(x="a", y="b", rows=10))
+
+    assert tracer.traces == []
+    assert tracer.stats.rows == 10
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn import tree
+
+from ppscore.core.tree1d import Tree1DClassifier, Tree1DRegressor
+
+
+@pytest.fixture
+def feature():
+    rng = np.random.RandomState(0)
+    return np.concatenate([rng.normal(0, 1, 200), rng.randint(-2, 3, 100)]).reshape(
+        -1, 1
+    )
+
+
+@pytest.mark.parametrize("max_depth, min_samples_leaf", [(1, 1), (3, 5), (None, 10)])
+def test_tree1d_regressor_matches_sklearn(feature, max_depth, min_samples_leaf):
+    rng = np.random.RandomState(1)
+    target = np.sin(2 * feature[:, 0]) + rng.normal(0, 0.3, len(feature))
+    test_feature = np.linspace(-4, 4, 500).reshape(-1, 1)
+
+    expected = tree.DecisionTreeRegressor(
+        max_depth=max_depth, min_samples_leaf=min_samples_leaf
+    ).fit(feature, target)
+    model = Tree1DRegressor(max_depth=max_depth, min_samples_leaf=min_samples_leaf).fit(
+        feature, target
+    )
+
+    np.testing.assert_allclose(
+        model.predict(test_feature), expected.predict(test_feature)
+    )
+    assert model.n_leaves_ == expected.get_n_leaves()
+
+
+@pytest.mark.parametrize("max_depth, min_samples_leaf", [(1, 1), (4, 3), (None, 1)])
+def test_tree1d_classifier_matches_sklearn(feature, max_depth, min_samples_leaf):
+    rng = np.random.RandomState(2)
+    target = np.where(feature[:, 0] + rng.normal(0, 0.5, len(feature)) > 0, "a", "b")
+    target[rng.rand(len(feature)) < 0.2] = "c"
+    test_feature = np.linspace(-4, 4, 500).reshape(-1, 1)
+
+    expected = tree.DecisionTreeClassifier(
+        max_depth=max_depth, min_samples_leaf=min_samples_leaf
+    ).fit(feature, target)
+    model = Tree1DClassifier(
+        max_depth=max_depth, min_samples_leaf=min_samples_leaf
+    ).fit(feature, target)
+
+    np.testing.assert_array_equal(
+        model.predict(test_feature), expected.predict(test_feature)
+    )
+
+
+def test_tree1d_pure_target_is_a_single_leaf():
+    model = Tree1DRegressor().fit(np.arange(10).reshape(-1, 1), np.ones(10))
+
+    assert model.n_leaves_ == 1
+    np.testing.assert_array_equal(model.predict([[-5], [50]]), [1.0, 1.0])
+
+
+def test_tree1d_rejects_more_than_one_feature():
+    with pytest.raises(ValueError, match="expect exactly 1 feature"):
+        Tree1DClassifier().fit(np.zeros((5, 2)), np.arange(5))
@@ -1,12 +1,22 @@
+import threading
+
 import pandas as pd
 import pytest
 
 from ppscore.core.validators import (
     is_column_in_df,
+    validate_cancel,
     validate_column_in_df,
     validate_dataframe,
+    validate_method,
+    validate_min_ppscore,
+    validate_n_jobs,
     validate_output_format,
+    validate_pairs_tolerance,
     validate_sorted_param,
+    validate_time_budget,
+    validate_tolerance,
+    validate_top_k,
     validate_unique_column,
 )
 
@@ -50,6 +60,7 @@ def test_validate_output_format():
     # Valid output formats
     assert validate_output_format("df") is None
     assert validate_output_format("list") is None
+    assert validate_output_format("table") is None
 
     # Invalid output format
     with pytest.raises(ValueError, match="should be one of"):
@@ -66,6 +77,78 @@ def test_validate_sorted_param():
         validate_sorted_param("invalid")
 
 
+def test_validate_n_jobs():
+    # Valid n_jobs values
+    assert validate_n_jobs(None) is None
+    assert validate_n_jobs(1) is None
+    assert validate_n_jobs(-1) is None
+
+    # Invalid n_jobs values
+    for n_jobs in [0, 1.5, True, "all"]:
+        with pytest.raises(ValueError, match="should be None or a non-zero integer"):
+            validate_n_jobs(n_jobs)
+
+
+def test_validate_method():
+    assert validate_method("exact") is None
+    assert validate_method("hist") is None
+
+    with pytest.raises(ValueError, match="should be one of"):
+        validate_method("approximate")
+
+
+def test_validate_top_k():
+    assert validate_top_k(None, 3) is None
+    assert validate_top_k(5, 1.5) is None
+
+    for top_k in [0, -1, 2.5, True]:
+        with pytest.raises(ValueError, match="should be None or a positive integer"):
+            validate_top_k(top_k, 3)
+    for halving_factor in [1, 0.5, "3"]:
+        with pytest.raises(ValueError, match="should be a number greater than 1"):
+            validate_top_k(5, halving_factor)
+
+
+def test_validate_tolerance():
+    assert validate_tolerance(None) is None
+    assert validate_tolerance(0.01) is None
+
+    for tolerance in [0, -0.1, True, "0.01"]:
+        with pytest.raises(ValueError, match="should be None or a positive number"):
+            validate_tolerance(tolerance)
+
+
+def test_validate_pairs_tolerance():
+    assert validate_pairs_tolerance(None) is None
+
+    with pytest.raises(ValueError, match="should be None when scoring many pairs"):
+        validate_pairs_tolerance(0.01)
+
+
+def test_validate_min_ppscore():
+    assert validate_min_ppscore(None) is None
+    assert validate_min_ppscore(0) is None
+    assert validate_min_ppscore(0.2) is None
+    assert validate_min_ppscore(1) is None
+
+    for min_ppscore in [-0.1, 1.5, True, "0.2"]:
+        with pytest.raises(ValueError, match="should be None or a number between"):
+            validate_min_ppscore(min_ppscore)
+
+
+def test_validate_time_budget_and_cancel():
+    assert validate_time_budget(None) is None
+    assert validate_time_budget(0.5) is None
+    assert validate_cancel(None) is None
+    assert validate_cancel(threading.Event()) is None
+
+    for time_budget in [0, -1, True, "1"]:
+        with pytest.raises(ValueError, match="should be None or a positive number"):
+            validate_time_budget(time_budget)
+    with pytest.raises(ValueError, match="should be None or a threading.Event"):
+        validate_cancel(True)
+
+
 def test_is_column_in_df():
     df = pd.DataFrame({"col1": [1, 2, 3]})
 
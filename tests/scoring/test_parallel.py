@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ppscore.core.score_cache import ScoreCache
+from ppscore.core.tracing import Tracer
+from ppscore.scoring.parallel import (
+    chunk_pairs,
+    effective_n_jobs,
+    group_targets_by_feature,
+)
+from ppscore.scoring.predictor import PPSCalculator
+
+
+@pytest.fixture
+def numeric_dataframe():
+    rng = np.random.RandomState(0)
+    x = rng.uniform(-2, 2, 300)
+    return pd.DataFrame(
+        {
+            "x": x,
+            "x_squared": x**2 + rng.normal(0, 0.1, 300),
+            "noise": rng.normal(0, 1, 300),
+            "label": np.where(x > 0, "positive", "negative"),
+        }
+    )
+
+
+def test_effective_n_jobs(mocker):
+    mocker.patch("ppscore.scoring.parallel.os.cpu_count", return_value=8)
+
+    assert effective_n_jobs(None) == 1
+    assert effective_n_jobs(3) == 3
+    assert effective_n_jobs(-1) == 8
+    assert effective_n_jobs(-2) == 7
+    assert effective_n_jobs(-20) == 1
+
+
+def test_chunk_pairs_keeps_order_and_covers_all_pairs():
+    pairs = [(f"x{i}", f"y{i}") for i in range(10)]
+
+    chunks = chunk_pairs(pairs, n_workers=2)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 2, 2]
+    assert [pair for chunk in chunks for pair in chunk] == pairs
+
+
+def test_group_targets_by_feature_keeps_order():
+    pairs = [("a", "b"), ("a", "c"), ("b", "a"), ("a", "d")]
+
+    assert group_targets_by_feature(pairs) == [
+        ("a", ["b", "c"]),
+        ("b", ["a"]),
+        ("a", ["d"]),
+    ]
+
+
+def test_matrix_in_parallel_matches_serial(numeric_dataframe):
+    calculator = PPSCalculator()
+
+    serial = calculator.matrix(numeric_dataframe, random_seed=7)
+    parallel = calculator.matrix(numeric_dataframe, random_seed=7, n_jobs=2)
+
+    columns = ["x", "y", "ppscore", "case", "baseline_score", "model_score"]
+    pd.testing.assert_frame_equal(serial[columns], parallel[columns])
+
+
+def test_predictors_in_parallel_matches_serial(numeric_dataframe):
+    calculator = PPSCalculator()
+
+    serial = calculator.predictors(numeric_dataframe, "x", output="list")
+    parallel = calculator.predictors(numeric_dataframe, "x", output="list", n_jobs=2)
+
+    assert [(r.x, r.ppscore) for r in serial] == [(r.x, r.ppscore) for r in parallel]
+
+
+def test_iter_matrix_in_parallel_streams_the_serial_results(numeric_dataframe):
+    calculator = PPSCalculator()
+
+    serial = calculator.matrix(numeric_dataframe, output="list", random_seed=7)
+    streamed = list(calculator.iter_matrix(numeric_dataframe, random_seed=7, n_jobs=2))
+
+    assert [(r.x, r.y, r.case) for r in streamed] == [
+        (r.x, r.y, r.case) for r in serial
+    ]
+    assert [r.ppscore for r in streamed] == pytest.approx([r.ppscore for r in serial])
+
+
+def test_iter_matrix_in_parallel_can_be_stopped_early(numeric_dataframe):
+    results = PPSCalculator().iter_matrix(numeric_dataframe, n_jobs=2)
+
+    first_results = [next(results) for _ in range(3)]
+    results.close()
+
+    assert len(first_results) == 3
+
+
+def test_workers_share_the_score_cache(numeric_dataframe, tmp_path):
+    score_cache = ScoreCache(tmp_path / "scores.sqlite")
+    calculator = PPSCalculator(score_cache=score_cache)
+
+    serial = calculator.matrix(numeric_dataframe, random_seed=7)
+    n_scores = len(score_cache)
+    parallel = calculator.matrix(numeric_dataframe, random_seed=7, n_jobs=2)
+
+    # The workers read the scores of the serial run instead of adding new ones
+    assert len(score_cache) == n_scores
+    # and their lookups are counted by the cache of the caller
+    assert (score_cache.hits, score_cache.misses) == (n_scores, n_scores)
+    columns = ["x", "y", "ppscore", "case", "baseline_score", "model_score"]
+    pd.testing.assert_frame_equal(serial[columns], parallel[columns])
+
+
+def test_parallel_traces_are_recorded_by_the_tracer_of_the_caller(numeric_dataframe):
+    serial = Tracer()
+    PPSCalculator(tracer=serial).matrix(numeric_dataframe)
+    parallel = Tracer()
+
+    PPSCalculator(tracer=parallel).matrix(numeric_dataframe, n_jobs=2)
+
+    assert sorted((t.x, t.y, t.case, t.rows) for t in parallel.traces) == sorted(
+        (t.x, t.y, t.case, t.rows) for t in serial.traces
+    )
+    assert parallel.stats.n_pairs == 16
+
+
+def test_parallel_matrix_stops_at_the_time_budget(numeric_dataframe):
+    calculator = PPSCalculator()
+
+    result = calculator.matrix(numeric_dataframe, n_jobs=2, time_budget=1e-9)
+
+    assert result.attrs["coverage"]["stop_reason"] == "time_budget"
+    assert (result["case"] == "not_scored").sum() == 12
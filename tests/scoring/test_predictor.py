@@ -1,9 +1,19 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
+from ppscore.core import metrics
+from ppscore.core.column_cache import ColumnCache
 from ppscore.core.models import PPSResult, TaskType
+from ppscore.core.score_cache import ScoreCache
+from ppscore.core.task_registry import get_task_registry
+from ppscore.core.tracing import Tracer
+from ppscore.core.tree1d import Tree1DRegressor
+from ppscore.scoring import predictor
 from ppscore.scoring.predictor import PPSCalculator
 
 
@@ -18,18 +28,18 @@ def sample_dataframe():
     )
 
 
-@patch("ppscore.scoring.predictor.determine_case_and_prepare_df")
-@patch("ppscore.scoring.predictor.calculate_model_cv_score")
+@patch("ppscore.scoring.predictor.determine_case_from_profiles")
+@patch("ppscore.scoring.predictor.calculate_model_cv_score_from_profiles")
 @patch("ppscore.scoring.predictor.get_invalid_task")
 def test_score_classification(
     mock_get_invalid_task,
     mock_calculate_model_cv_score,
-    mock_determine_case_and_prepare_df,
+    mock_determine_case_from_profiles,
     sample_dataframe,
 ):
     # Mock dependencies
-    mock_determine_case_and_prepare_df.return_value = (
-        sample_dataframe,
+    mock_determine_case_from_profiles.return_value = (
+        np.arange(len(sample_dataframe)),
         TaskType.CLASSIFICATION,
     )
     mock_calculate_model_cv_score.return_value = 0.8
@@ -47,14 +57,14 @@ def test_score_classification(
     mock_calculate_model_cv_score.assert_called_once()
 
 
-@patch("ppscore.scoring.predictor.determine_case_and_prepare_df")
+@patch("ppscore.scoring.predictor.determine_case_from_profiles")
 @patch("ppscore.scoring.predictor.get_invalid_task")
 def test_score_invalid_task(
-    mock_get_invalid_task, mock_determine_case_and_prepare_df, sample_dataframe
+    mock_get_invalid_task, mock_determine_case_from_profiles, sample_dataframe
 ):
     # Mock dependencies
-    mock_determine_case_and_prepare_df.return_value = (
-        sample_dataframe,
+    mock_determine_case_from_profiles.return_value = (
+        np.arange(len(sample_dataframe)),
         TaskType.UNKNOWN_ERROR,
     )
     mock_task = MagicMock()
@@ -118,3 +128,711 @@ def test_matrix(mock_score, sample_dataframe):
     assert len(result) == 9  # 3x3 matrix (all column pairs)
     assert "ppscore" in result.columns
     mock_score.assert_called()
+
+
+def test_score_with_column_cache_matches_score_without_cache():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "feature": rng.uniform(0, 10, 200),
+            "target": rng.normal(0, 1, 200),
+            "label": rng.choice(["a", "b", "c"], 200),
+        }
+    )
+    df.loc[::7, "feature"] = np.nan
+    calculator = PPSCalculator()
+    column_cache = ColumnCache(df)
+
+    for x, y in [("feature", "target"), ("feature", "label"), ("target", "target")]:
+        expected = calculator.score(df, x, y, sample=150)
+        result = calculator.score(df, x, y, sample=150, column_cache=column_cache)
+        assert result.case == expected.case
+        assert result.ppscore == pytest.approx(expected.ppscore)
+        assert result.baseline_score == pytest.approx(expected.baseline_score)
+
+
+def test_calculator_uses_models_of_its_task_registry():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.uniform(-2, 2, 300)})
+    df["y"] = df["x"] ** 2 + rng.normal(0, 0.1, 300)
+    task_registry = get_task_registry()
+    task_registry[TaskType.REGRESSION].model = Tree1DRegressor(max_depth=1)
+
+    shallow = PPSCalculator(task_registry).score(df, "x", "y")
+    full = PPSCalculator().score(df, "x", "y")
+
+    assert isinstance(shallow.model, Tree1DRegressor)
+    # A single split cannot capture the parabola
+    assert shallow.ppscore < full.ppscore
+
+
+def test_score_hist_method_is_exact_for_few_distinct_values():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.randint(0, 100, 2_000)})
+    df["y"] = np.sqrt(df["x"]) + rng.normal(0, 1, len(df))
+    df["label"] = np.where(df["x"] + rng.normal(0, 20, len(df)) > 50, "a", "b")
+    calculator = PPSCalculator()
+
+    for y in ["y", "label"]:
+        expected = calculator.score(df, "x", y)
+        result = calculator.score(df, "x", y, method="hist")
+        assert result.ppscore == pytest.approx(expected.ppscore)
+
+
+def test_score_hist_method_approximates_continuous_features():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.uniform(-3, 3, 20_000)})
+    df["y"] = np.sin(df["x"]) + rng.normal(0, 0.3, len(df))
+    df["noise"] = rng.normal(0, 1, len(df))
+    calculator = PPSCalculator()
+
+    result = calculator.score(df, "x", "y", sample=None, method="hist")
+    noise = calculator.score(df, "x", "noise", sample=None, method="hist")
+
+    assert result.case == TaskType.REGRESSION
+    assert result.ppscore > 0.5
+    assert noise.ppscore == 0
+
+
+def test_score_rejects_unknown_method():
+    df = pd.DataFrame({"x": [1, 2, 3], "y": [4, 5, 6]})
+
+    with pytest.raises(ValueError, match="'method' argument"):
+        PPSCalculator().score(df, "x", "y", method="approximate")
+
+
+def test_predictors_calculates_the_baseline_once_per_target(mocker):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({f"x{i}": rng.normal(0, 1, 100) for i in range(4)})
+    df["y"] = df["x0"] + rng.normal(0, 1, 100)
+    df.loc[::10, "x3"] = np.nan
+    mae_baseline_score = mocker.spy(metrics, "mae_baseline_score")
+
+    result = PPSCalculator().predictors(df, "y", output="list")
+
+    # x0, x1 and x2 share the rows of y, x3 drops some of them
+    assert mae_baseline_score.call_count == 2
+    baselines = {score.x: score.baseline_score for score in result}
+    assert baselines["x0"] == baselines["x1"] == baselines["x2"]
+    assert baselines["x3"] == pytest.approx(
+        PPSCalculator().score(df, "x3", "y").baseline_score
+    )
+
+
+def test_score_cases_of_columns_that_cannot_be_encoded():
+    df = pd.DataFrame(
+        {
+            "mixed_id": ["a", 1, "b", 2],
+            "mixed": ["a", 1, "a", 1],
+            "lists": [[1], [2], [1], [2]],
+            "y": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    calculator = PPSCalculator()
+
+    assert calculator.score(df, "mixed_id", "y").case == TaskType.FEATURE_IS_ID
+    assert calculator.score(df, "mixed", "y").case == TaskType.UNKNOWN_ERROR
+    assert calculator.score(df, "lists", "lists").case == TaskType.PREDICT_ITSELF
+    assert calculator.score(df, "lists", "y").case == TaskType.UNKNOWN_ERROR
+
+
+def test_matrix_shares_one_sampling_plan():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({f"x{i}": rng.normal(0, 1, 300) for i in range(3)})
+    df["y"] = df["x0"] + rng.normal(0, 1, 300)
+    df.loc[::7, "x2"] = np.nan
+    calculator = PPSCalculator()
+
+    result = calculator.matrix(df, output="list", sample=100, random_seed=3)
+
+    # Reproducible, and pairs without missing values match a single score
+    again = calculator.matrix(df, output="list", sample=100, random_seed=3)
+    assert [score.ppscore for score in result] == [score.ppscore for score in again]
+    scores = {(score.x, score.y): score for score in result}
+    assert scores["x0", "y"].ppscore == pytest.approx(
+        calculator.score(df, "x0", "y", sample=100, random_seed=3).ppscore
+    )
+    assert scores["x2", "y"].is_valid_score
+
+
+def test_matrix_resolves_the_cases_of_single_columns_without_scoring(mocker):
+    df = pd.DataFrame(
+        {
+            "x": [1.0, 2.0, 3.0, 4.0],
+            "id": ["a", "b", "c", "d"],
+            "constant": [1, 1, 1, 1],
+            "date": pd.date_range("2020-01-01", periods=4),
+        }
+    )
+    score = mocker.spy(PPSCalculator, "score")
+
+    result = PPSCalculator().matrix(df, output="list")
+
+    # Only constant and date predicting x need a model
+    assert [call.args[2:4] for call in score.call_args_list] == [
+        ("constant", "x"),
+        ("date", "x"),
+    ]
+    calculator = PPSCalculator()
+    expected = [calculator.score(df, x, y) for x in df for y in df]
+    assert [score.dict(exclude={"model"}) for score in result] == [
+        score.dict(exclude={"model"}) for score in expected
+    ]
+
+
+def test_score_targets_matches_score():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": np.round(rng.normal(0, 1, 200), 1)})
+    for i in range(3):
+        df[f"y{i}"] = df["x"] * i + rng.normal(0, 1, 200)
+    df["label"] = np.where(df["x"] > 0, "high", "low")
+    df["missing"] = df["y0"].where(df.index % 5 > 0)
+    targets = ["y0", "y1", "y2", "label", "missing", "x"]
+    calculator = PPSCalculator()
+
+    result = calculator.score_targets(df, "x", targets, sample=150)
+
+    expected = [calculator.score(df, "x", y, sample=150) for y in targets]
+    assert [score.y for score in result] == targets
+    assert [score.case for score in result] == [score.case for score in expected]
+    assert [score.ppscore for score in result] == pytest.approx(
+        [score.ppscore for score in expected]
+    )
+
+
+def test_score_targets_falls_back_on_data_errors_but_raises_bugs(mocker):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 100)})
+    df["y0"] = df["x"] + rng.normal(0, 1, 100)
+    df["y1"] = df["x"] * 2 + rng.normal(0, 1, 100)
+    df["lists"] = [[value] for value in df["x"]]
+    calculator = PPSCalculator()
+    expected = [calculator.score(df, "x", y).ppscore for y in ["y0", "y1"]]
+    engine = mocker.patch.object(
+        predictor, "calculate_groupby_cv_scores", side_effect=ValueError("folds")
+    )
+
+    result = calculator.score_targets(df, "x", ["y0", "y1"])
+
+    assert engine.called
+    assert [score.ppscore for score in result] == expected
+    # Features that cannot be profiled are reported by score
+    assert [
+        score.case for score in calculator.score_targets(df, "lists", ["y0", "y1"])
+    ] == [TaskType.UNKNOWN_ERROR, TaskType.UNKNOWN_ERROR]
+    engine.side_effect = KeyError("bug")
+    with pytest.raises(KeyError, match="bug"):
+        calculator.score_targets(df, "x", ["y0", "y1"])
+
+
+def test_score_tz_aware_datetime_feature_like_a_naive_one():
+    rng = np.random.RandomState(0)
+    y = rng.normal(0, 1, 300)
+    y[:150] += 3
+    df = pd.DataFrame({"naive": pd.date_range("2020", periods=300), "y": y})
+    df["aware"] = df["naive"].dt.tz_localize("UTC")
+    calculator = PPSCalculator()
+
+    result = calculator.score(df, "aware", "y")
+
+    assert result.case == TaskType.REGRESSION
+    assert result.ppscore == pytest.approx(calculator.score(df, "naive", "y").ppscore)
+
+
+def test_matrix_and_predictors_reject_duplicate_columns():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({name: rng.normal(0, 1, 100) for name in ["x", "y0", "y1"]})
+    df = pd.concat([df, df[["x"]]], axis=1)
+    calculator = PPSCalculator()
+
+    with pytest.raises(AssertionError, match="columns with the same column name x"):
+        calculator.matrix(df)
+    with pytest.raises(AssertionError, match="columns with the same column name x"):
+        calculator.predictors(df, "y0")
+
+
+def test_matrix_table_output():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 100), "id": [f"r{i}" for i in range(100)]})
+    df["y"] = df["x"] + rng.normal(0, 1, 100)
+    calculator = PPSCalculator()
+
+    table = calculator.matrix(df, output="table")
+
+    matrix = calculator.matrix(df)
+    pd.testing.assert_frame_equal(table.to_frame(), matrix)
+    pd.testing.assert_frame_equal(
+        table.to_square(),
+        matrix.pivot(index="y", columns="x", values="ppscore").loc[
+            df.columns, df.columns
+        ],
+        check_names=False,
+    )
+
+
+def test_iter_matrix_yields_the_matrix_results_with_progress():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 100), "id": [f"r{i}" for i in range(100)]})
+    df["y"] = df["x"] + rng.normal(0, 1, 100)
+    calculator = PPSCalculator()
+    progress = []
+
+    results = list(calculator.iter_matrix(df, progress=progress.append))
+
+    expected = calculator.matrix(df, output="list")
+    assert [(r.x, r.y, r.ppscore) for r in results] == [
+        (r.x, r.y, r.ppscore) for r in expected
+    ]
+    assert [p.n_done for p in progress] == list(range(1, 10))
+    assert all(p.n_total == 9 for p in progress)
+    assert progress[-1].eta_seconds == 0
+
+
+def test_iter_predictors_validates_before_iterating():
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0]})
+
+    with pytest.raises(ValueError, match="not a column"):
+        PPSCalculator().iter_predictors(df, "y")
+
+
+def test_score_cache_rescores_only_changed_columns(tmp_path, mocker):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {"x": rng.normal(0, 1, 100), "label": rng.choice(["a", "b"], 100)}
+    )
+    df["y"] = df["x"] + rng.normal(0, 1, 100)
+    expected = PPSCalculator().matrix(df).drop(columns="model")
+
+    first = PPSCalculator(score_cache=ScoreCache(tmp_path / "scores.sqlite"))
+    pd.testing.assert_frame_equal(first.matrix(df).drop(columns="model"), expected)
+    assert (first.score_cache.hits, first.score_cache.misses) == (0, 6)
+
+    second = PPSCalculator(score_cache=ScoreCache(tmp_path / "scores.sqlite"))
+    spy = mocker.spy(second, "_calculate_score")
+    pd.testing.assert_frame_equal(second.matrix(df).drop(columns="model"), expected)
+    assert (second.score_cache.hits, second.score_cache.misses) == (6, 0)
+    assert spy.call_count == 0
+
+    df["y"] = df["y"] * 2
+    third = PPSCalculator(score_cache=ScoreCache(tmp_path / "scores.sqlite"))
+    third.matrix(df)
+    # Only the pairs of y are scored again
+    assert (third.score_cache.hits, third.score_cache.misses) == (2, 4)
+
+
+def test_update_matrix_scores_only_the_pairs_of_changed_columns(mocker):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(0, 1, 100),
+            "label": rng.choice(["a", "b"], 100),
+            "dropped": rng.normal(0, 1, 100),
+        }
+    )
+    df["y"] = df["x"] + rng.normal(0, 1, 100)
+    calculator = PPSCalculator()
+    previous = calculator.matrix(df, sample=50)
+
+    df = df.drop(columns="dropped")
+    df["y"] = df["y"] * 2
+    df["new"] = rng.normal(0, 1, 100)
+    spy = mocker.spy(calculator, "score_pairs")
+    updated = calculator.update_matrix(previous, df)
+
+    # The settings of the previous matrix are used
+    columns = ["x", "y", "ppscore", "case", "baseline_score", "model_score"]
+    pd.testing.assert_frame_equal(
+        updated[columns], calculator.matrix(df, sample=50)[columns]
+    )
+    pending_pairs = spy.call_args_list[0].args[1]
+    assert ("x", "label") not in pending_pairs
+    assert len(pending_pairs) == 16 - 4
+
+
+def test_update_matrix_needs_a_matrix_result():
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0], "y": [1.0, 2.0, 1.0]})
+    calculator = PPSCalculator()
+
+    with pytest.raises(ValueError, match="column digests"):
+        calculator.update_matrix(calculator.matrix(df, output="list"), df)
+
+
+def test_predictors_top_k_races_the_features(mocker):
+    rng = np.random.RandomState(0)
+    target = rng.normal(0, 1, 1_200)
+    df = pd.DataFrame(
+        {f"f{i}": target * i / 30 + rng.normal(0, 1, 1_200) for i in range(30)}
+    )
+    df["target"] = target
+    calculator = PPSCalculator()
+    expected = calculator.predictors(df, "target", sample=1_200).head(3)
+    spy = mocker.spy(calculator, "_score_pairs_until")
+
+    result = calculator.predictors(df, "target", sample=1_200, top_k=3)
+
+    pd.testing.assert_frame_equal(
+        result.drop(columns="model"), expected.drop(columns="model")
+    )
+    # One round on 400 rows keeps a third of the features for the full sample
+    assert [len(call.args[1]) for call in spy.call_args_list] == [30, 10]
+    assert spy.call_args_list[0].args[-1]["sample"] == 400
+
+
+def test_predictors_top_k_shares_the_time_budget_across_rounds(mocker):
+    rng = np.random.RandomState(0)
+    target = rng.normal(0, 1, 1_200)
+    df = pd.DataFrame(
+        {f"f{i}": target * i / 30 + rng.normal(0, 1, 1_200) for i in range(30)}
+    )
+    df["target"] = target
+    calculator = PPSCalculator()
+    expected = calculator.predictors(df, "target", sample=1_200, top_k=3)
+    spy = mocker.spy(calculator, "_score_pairs_until")
+
+    result = calculator.predictors(df, "target", sample=1_200, top_k=3, time_budget=60)
+
+    pd.testing.assert_frame_equal(
+        result.drop(columns="model"), expected.drop(columns="model")
+    )
+    assert len({call.args[4] for call in spy.call_args_list}) == 1
+    coverage = result.attrs["coverage"]
+    assert (coverage["n_pairs"], coverage["n_not_scored"]) == (30, 0)
+
+    cancel = threading.Event()
+    score_targets = calculator.score_targets
+
+    def score_targets_and_cancel(*args, **kwargs):
+        results = score_targets(*args, **kwargs)
+        cancel.set()
+        return results
+
+    mocker.patch.object(calculator, "score_targets", score_targets_and_cancel)
+    result = calculator.predictors(df, "target", sample=1_200, top_k=3, cancel=cancel)
+
+    # No feature is dropped by a round that could not score it
+    assert len(result) == 30
+    assert (result["case"] == TaskType.NOT_SCORED.value).all()
+    coverage = result.attrs["coverage"]
+    assert (coverage["n_pairs"], coverage["n_not_scored"]) == (30, 30)
+    assert coverage["stop_reason"] == "cancelled"
+
+
+def test_matrix_min_ppscore_skips_hopeless_pairs():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({f"noise{i}": rng.normal(0, 1, 300) for i in range(3)})
+    df["x"] = rng.uniform(-2, 2, 300)
+    df["x_squared"] = df["x"] ** 2 + rng.normal(0, 0.1, 300)
+    calculator = PPSCalculator()
+    expected = calculator.matrix(df)
+
+    result = calculator.matrix(df, min_ppscore=0.2)
+
+    is_skipped = result["case"] == TaskType.BELOW_MIN_PPSCORE.value
+    assert is_skipped.sum() >= 12
+    assert (expected.loc[is_skipped, "ppscore"] < 0.2).all()
+    assert not result.loc[is_skipped, "is_valid_score"].any()
+    pd.testing.assert_frame_equal(
+        result[~is_skipped].drop(columns="model"),
+        expected[~is_skipped].drop(columns="model"),
+    )
+    with pytest.raises(ValueError, match="'min_ppscore' argument"):
+        calculator.matrix(df, min_ppscore="0.2")
+
+
+def test_matrix_min_ppscore_screen_skips_data_errors_but_raises_bugs(mocker):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 300)})
+    df["y"] = df["x"] + rng.normal(0, 1, 300)
+    df["lists"] = [[value] for value in df["x"]]
+    calculator = PPSCalculator()
+
+    result = calculator.matrix(df, min_ppscore=0.2)
+
+    # Columns that cannot be profiled are reported by score
+    is_lists_feature = (result["x"] == "lists") & (result["y"] != "lists")
+    assert (result.loc[is_lists_feature, "case"] == TaskType.UNKNOWN_ERROR.value).all()
+    screen = mocker.spy(calculator, "_screen_pairs")
+    mocker.patch.object(
+        predictor, "determine_case_from_profiles", side_effect=KeyError("bug")
+    )
+    # A bug in the screen is raised instead of disabling it
+    with pytest.raises(KeyError, match="bug"):
+        calculator.matrix(df, min_ppscore=0.2)
+    assert screen.spy_exception is not None
+
+
+def test_score_adaptive_sampling_stops_when_the_pps_converges():
+    rng = np.random.RandomState(0)
+    x = rng.uniform(-2, 2, 20_000)
+    df = pd.DataFrame(
+        {
+            "x": x,
+            "x_squared": x**2 + rng.normal(0, 0.05, 20_000),
+            "id": np.arange(20_000),
+        }
+    )
+    calculator = PPSCalculator()
+
+    result = calculator.score(df, "x", "x_squared", sample=20_000, tolerance=0.01)
+    expected = calculator.score(df, "x", "x_squared", sample=20_000)
+
+    assert result.converged
+    assert result.sample_size < 20_000
+    assert result.ppscore == pytest.approx(expected.ppscore, abs=0.01)
+    assert calculator.score(df, "x", "x", tolerance=0.01).sample_size == 0
+
+
+def test_score_adaptive_sampling_ends_with_the_full_sample():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 3_000), "y": rng.normal(0, 1, 3_000)})
+    df["y"] += 3 * df["x"]
+    calculator = PPSCalculator()
+
+    result = calculator.score(df, "x", "y", sample=2_500, tolerance=1e-9)
+    expected = calculator.score(df, "x", "y", sample=2_500)
+
+    assert not result.converged
+    assert result.sample_size == 2_500
+    assert result.ppscore == expected.ppscore
+    assert result.baseline_score == expected.baseline_score
+
+
+def test_score_early_stopping_skips_the_folds_of_worthless_pairs(mocker):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {"x": rng.uniform(-2, 2, 2_000), "noise": rng.normal(0, 1, 2_000)}
+    )
+    df["x_squared"] = df["x"] ** 2 + rng.normal(0, 0.1, 2_000)
+    calculator = PPSCalculator()
+    spy = mocker.spy(predictor, "calculate_sequential_cv_score")
+
+    worthless = calculator.score(df, "noise", "x_squared", early_stopping=True)
+    n_folds = spy.spy_return[1]
+    strong = calculator.score(df, "x", "x_squared", early_stopping=True)
+
+    assert worthless.ppscore == 0
+    assert n_folds < 4
+    expected = calculator.score(df, "x", "x_squared")
+    assert strong.ppscore == pytest.approx(expected.ppscore, abs=0.02)
+
+
+def test_matrix_early_stopping_matches_score_and_parallel_runs():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({f"noise{i}": rng.normal(0, 1, 500) for i in range(4)})
+    df["x"] = rng.uniform(-2, 2, 500)
+    df["x_squared"] = df["x"] ** 2 + rng.normal(0, 0.1, 500)
+    df["label"] = np.where(df["x"] > 0, "positive", "negative")
+    calculator = PPSCalculator()
+
+    serial = calculator.matrix(df, early_stopping=True)
+
+    expected = [
+        calculator.score(df, x, y, early_stopping=True).ppscore
+        for x, y in zip(serial["x"], serial["y"])
+    ]
+    assert serial["ppscore"].tolist() == expected
+    parallel = calculator.matrix(df, early_stopping=True, n_jobs=3)
+    pd.testing.assert_frame_equal(
+        parallel.drop(columns="model"), serial.drop(columns="model")
+    )
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_runs_over_many_pairs_reject_a_tolerance(tmp_path, cached):
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0, 4.0], "y": [1.0, 2.0, 1.0, 2.0]})
+    calculator = PPSCalculator(
+        score_cache=ScoreCache(tmp_path / "scores.sqlite") if cached else None
+    )
+    previous = calculator.matrix(df)
+
+    for run in [
+        lambda: calculator.matrix(df, tolerance=0.02),
+        lambda: calculator.predictors(df, "y", tolerance=0.02),
+        lambda: calculator.update_matrix(previous, df, tolerance=0.02),
+        lambda: calculator.score_targets(df, "x", ["y"], tolerance=0.02),
+        lambda: calculator.iter_matrix(df, tolerance=0.02),
+    ]:
+        with pytest.raises(ValueError, match="should be None when scoring many"):
+            run()
+    pd.testing.assert_frame_equal(
+        calculator.matrix(df, tolerance=None).drop(columns="model"),
+        previous.drop(columns="model"),
+    )
+
+
+def test_tracer_records_the_stages_of_every_pair(tmp_path):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(0, 1, 100),
+            "label": rng.choice(["a", "b", "c"], 100),
+            "constant": 1,
+        }
+    )
+    df["y"] = df["x"] + rng.normal(0, 1, 100)
+    expected = PPSCalculator().matrix(df).drop(columns="model")
+    received = []
+    tracer = Tracer(callback=received.append)
+    calculator = PPSCalculator(
+        score_cache=ScoreCache(tmp_path / "scores.sqlite"), tracer=tracer
+    )
+
+    pd.testing.assert_frame_equal(calculator.matrix(df).drop(columns="model"), expected)
+
+    assert received == tracer.traces
+    traces = {(trace.x, trace.y): trace for trace in tracer.traces}
+    assert len(traces) == 16
+    assert traces[("x", "constant")].case == TaskType.TARGET_IS_CONSTANT.value
+    assert traces[("x", "y")].rows == 100
+    assert traces[("x", "y")].cache_hit is False
+    assert {"encoding", "cross_validation", "normalizer"} <= set(
+        traces[("x", "y")].stage_seconds
+    )
+    assert traces[("x", "label")].categories == 3
+    assert traces[("label", "label")].categories == 0
+
+    calculator.matrix(df)
+    stats = tracer.stats
+    assert stats.n_pairs == 32
+    assert (stats.cache_hits, stats.cache_misses) == (9, 9)
+    assert stats.cases[TaskType.REGRESSION.value] == 12
+    table = tracer.to_frame()
+    assert len(table) == 32
+    assert (table["cross_validation_seconds"] >= 0).all()
+
+
+def test_tracer_of_a_single_score():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"x": rng.normal(0, 1, 100), "y": rng.normal(0, 1, 100)})
+    tracer = Tracer()
+
+    PPSCalculator(tracer=tracer).score(df, "x", "y")
+
+    (trace,) = tracer.traces
+    assert (trace.x, trace.y, trace.case) == ("x", "y", TaskType.REGRESSION.value)
+    assert not trace.batched
+    assert trace.cache_hit is None
+    assert {
+        "validation",
+        "cache",
+        "encoding",
+        "case",
+        "cross_validation",
+        "normalizer",
+    } == set(trace.stage_seconds)
+
+
+def test_tracer_of_a_calculator_that_scores_in_several_threads():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({f"x{i}": rng.normal(0, 1, 1_000) for i in range(6)})
+    pairs = [(x, y) for x in df.columns for y in df.columns if x != y] * 2
+    tracer = Tracer()
+    calculator = PPSCalculator(tracer=tracer)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda pair: calculator.score(df, *pair), pairs))
+
+    # Every pair has its own complete trace
+    assert tracer.stats.n_pairs == len(tracer.traces) == len(pairs)
+    assert sorted((trace.x, trace.y) for trace in tracer.traces) == sorted(pairs)
+    for trace in tracer.traces:
+        assert trace.case == TaskType.REGRESSION.value
+        assert {"validation", "encoding", "cross_validation"} <= set(
+            trace.stage_seconds
+        )
+
+
+@pytest.fixture
+def budget_dataframe():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "label": rng.choice(["a", "b", "c"], 200),
+            "x": rng.normal(0, 1, 200),
+            "constant": 1,
+        }
+    )
+    df["y"] = df["x"] + rng.normal(0, 1, 200)
+    return df
+
+
+def test_matrix_marks_the_pairs_left_after_the_time_budget(budget_dataframe):
+    result = PPSCalculator().matrix(budget_dataframe, time_budget=1e-9)
+
+    coverage = result.attrs["coverage"]
+    # Only the pairs that the columns decide are done
+    assert coverage["n_scored"] == 7
+    assert coverage["n_not_scored"] == 9
+    assert coverage["fraction_scored"] == 7 / 16
+    assert coverage["stop_reason"] == "time_budget"
+    not_scored = result[result["case"] == TaskType.NOT_SCORED.value]
+    assert len(not_scored) == 9
+    assert not_scored["ppscore"].isna().all()
+    assert not not_scored["is_valid_score"].any()
+
+
+def test_matrix_within_its_time_budget_scores_all_pairs(budget_dataframe):
+    expected = PPSCalculator().matrix(budget_dataframe, output="table")
+
+    result = PPSCalculator().matrix(budget_dataframe, time_budget=60, output="table")
+
+    pd.testing.assert_frame_equal(
+        result.to_frame().drop(columns="model"),
+        expected.to_frame().drop(columns="model"),
+    )
+    assert result.coverage.fraction_scored == 1.0
+    assert result.coverage.stop_reason is None
+    assert expected.coverage is None
+
+
+def test_matrix_cancelled_from_another_thread_scores_cheapest_first(
+    budget_dataframe, mocker
+):
+    cancel = threading.Event()
+    calculator = PPSCalculator()
+    score_targets = calculator.score_targets
+
+    def score_targets_and_cancel(*args, **kwargs):
+        results = score_targets(*args, **kwargs)
+        thread = threading.Thread(target=cancel.set)
+        thread.start()
+        thread.join()
+        return results
+
+    mocker.patch.object(calculator, "score_targets", score_targets_and_cancel)
+    result = calculator.matrix(budget_dataframe, cancel=cancel)
+
+    # The numeric features come before label, although label is the first column
+    scored = result[result["case"] != TaskType.NOT_SCORED.value]
+    assert set(scored.loc[scored["x"] == "label", "y"]) == {"label", "constant"}
+    assert not scored.loc[scored["x"] == "x", "ppscore"].isna().any()
+    assert result.attrs["coverage"]["stop_reason"] == "cancelled"
+
+
+def test_update_matrix_scores_the_pairs_that_were_not_scored(budget_dataframe):
+    calculator = PPSCalculator()
+    partial = calculator.matrix(budget_dataframe, time_budget=1e-9)
+
+    updated = calculator.update_matrix(partial, budget_dataframe)
+
+    columns = ["x", "y", "ppscore", "case", "baseline_score", "model_score"]
+    pd.testing.assert_frame_equal(
+        updated[columns], calculator.matrix(budget_dataframe)[columns]
+    )
+
+
+def test_update_matrix_with_a_time_budget_has_a_coverage(budget_dataframe):
+    calculator = PPSCalculator()
+    previous = calculator.matrix(budget_dataframe)
+    df = budget_dataframe.assign(y=budget_dataframe["y"] * 2)
+
+    partial = calculator.update_matrix(previous, df, time_budget=1e-9)
+    complete = calculator.update_matrix(previous, df, time_budget=60, output="table")
+
+    coverage = partial.attrs["coverage"]
+    # The pairs of y that the columns do not decide are left
+    assert coverage["n_not_scored"] == (partial["case"] == "not_scored").sum() == 5
+    assert coverage["n_pairs"] == 16
+    assert coverage["stop_reason"] == "time_budget"
+    assert complete.coverage.n_not_scored == 0
+    assert complete.coverage.stop_reason is None
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ppscore.core.score_cache import column_digest
+from ppscore.scoring.shared_frame import SharedFrame, SharedFrameView, encode_column
+
+
+@pytest.fixture
+def mixed_dataframe():
+    return pd.DataFrame(
+        {
+            "float": [1.5, np.nan, 3.0, 4.25],
+            "int": [1, 2, 3, 4],
+            "bool": [True, False, True, True],
+            "object": ["a", None, "b", "a"],
+            "category": pd.Categorical(
+                ["x", "y", "x", None], categories=["x", "y", "z"]
+            ),
+            "nullable_int": pd.array([1, None, 3, 4], dtype="Int64"),
+            "datetime": pd.to_datetime(
+                ["2023-01-01", None, "2023-01-03", "2023-01-04"]
+            ),
+            "lists": [[1], None, [2, 3], [1]],
+        }
+    )
+
+
+def test_encode_column_turns_objects_into_codes():
+    layout, buffers, categories = encode_column(pd.Series(["b", "a", None, "b"]))
+
+    assert layout == "codes"
+    assert list(buffers["values"]) == [0, 1, -1, 0]
+    assert list(categories) == ["b", "a"]
+
+
+def test_encode_column_keeps_unhashable_objects_per_row():
+    series = pd.Series([[1], None, [1]])
+
+    layout, buffers, categories = encode_column(series)
+
+    assert layout == "codes"
+    assert list(buffers["values"]) == [0, 1, 2]
+    assert list(categories) == [[1], None, [1]]
+
+
+def test_shared_frame_round_trip(mixed_dataframe):
+    with SharedFrame(mixed_dataframe) as shared_frame:
+        view = SharedFrameView(shared_frame.descriptor)
+        for column in mixed_dataframe.columns:
+            pd.testing.assert_series_equal(view.column(column), mixed_dataframe[column])
+        view.close()
+
+
+def test_shared_frame_view_keeps_the_digests_of_string_columns():
+    df = pd.DataFrame(
+        {
+            "object": pd.Series(["a", None, "b", "a"], dtype=object),
+            "str": pd.Series(["a", None, "b", "a"], dtype="str"),
+            "string": pd.Series(["a", None, "b", "a"], dtype="string"),
+        }
+    )
+
+    with SharedFrame(df) as shared_frame:
+        view = SharedFrameView(shared_frame.descriptor)
+        for column in df.columns:
+            assert view.column(column).dtype == df[column].dtype
+            assert column_digest(view.column(column)) == column_digest(df[column])
+        view.close()
+
+
+def test_shared_frame_view_is_zero_copy_and_read_only(mixed_dataframe):
+    with SharedFrame(mixed_dataframe) as shared_frame:
+        view = SharedFrameView(shared_frame.descriptor)
+        values = view.column("float").to_numpy()
+
+        assert not values.flags.owndata
+        with pytest.raises(ValueError):
+            values[0] = 0.0
+        del values
+        view.close()
+
+
+def test_shared_frame_view_frame_selects_columns(mixed_dataframe):
+    with SharedFrame(mixed_dataframe) as shared_frame:
+        view = SharedFrameView(shared_frame.descriptor)
+        frame = view.frame(["int", "object"])
+
+        assert list(frame.columns) == ["int", "object"]
+        assert len(frame) == len(mixed_dataframe)
+        del frame
+        view.close()
@@ -0,0 +1,88 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SUITE_PATH = Path(__file__).parents[1] / "benchmarks" / "suite.py"
+
+
+@pytest.fixture(scope="module")
+def suite():
+    spec = importlib.util.spec_from_file_location("benchmark_suite", SUITE_PATH)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+@pytest.mark.parametrize(
+    "kind, n_unique, nan_fraction",
+    [
+        ("numeric", 1000, 0.0),
+        ("categorical_low", 5, 0.0),
+        ("categorical_high", 200, 0.0),
+        ("nan_heavy", None, 0.5),
+    ],
+)
+def test_generated_columns(suite, kind, n_unique, nan_fraction):
+    df = suite.make_dataframe(kind, 1000, 2)
+
+    assert list(df.columns) == ["x0", "x1", "y"]
+    if n_unique is not None:
+        assert df["x0"].nunique() == n_unique
+    assert df["x0"].isna().mean() == pytest.approx(nan_fraction, abs=0.05)
+
+
+def test_mixed_frames_cycle_through_the_kinds(suite):
+    df = suite.make_dataframe("mixed", 1000, 5)
+
+    assert df["x0"].nunique() == 1000
+    assert df["x1"].nunique() == 5
+    assert df["x2"].nunique() == 200
+    assert df["x3"].isna().any()
+    assert df["x4"].nunique() == 1000
+
+
+def test_benchmark_cases_sweep_rows_and_columns(suite):
+    cases = suite.benchmark_cases()
+
+    assert len({case["name"] for case in cases}) == len(cases)
+    assert {case["n_rows"] for case in cases if case["operation"] == "score"} == set(
+        suite.ROW_COUNTS
+    )
+    assert [
+        case["n_columns"] for case in cases if case["operation"] == "matrix"
+    ] == suite.COLUMN_COUNTS
+    assert len(suite.benchmark_cases(quick=True)) < len(cases)
+
+
+def test_run_case_measures_the_throughput(suite):
+    case = {"name": "matrix", "operation": "matrix", "kind": "mixed"}
+
+    result = suite.run_case({**case, "n_rows": 100, "n_columns": 3}, repeats=1)
+
+    assert result["pairs"] == 9
+    assert result["pairs_per_second"] == pytest.approx(9 / result["seconds"])
+    assert result["peak_rss_mb"] > 0
+
+
+def test_compare_to_baseline_flags_regressions_beyond_the_noise(suite):
+    baseline = {
+        "results": [
+            {"name": "slower", "seconds": 1.0, "peak_rss_mb": 100.0},
+            {"name": "larger", "seconds": 1.0, "peak_rss_mb": 100.0},
+            {"name": "noisy", "seconds": 0.001, "peak_rss_mb": 100.0},
+        ]
+    }
+    results = [
+        {"name": "slower", "seconds": 1.5, "peak_rss_mb": 100.0},
+        {"name": "larger", "seconds": 0.9, "peak_rss_mb": 200.0},
+        {"name": "noisy", "seconds": 0.002, "peak_rss_mb": 105.0},
+        {"name": "new", "seconds": 10.0, "peak_rss_mb": 1000.0},
+    ]
+
+    regressions = suite.compare_to_baseline(results, baseline)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slower: seconds 1.500s")
+    assert regressions[1].startswith("larger: peak_rss_mb 200.000MB")
+    assert suite.compare_to_baseline(results, baseline, tolerance=1.5) == []
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+import ppscore
+
+# Budget of the cumulative `python -X importtime` time of a bare `import ppscore`
+IMPORT_BUDGET_MICROSECONDS = 50_000
+
+
+def run_python(statement: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_ppscore_is_within_budget():
+    # The fastest of a few runs, to be robust against a busy machine
+    times = []
+    for _ in range(3):
+        stderr = run_python("import ppscore").stderr
+        line = next(line for line in stderr.splitlines() if line.endswith("| ppscore"))
+        times.append(int(line.split("|")[1]))
+
+    assert min(times) < IMPORT_BUDGET_MICROSECONDS
+
+
+@pytest.mark.parametrize(
+    "statement, deferred",
+    [
+        ("import ppscore", ["numpy", "pandas", "pydantic", "sklearn"]),
+        ("from ppscore import score", ["sklearn"]),
+        ("from ppscore.scoring.predictor import PPSCalculator", ["sklearn"]),
+    ],
+)
+def test_imports_defer_the_heavy_dependencies(statement, deferred):
+    output = run_python(
+        f"{statement}; import sys; print(' '.join(sorted(sys.modules)))"
+    ).stdout
+
+    assert set(output.split()).isdisjoint(deferred)
+
+
+def test_lazy_attributes():
+    assert ppscore.score is ppscore.main.score
+    assert "matrix" in dir(ppscore)
+    with pytest.raises(AttributeError):
+        ppscore.__getattr__("unknown_function")
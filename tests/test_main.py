@@ -17,7 +17,17 @@ def test_score_valid(mock_calculator):
 
     assert result == {"ppscore": 0.5, "case": "classification"}
     mock_calculator.return_value.score.assert_called_once_with(
-        df, "x", "y", 5000, 4, 123, 0, True
+        df,
+        "x",
+        "y",
+        5000,
+        4,
+        123,
+        0,
+        True,
+        method="exact",
+        tolerance=None,
+        early_stopping=False,
     )
 
 